@@ -0,0 +1,98 @@
+"""Streaming NDJSON import and export.
+
+Imports read the request body as it arrives, validate one line at a time and
+hand the store chunks of ``IMPORT_CHUNK_SIZE`` items, so memory stays bounded
+by the chunk rather than the upload. Exports page through the store a chunk
+at a time, taking its lock once per chunk, and encode each item as one line.
+"""
+
+from collections.abc import AsyncIterator, Callable, Iterator
+
+from pydantic import BaseModel, ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from .schemas import BulkImportResponse, ImportLineError
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+IMPORT_CHUNK_SIZE = 1000
+EXPORT_CHUNK_SIZE = 1000
+MAX_LINE_BYTES = 1 << 20
+MAX_REPORTED_ERRORS = 100
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, bytes | None]]:
+    """``(line_number, line)`` for every non-blank line.
+
+    ``line`` is ``None`` for a line longer than ``MAX_LINE_BYTES``, whose
+    bytes are dropped as they arrive instead of being buffered.
+    """
+    buffer = b""
+    number = 0
+    oversized = False
+    async for piece in body:
+        buffer += piece
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            number += 1
+            if oversized or len(line) > MAX_LINE_BYTES:
+                oversized = False
+                yield number, None
+            elif line.strip():
+                yield number, line
+        if len(buffer) > MAX_LINE_BYTES:
+            oversized = True
+            buffer = b""
+    if oversized:
+        yield number + 1, None
+    elif buffer.strip():
+        yield number + 1, buffer
+
+
+async def import_ndjson[M: BaseModel](
+    body: AsyncIterator[bytes], model: type[M], insert: Callable[[list[M]], int]
+) -> BulkImportResponse:
+    """Validate ``body`` line by line as ``model`` and pass chunks to ``insert``.
+
+    Invalid and over-long lines are skipped and reported (up to
+    ``MAX_REPORTED_ERRORS``), so earlier chunks stay imported and the
+    response still accounts for every line; ``insert`` runs in the
+    threadpool and returns how many items it stored.
+    """
+    chunk: list[M] = []
+    imported = failed = 0
+    errors: list[ImportLineError] = []
+    async for number, line in _lines(body):
+        if line is None:
+            detail = f"line exceeds {MAX_LINE_BYTES} bytes"
+        else:
+            try:
+                chunk.append(model.model_validate_json(line))
+            except ValidationError as exc:
+                first = exc.errors(include_url=False)[0]
+                location = ".".join(str(part) for part in first["loc"])
+                detail = f"{location}: {first['msg']}" if location else first["msg"]
+            else:
+                detail = None
+        if detail is not None:
+            failed += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append(ImportLineError(line=number, detail=detail))
+            continue
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            imported += await run_in_threadpool(insert, chunk)
+            chunk = []
+    if chunk:
+        imported += await run_in_threadpool(insert, chunk)
+    return BulkImportResponse(imported=imported, failed=failed, errors=errors)
+
+
+def export_ndjson[M: BaseModel](page: Callable[[int, int], list[M]]) -> Iterator[bytes]:
+    """Encode ``page(offset, limit)`` results as NDJSON until a short page."""
+    offset = 0
+    while True:
+        items = page(offset, EXPORT_CHUNK_SIZE)
+        if items:
+            yield b"".join(item.__pydantic_serializer__.to_json(item) + b"\n" for item in items)
+        if len(items) < EXPORT_CHUNK_SIZE:
+            return
+        offset += len(items)
@@ -1,4 +1,8 @@
+import os
 from functools import lru_cache
+from pathlib import Path
+from typing import Literal
+from uuid import UUID
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +12,17 @@ class Settings(BaseSettings):
     environment: str = "development"
     api_prefix: str = "/v1"
     cors_origins: list[str] = ["http://localhost:3000"]
+    analysis_workers: int = os.cpu_count() or 1
+    analysis_queue_size: int = 1024
+    analysis_batch_size: int = 16
+    analysis_executor: Literal["process", "thread"] = "process"
+    curriculum_path: Path = Path(__file__).parent / "data" / "curricula.json"
+    prerequisites_path: Path = Path(__file__).parent / "data" / "prerequisites.tsv"
+    storage_backend: Literal["sqlite", "memory"] = "sqlite"
+    sqlite_path: Path = Path("memoglobe.db")
+    sqlite_pool_size: int = 4
+    quest_plan_interval_seconds: float = 600.0
+    dev_user_id: UUID = UUID("00000000-0000-4000-a000-000000000001")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -0,0 +1,36 @@
+"""Canonical thresholds shared with the frontend.
+
+Values are loaded from ``shared/constants.py`` so both languages keep a single
+source of truth; import them from here inside the backend.
+"""
+
+import importlib.util
+from pathlib import Path
+
+_SHARED_PATH = Path(__file__).resolve().parents[2] / "shared" / "constants.py"
+_spec = importlib.util.spec_from_file_location("memoglobe_shared_constants", _SHARED_PATH)
+assert _spec is not None and _spec.loader is not None
+_shared = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(_shared)
+
+SRS_REDUNDANCY_THRESHOLD: float = _shared.SRS_REDUNDANCY_THRESHOLD
+KCS_COVERAGE_TARGET: float = _shared.KCS_COVERAGE_TARGET
+CLI_OVERLOAD_THRESHOLD: float = _shared.CLI_OVERLOAD_THRESHOLD
+ZPD_READINESS_THRESHOLD: float = _shared.ZPD_READINESS_THRESHOLD
+BLOOM_IMBALANCE_THRESHOLD: float = _shared.BLOOM_IMBALANCE_THRESHOLD
+
+ZPD_W1_BLOOM: float = _shared.ZPD_W1_BLOOM
+ZPD_W2_KCS: float = _shared.ZPD_W2_KCS
+ZPD_W3_CLI: float = _shared.ZPD_W3_CLI
+
+DAILY_QUEST_COUNT: int = _shared.DAILY_QUEST_COUNT
+QUEST_TYPES: tuple[str, ...] = _shared.QUEST_TYPES
+
+SRS_INTERVALS: tuple[int, ...] = _shared.SRS_INTERVALS
+ANCHOR_DECAY_RATE: float = _shared.ANCHOR_DECAY_RATE
+
+PIN_COLOR_MASTERED: str = _shared.PIN_COLOR_MASTERED
+PIN_COLOR_GAP: str = _shared.PIN_COLOR_GAP
+PIN_COLOR_REVIEW: str = _shared.PIN_COLOR_REVIEW
+PIN_COLOR_PATH: str = _shared.PIN_COLOR_PATH
+PIN_COLOR_PERSONAL: str = _shared.PIN_COLOR_PERSONAL
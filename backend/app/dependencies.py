@@ -4,6 +4,9 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from pydantic import BaseModel
 
+from .config import get_settings
+from .store import InMemoryStore, stores
+
 security = HTTPBearer(auto_error=False)
 
 
@@ -23,7 +26,10 @@ def get_current_user(
         )
 
     return AuthUser(
-        user_id=UUID("00000000-0000-4000-a000-000000000001"),
+        user_id=get_settings().dev_user_id,
         token=credentials.credentials,
     )
 
+
+def get_store(user: AuthUser = Depends(get_current_user)) -> InMemoryStore:
+    return stores.get(user.user_id)
@@ -0,0 +1,44 @@
+"""Pre-encoded JSON bodies for hot read endpoints.
+
+FastAPI validates and re-serializes every ``response_model`` return value.
+Routes on the fast path encode once with a compiled ``TypeAdapter`` or
+``model_dump_json``, keep the bytes until the resource's ETag moves, and
+return them in a plain ``Response``. ``response_model`` stays on those routes
+for the OpenAPI schema only.
+"""
+
+from collections.abc import Callable
+
+from pydantic import TypeAdapter
+
+from .schemas import AnalysisReport, GeoAnchorWithLocation, JourneyRoute
+
+JSON_MEDIA_TYPE = "application/json"
+
+ANALYSIS_REPORT = TypeAdapter(AnalysisReport)
+ANCHOR_LIST = TypeAdapter(list[GeoAnchorWithLocation])
+ROUTE_LIST = TypeAdapter(list[JourneyRoute])
+
+
+def envelope(key: str, body: bytes) -> bytes:
+    """Wrap an encoded value as ``{"key": value}`` without decoding it."""
+    return b'{"' + key.encode() + b'":' + body + b"}"
+
+
+class EncodedCache:
+    """Encoded bodies keyed by resource, each valid for exactly one ETag.
+
+    Callers read the ETag before building the body, so a body is only ever
+    stored under a tag at least as old as its contents.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[str, bytes]] = {}
+
+    def get(self, key: str, etag: str, build: Callable[[], bytes]) -> bytes:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == etag:
+            return entry[1]
+        body = build()
+        self._entries[key] = (etag, body)
+        return body
@@ -0,0 +1 @@
+"""Analysis and geo engines backing the MemoGlobe store."""
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+import numpy as np
+
+from ..schemas import AnalysisReport, FeedbackCard
+from .bloom import BLOOM_LEVELS, PRIOR, BloomClassifier
+from .sections import note_sections
+from .srs import embed_texts
+from .text import note_text
+
+# Cognitive load: a section this long, or this many concepts per 100 words,
+# saturates its component; short notes count as CLI_MIN_WORDS long.
+CLI_LONG_SECTION_WORDS = 250
+CLI_DENSE_CONCEPTS_PER_100 = 8.0
+CLI_MIN_WORDS = 50
+CLI_W_LENGTH = 0.35
+CLI_W_DENSITY = 0.40
+CLI_W_SPREAD = 0.25
+
+
+@cache
+def seed_analysis() -> AnalysisReport:
+    """Shared starting report; callers derive from it with ``model_copy`` and never mutate it."""
+    return AnalysisReport(
+        srs_score=0.08,
+        kcs_score=0.72,
+        bloom_distribution={
+            "remember": 0.30,
+            "understand": 0.25,
+            "apply": 0.20,
+            "analyze": 0.15,
+            "evaluate": 0.07,
+            "create": 0.03,
+        },
+        cli_score=0.45,
+        dag_violations=["Linear Algebra", "Calculus II"],
+        uncovered_concepts=["Wave Function", "Quantum Entanglement", "Superposition"],
+        redundant_with=[],
+        feedback_cards=[
+            FeedbackCard(
+                type="gap_alert",
+                severity="warning",
+                message="3 concepts in Physics remain uncovered.",
+                action={"suggest": "Review Wave Function and Superposition"},
+            )
+        ],
+    )
+
+
+@dataclass(slots=True)
+class NoteAnalysis:
+    """Stateless pool output; the store merges it into the note's report.
+
+    ``embedding`` is ``None`` when the job did not ask for it, and
+    ``section_scores`` only holds the sections the job analysed, each tagged
+    with the content hash it was computed from.
+    """
+
+    embedding: tuple[str, np.ndarray] | None
+    section_scores: dict[str, tuple[str, np.ndarray]]
+
+
+# One classifier per worker thread (one per process with the process executor)
+# so its feature cache survives across batches; the LRU is not thread-safe.
+_local = threading.local()
+
+
+def _classifier() -> BloomClassifier:
+    bloom = getattr(_local, "bloom", None)
+    if bloom is None:
+        bloom = _local.bloom = BloomClassifier()
+    return bloom
+
+
+def _entropy(shares: Iterable[float]) -> float:
+    """Shannon entropy normalised to [0, 1] over the six Bloom levels."""
+    return -sum(p * math.log(p) for p in shares if p > 0) / math.log(len(BLOOM_LEVELS))
+
+
+# A note with no Bloom evidence scores the prior, so spread counts from there.
+_PRIOR_ENTROPY = _entropy(PRIOR.tolist())
+
+
+def cognitive_load(
+    sections: Mapping[str, str], concept_count: int, bloom: Mapping[str, float]
+) -> float:
+    """Cognitive Load Index in [0, 1] of a whole note.
+
+    Blends the longest section's length, the density of extracted concepts
+    per word and the spread of the Bloom distribution (its entropy above the
+    classifier prior's): long, concept-dense notes that jump between many
+    cognitive levels score highest.
+    """
+    words = [len(text.split()) for text in sections.values()]
+    length = min(1.0, max(words, default=0) / CLI_LONG_SECTION_WORDS)
+    per_100 = 100.0 * concept_count / max(sum(words), CLI_MIN_WORDS)
+    density = min(1.0, per_100 / CLI_DENSE_CONCEPTS_PER_100)
+    spread = (_entropy(bloom.values()) - _PRIOR_ENTROPY) / (1.0 - _PRIOR_ENTROPY)
+    load = CLI_W_LENGTH * length + CLI_W_DENSITY * density + CLI_W_SPREAD * max(0.0, spread)
+    return round(load, 4)
+
+
+def analyze_batch(jobs: list[dict[str, Any]]) -> list[NoteAnalysis]:
+    """Stateless per-note analysis, run inside the pipeline's worker pool.
+
+    Each job carries ``template_type`` and ``content`` plus the stages to run:
+    ``embed`` (a full-text hash, or ``None`` to skip) and ``sections``
+    (section name -> content hash to Bloom-score). Every requested section in
+    the batch is scored in a single pass. Must stay importable without the
+    store so process workers start cheaply.
+    """
+    embed_jobs = [i for i, job in enumerate(jobs) if job["embed"] is not None]
+    embeddings = embed_texts([note_text(jobs[i]["content"]) for i in embed_jobs])
+    embedded = {i: (jobs[i]["embed"], row) for i, row in zip(embed_jobs, embeddings, strict=True)}
+
+    keys: list[tuple[int, str, str]] = []
+    texts: list[str] = []
+    for i, job in enumerate(jobs):
+        sections = note_sections(job["template_type"], job["content"])
+        for name, digest in job["sections"].items():
+            keys.append((i, name, digest))
+            texts.append(sections.get(name, ""))
+    scores = _classifier().scores(texts)
+
+    results = [NoteAnalysis(embedding=embedded.get(i), section_scores={}) for i in range(len(jobs))]
+    for (i, name, digest), row in zip(keys, scores, strict=True):
+        results[i].section_scores[name] = (digest, row)
+    return results
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, get_args
+from uuid import UUID
+
+import numpy as np
+
+from ..schemas import (
+    AnchorStrategy,
+    BloomLevel,
+    ConceptObject,
+    GeoAnchorWithLocation,
+    LocationObject,
+)
+from .text import normalize
+
+ANCHOR_STRATEGIES: tuple[AnchorStrategy, ...] = get_args(AnchorStrategy)
+
+
+@dataclass(slots=True)
+class ConceptRecord:
+    id: UUID
+    name: str
+    key: str
+    aliases: tuple[str, ...]
+    domain: str
+    bloom_level: BloomLevel
+
+
+@dataclass(slots=True)
+class LocationRecord:
+    id: UUID
+    name: str
+    description: str
+    latitude: float
+    longitude: float
+    country: str
+    type: str
+    image_url: str
+    street_view_available: bool
+    metadata: dict[str, Any]
+
+
+class AnchorTable:
+    """Anchors as parallel NumPy columns over interned concepts and locations.
+
+    A row holds only fixed-width fields (coordinates, indexes into the concept
+    and location tables, strategy code, review count, last review time and the
+    row's version stamp), so a pin costs a few dozen bytes however many anchors
+    share a concept or a place. Strength lives in ``StrengthColumns``, whose
+    slots line up with these rows because both are appended together and
+    never removed. Pydantic models are only built by ``materialize`` at the
+    API and persistence edges.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.ids: list[UUID] = []
+        self.row: dict[UUID, int] = {}
+        self.concepts: list[ConceptRecord] = []
+        self.concepts_by_key: dict[str, list[int]] = {}
+        self._concept_row: dict[UUID, int] = {}
+        self.locations: list[LocationRecord] = []
+        self._location_row: dict[UUID, int] = {}
+        self._place_row: dict[tuple[str, float, float, str], int] = {}
+        # Single precision is ~1 m at the equator, plenty for routing; responses
+        # read exact coordinates from the location records.
+        self.latitude = np.zeros(capacity, dtype=np.float32)
+        self.longitude = np.zeros(capacity, dtype=np.float32)
+        self.concept = np.zeros(capacity, dtype=np.int32)
+        self.location = np.zeros(capacity, dtype=np.int32)
+        self.strategy = np.zeros(capacity, dtype=np.uint8)
+        self.review_count = np.zeros(capacity, dtype=np.int32)
+        self.last_reviewed = np.full(capacity, np.nan, dtype=np.float64)
+        self.stamp = np.zeros(capacity, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, anchor_id: object) -> bool:
+        return anchor_id in self.row
+
+    def _grow(self) -> None:
+        for name, fill in (
+            ("latitude", 0.0),
+            ("longitude", 0.0),
+            ("concept", 0),
+            ("location", 0),
+            ("strategy", 0),
+            ("review_count", 0),
+            ("last_reviewed", np.nan),
+            ("stamp", 0),
+        ):
+            column = getattr(self, name)
+            grown = np.full(2 * len(column), fill, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def intern_concept(self, concept: ConceptObject) -> int:
+        """Row of the concept with ``concept.id``, adding it on first sight."""
+        row = self._concept_row.get(concept.id)
+        if row is None:
+            row = self._concept_row[concept.id] = len(self.concepts)
+            key = normalize(concept.name)
+            self.concepts.append(
+                ConceptRecord(
+                    id=concept.id,
+                    name=concept.name,
+                    key=key,
+                    aliases=tuple(concept.aliases),
+                    domain=concept.domain,
+                    bloom_level=concept.bloom_level,
+                )
+            )
+            self.concepts_by_key.setdefault(key, []).append(row)
+        return row
+
+    def intern_location(self, location: LocationObject) -> int:
+        """Row of the location with ``location.id``, adding it on first sight."""
+        row = self._location_row.get(location.id)
+        if row is None:
+            row = self._location_row[location.id] = len(self.locations)
+            self.locations.append(
+                LocationRecord(
+                    id=location.id,
+                    name=location.name,
+                    description=location.description,
+                    latitude=location.latitude,
+                    longitude=location.longitude,
+                    country=location.country,
+                    type=location.type,
+                    image_url=location.image_url,
+                    street_view_available=location.street_view_available,
+                    metadata=location.metadata,
+                )
+            )
+            self._place_row.setdefault(
+                (location.name, location.latitude, location.longitude, location.type), row
+            )
+        return row
+
+    def concept_row(self, concept_id: UUID) -> int | None:
+        return self._concept_row.get(concept_id)
+
+    def find_place(self, name: str, latitude: float, longitude: float, kind: str) -> UUID | None:
+        """Id of an already interned location with exactly these fields, if any."""
+        row = self._place_row.get((name, latitude, longitude, kind))
+        return None if row is None else self.locations[row].id
+
+    def extend(self, anchors: list[GeoAnchorWithLocation]) -> np.ndarray:
+        """Append anchors not already present and return every anchor's row, in order."""
+        rows = np.empty(len(anchors), dtype=np.int64)
+        start = len(self.ids)
+        fresh: list[GeoAnchorWithLocation] = []
+        for i, anchor in enumerate(anchors):
+            row = self.row.get(anchor.id)
+            if row is None:
+                row = self.row[anchor.id] = start + len(fresh)
+                self.ids.append(anchor.id)
+                fresh.append(anchor)
+            rows[i] = row
+        if not fresh:
+            return rows
+        end = start + len(fresh)
+        while end > len(self.latitude):
+            self._grow()
+        locations = [self.intern_location(anchor.location) for anchor in fresh]
+        new = slice(start, end)
+        self.concept[new] = [self.intern_concept(anchor.concept) for anchor in fresh]
+        self.location[new] = locations
+        self.latitude[new] = [self.locations[row].latitude for row in locations]
+        self.longitude[new] = [self.locations[row].longitude for row in locations]
+        self.strategy[new] = [ANCHOR_STRATEGIES.index(anchor.anchor_strategy) for anchor in fresh]
+        self.review_count[new] = [anchor.review_count for anchor in fresh]
+        self.last_reviewed[new] = [
+            np.nan if anchor.last_reviewed is None else anchor.last_reviewed.timestamp()
+            for anchor in fresh
+        ]
+        return rows
+
+    def concept_of(self, row: int) -> ConceptRecord:
+        return self.concepts[int(self.concept[row])]
+
+    def location_of(self, row: int) -> LocationRecord:
+        return self.locations[int(self.location[row])]
+
+    def rows_with_concepts(self, concept_rows: list[int]) -> np.ndarray:
+        n = len(self.ids)
+        return np.flatnonzero(np.isin(self.concept[:n], concept_rows))
+
+    def _concept_model(self, row: int) -> ConceptObject:
+        concept = self.concepts[row]
+        return ConceptObject(
+            id=concept.id,
+            name=concept.name,
+            aliases=list(concept.aliases),
+            domain=concept.domain,
+            bloom_level=concept.bloom_level,
+        )
+
+    def _location_model(self, row: int) -> LocationObject:
+        location = self.locations[row]
+        return LocationObject(
+            id=location.id,
+            name=location.name,
+            description=location.description,
+            latitude=location.latitude,
+            longitude=location.longitude,
+            country=location.country,
+            type=location.type,
+            image_url=location.image_url,
+            street_view_available=location.street_view_available,
+            metadata=dict(location.metadata),
+        )
+
+    def materialize(
+        self, rows: np.ndarray, strengths: np.ndarray, pin_colors: list[str]
+    ) -> list[GeoAnchorWithLocation]:
+        """Build response models for ``rows`` with the given current strength and pin.
+
+        Anchors in one call that share a concept or location share its model.
+        """
+        concept_rows = self.concept[rows].tolist()
+        location_rows = self.location[rows].tolist()
+        concepts = {row: self._concept_model(row) for row in set(concept_rows)}
+        locations = {row: self._location_model(row) for row in set(location_rows)}
+        anchors = []
+        for row, concept, location, strength, pin_color in zip(
+            rows.tolist(), concept_rows, location_rows, strengths.tolist(), pin_colors, strict=True
+        ):
+            reviewed = float(self.last_reviewed[row])
+            anchors.append(
+                GeoAnchorWithLocation(
+                    id=self.ids[row],
+                    concept=concepts[concept],
+                    location=locations[location],
+                    anchor_strategy=ANCHOR_STRATEGIES[int(self.strategy[row])],
+                    strength=round(strength, 4),
+                    pin_color=pin_color,
+                    review_count=int(self.review_count[row]),
+                    last_reviewed=(
+                        None if math.isnan(reviewed) else datetime.fromtimestamp(reviewed, tz=UTC)
+                    ),
+                )
+            )
+        return anchors
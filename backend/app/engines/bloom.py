@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import get_args
+
+import numpy as np
+
+from ..schemas import BloomLevel
+from .text import words
+
+BLOOM_LEVELS: tuple[str, ...] = get_args(BloomLevel)
+
+# Cue verbs per level. English entries are matched on a light stem, Korean
+# entries as a prefix of the token so conjugated endings (설명한다, 설명했다) match.
+LEXICON: dict[str, tuple[str, ...]] = {
+    "remember": (
+        "define", "list", "recall", "name", "identify", "state", "memorize", "repeat",
+        "label", "recognize", "정의", "나열", "기억", "암기", "확인",
+    ),
+    "understand": (
+        "explain", "describe", "summarize", "classify", "interpret", "paraphrase",
+        "discuss", "illustrate", "설명", "요약", "해석", "분류", "이해", "서술",
+    ),
+    "apply": (
+        "apply", "use", "solve", "demonstrate", "calculate", "compute", "implement",
+        "execute", "practice", "적용", "사용", "풀이", "계산", "실행", "활용",
+    ),
+    "analyze": (
+        "analyze", "analyse", "compare", "contrast", "differentiate", "examine",
+        "organize", "distinguish", "relate", "분석", "비교", "대조", "구별", "조직",
+    ),
+    "evaluate": (
+        "evaluate", "judge", "critique", "justify", "assess", "argue", "defend",
+        "평가", "판단", "비판", "정당화", "논증", "검증",
+    ),
+    "create": (
+        "create", "design", "construct", "develop", "formulate", "propose", "invent",
+        "compose", "창작", "설계", "구성", "개발", "제안", "고안",
+    ),
+}
+
+# Bias toward lower levels when a section carries no cue verbs.
+PRIOR = np.array([0.30, 0.25, 0.20, 0.12, 0.08, 0.05], dtype=np.float32)
+
+FEATURE_CACHE_SIZE = 50_000
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[: -len(suffix)]
+    return word
+
+
+class BloomClassifier:
+    """Linear model over cue-verb counts, scored for a whole batch in one matmul.
+
+    Feature rows are cached by content hash, so re-submitted or unchanged
+    sections skip tokenisation entirely.
+    """
+
+    def __init__(self, lexicon: dict[str, tuple[str, ...]] = LEXICON) -> None:
+        self._ascii: dict[str, int] = {}
+        self._prefix: dict[str, int] = {}
+        levels = []
+        for level, cues in lexicon.items():
+            for cue in cues:
+                table = self._ascii if cue.isascii() else self._prefix
+                key = _stem(cue) if cue.isascii() else cue
+                if key not in table:
+                    table[key] = len(levels)
+                    levels.append(BLOOM_LEVELS.index(level))
+        self.n_features = len(levels)
+        self.weights = np.zeros((self.n_features, len(BLOOM_LEVELS)), dtype=np.float32)
+        self.weights[np.arange(self.n_features), levels] = 1.0
+        self._max_prefix = max((len(key) for key in self._prefix), default=0)
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+    def _feature_indices(self, text: str) -> list[int]:
+        hits = []
+        for word in words(text):
+            if word.isascii():
+                index = self._ascii.get(_stem(word))
+                if index is not None:
+                    hits.append(index)
+                continue
+            for size in range(min(len(word), self._max_prefix), 1, -1):
+                index = self._prefix.get(word[:size])
+                if index is not None:
+                    hits.append(index)
+                    break
+        return hits
+
+    def features(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, text in enumerate(texts):
+            key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+            cached = self._cache.get(key)
+            if cached is None:
+                indices = np.asarray(self._feature_indices(text), dtype=np.int64)
+                cached = np.bincount(indices, minlength=self.n_features).astype(np.float32)
+                self._cache[key] = cached
+                if len(self._cache) > FEATURE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+            else:
+                self._cache.move_to_end(key)
+            matrix[row] = cached
+        return matrix
+
+    def scores(self, texts: list[str]) -> np.ndarray:
+        """Unnormalised per-level evidence, one row per text (empty text scores zero)."""
+        scores = self.features(texts) @ self.weights
+        nonempty = np.fromiter((bool(t.strip()) for t in texts), dtype=bool, count=len(texts))
+        scores[nonempty] += PRIOR
+        return scores
+
+
+def distribution(scores: np.ndarray) -> dict[str, float]:
+    total = float(scores.sum())
+    if total <= 0:
+        return {level: round(float(p), 4) for level, p in zip(BLOOM_LEVELS, PRIOR, strict=True)}
+    return {
+        level: round(float(value) / total, 4)
+        for level, value in zip(BLOOM_LEVELS, scores, strict=True)
+    }
+
+
+def dominant_level(scores: np.ndarray) -> str:
+    return BLOOM_LEVELS[int(np.argmax(scores))] if scores.any() else "understand"
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import base64
+from collections.abc import Iterable
+from datetime import date
+from typing import Literal
+from uuid import UUID
+
+import numpy as np
+
+ChangeKind = Literal["anchor", "note", "analysis"]
+CHANGE_KINDS: tuple[ChangeKind, ...] = ("anchor", "note", "analysis")
+COMPACT_SLACK = 1024
+
+
+def encode_sync_cursor(epoch: str, version: int, day: date) -> str:
+    raw = f"{epoch}|{version}|{day.isoformat()}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_sync_cursor(cursor: str) -> tuple[str, int, date]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        epoch, version, day = raw.split("|", 2)
+        return epoch, int(version), date.fromisoformat(day)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+class ChangeLog:
+    """Append-only ``(version, kind, key)`` log answering "what changed since v".
+
+    Versions come from the store's counter and only grow, so entries are
+    appended in order and finding where a cursor resumes is a binary search.
+    Rewriting a key leaves its older entries stale; once stale entries
+    outnumber live keys the log is compacted to the newest entry per key, so
+    it stays proportional to the number of distinct keys, not of writes.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._versions = np.zeros(capacity, dtype=np.int64)
+        self._kinds = np.zeros(capacity, dtype=np.uint8)
+        self._keys: list[UUID] = []
+        self._latest: dict[tuple[int, UUID], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._versions)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_versions", "_kinds"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def record(self, version: int, kind: ChangeKind, keys: Iterable[UUID]) -> None:
+        """Log that ``keys`` changed at ``version``, which must not be older than the last."""
+        code = CHANGE_KINDS.index(kind)
+        fresh = list(dict.fromkeys(keys))
+        start = len(self._keys)
+        end = start + len(fresh)
+        self._reserve(end)
+        self._versions[start:end] = version
+        self._kinds[start:end] = code
+        self._keys.extend(fresh)
+        latest = self._latest
+        for key in fresh:
+            latest[code, key] = version
+        if end > 2 * len(latest) + COMPACT_SLACK:
+            self._compact()
+
+    def _compact(self) -> None:
+        n = len(self._keys)
+        latest = self._latest
+        keep = np.fromiter(
+            (
+                latest[code, key] == version
+                for version, code, key in zip(
+                    self._versions[:n].tolist(), self._kinds[:n].tolist(), self._keys, strict=True
+                )
+            ),
+            dtype=bool,
+            count=n,
+        )
+        rows = np.flatnonzero(keep)
+        m = len(rows)
+        self._versions[:m] = self._versions[rows]
+        self._kinds[:m] = self._kinds[rows]
+        self._keys = [self._keys[row] for row in rows.tolist()]
+
+    def since(self, version: int, limit: int) -> tuple[list[tuple[ChangeKind, UUID]], int | None]:
+        """Keys changed after ``version``, oldest change first, each listed once.
+
+        Returns at least ``limit`` changes when there are that many, never
+        splitting one version across pages, plus the version to resume from;
+        that is ``None`` once the log is exhausted.
+        """
+        n = len(self._keys)
+        start = int(np.searchsorted(self._versions[:n], version, side="right"))
+        latest = self._latest
+        changes: list[tuple[ChangeKind, UUID]] = []
+        through = version
+        while start < n:
+            stop = min(n, start + 4 * limit)
+            window = zip(
+                self._versions[start:stop].tolist(),
+                self._kinds[start:stop].tolist(),
+                self._keys[start:stop],
+                strict=True,
+            )
+            for changed_at, code, key in window:
+                if len(changes) >= limit and changed_at != through:
+                    return changes, through
+                through = changed_at
+                if latest[code, key] == changed_at:
+                    changes.append((CHANGE_KINDS[code], key))
+            start = stop
+        return changes, None
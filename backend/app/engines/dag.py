@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from .text import normalize
+
+ANCESTOR_CACHE_SIZE = 4096
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n: int) -> tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32)
+
+
+class PrerequisiteGraph:
+    """Concept prerequisite DAG over interned integer ids, stored as CSR arrays.
+
+    ``parents`` lists each concept's direct prerequisites and ``children`` the
+    reverse edges. Topological order and per-concept ancestor sets are computed
+    lazily and cached until the edge set changes; ancestor sets are kept for
+    the ``ANCESTOR_CACHE_SIZE`` most recently queried concepts only.
+    """
+
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self._index: dict[str, int] = {}
+        self._src = np.zeros(0, dtype=np.int32)
+        self._dst = np.zeros(0, dtype=np.int32)
+        self._parents = (np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+        self._children = (np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+        self._rank: np.ndarray | None = None
+        self._depth: np.ndarray | None = None
+        # lru_cache is thread-safe, and the graph is shared by every learner.
+        self.ancestors = lru_cache(maxsize=ANCESTOR_CACHE_SIZE)(self._walk_ancestors)
+
+    @classmethod
+    def load(cls, path: Path) -> PrerequisiteGraph:
+        """Bulk-load ``concept<TAB>prerequisite`` lines; ``#`` starts a comment."""
+        edges = []
+        with path.open(encoding="utf-8") as handle:
+            for line in handle:
+                line = line.rstrip("\n")
+                if not line or line.startswith("#"):
+                    continue
+                concept, prerequisite = line.split("\t", 1)
+                edges.append((concept.strip(), prerequisite.strip()))
+        graph = cls()
+        graph.add_edges(edges)
+        return graph
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        key = normalize(name)
+        index = self._index.get(key)
+        if index is None:
+            index = self._index[key] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def index_of(self, name: str) -> int | None:
+        return self._index.get(normalize(name))
+
+    def add_edges(self, edges: Iterable[tuple[str, str]]) -> None:
+        """Add ``(concept, prerequisite)`` pairs and rebuild the CSR arrays once."""
+        pairs = [(self.intern(concept), self.intern(prereq)) for concept, prereq in edges]
+        if pairs:
+            new = np.asarray(pairs, dtype=np.int32)
+            self._src = np.concatenate([self._src, new[:, 0]])
+            self._dst = np.concatenate([self._dst, new[:, 1]])
+        n = len(self.names)
+        self._parents = _csr(self._src, self._dst, n)
+        self._children = _csr(self._dst, self._src, n)
+        self._rank = None
+        self._depth = None
+        self.ancestors.cache_clear()
+
+    def prerequisites(self, index: int) -> np.ndarray:
+        indptr, indices = self._parents
+        return indices[indptr[index] : indptr[index + 1]]
+
+    def rank(self) -> np.ndarray:
+        """Topological position of every concept (prerequisites first); raises on cycles."""
+        if self._rank is None:
+            n = len(self.names)
+            indptr, indices = self._children
+            indegree = np.diff(self._parents[0]).astype(np.int64)
+            ready = deque(np.flatnonzero(indegree == 0).tolist())
+            rank = np.full(n, -1, dtype=np.int64)
+            position = 0
+            while ready:
+                node = ready.popleft()
+                rank[node] = position
+                position += 1
+                for child in indices[indptr[node] : indptr[node + 1]].tolist():
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        ready.append(child)
+            if position != n:
+                raise ValueError("prerequisite graph contains a cycle")
+            self._rank = rank
+        return self._rank
+
+    def depth(self) -> np.ndarray:
+        """Longest prerequisite chain below each concept; prerequisites are always shallower."""
+        if self._depth is None:
+            indptr, indices = self._parents
+            depth = np.zeros(len(self.names), dtype=np.int64)
+            for node in np.argsort(self.rank()).tolist():
+                parents = indices[indptr[node] : indptr[node + 1]]
+                if len(parents):
+                    depth[node] = depth[parents].max() + 1
+            self._depth = depth
+        return self._depth
+
+    def depth_of(self, name: str) -> int:
+        index = self.index_of(name)
+        return 0 if index is None else int(self.depth()[index])
+
+    def _walk_ancestors(self, index: int) -> frozenset[int]:
+        indptr, indices = self._parents
+        seen: set[int] = set()
+        stack = [index]
+        while stack:
+            node = stack.pop()
+            for parent in indices[indptr[node] : indptr[node + 1]].tolist():
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return frozenset(seen)
+
+
+@lru_cache(maxsize=4)
+def load_graph(path: Path) -> PrerequisiteGraph:
+    return PrerequisiteGraph.load(path)
+
+
+class DAGEngine:
+    """Per-learner view of the shared prerequisite graph.
+
+    Violations are checked against each concept's full (cached) ancestor set,
+    so a missing grand-prerequisite is reported as well as a missing direct one.
+    Coverage counts the notes covering each concept, so ``forget`` withdraws
+    one note's concepts without uncovering those other notes still cover.
+    """
+
+    def __init__(self, graph: PrerequisiteGraph) -> None:
+        self.graph = graph
+        self._covered: dict[int, int] = {}
+
+    def is_covered(self, name: str) -> bool:
+        index = self.graph.index_of(name)
+        return index is not None and index in self._covered
+
+    def observe(self, concepts: Iterable[str]) -> None:
+        """Record concepts from a note as covered by the learner."""
+        for concept in concepts:
+            index = self.graph.index_of(concept)
+            if index is not None:
+                self._covered[index] = self._covered.get(index, 0) + 1
+
+    def forget(self, concepts: Iterable[str]) -> None:
+        """Withdraw an earlier ``observe(concepts)``, e.g. before a note's concepts change."""
+        for concept in concepts:
+            index = self.graph.index_of(concept)
+            if index is None:
+                continue
+            refs = self._covered.get(index, 0) - 1
+            if refs > 0:
+                self._covered[index] = refs
+            else:
+                self._covered.pop(index, None)
+
+    def missing_prerequisites(self, concepts: Iterable[str]) -> list[str]:
+        """Prerequisites of ``concepts`` the learner has not covered, foundations first.
+
+        Depends only on the concept set and current coverage, so re-analysing
+        an unchanged note reports the same violations.
+        """
+        missing: set[int] = set()
+        for concept in concepts:
+            index = self.graph.index_of(concept)
+            if index is not None:
+                missing.update(self.graph.ancestors(index))
+        missing -= self._covered.keys()
+        rank = self.graph.rank()
+        return [self.graph.names[index] for index in sorted(missing, key=rank.__getitem__)]
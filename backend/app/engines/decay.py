@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+
+from ..constants import ANCHOR_DECAY_RATE
+
+MASTERED_THRESHOLD = 0.8
+REVIEW_THRESHOLD = 0.5
+PIN_LEVELS = ("mastered", "review", "gap")
+SECONDS_PER_DAY = 86_400.0
+
+
+def decayed_strength(base: np.ndarray, reviewed_at: np.ndarray, now: float) -> np.ndarray:
+    """Exponential forgetting at ``ANCHOR_DECAY_RATE`` per day since the last review."""
+    days = np.maximum(0.0, now - reviewed_at) / SECONDS_PER_DAY
+    return base * np.exp(-ANCHOR_DECAY_RATE * days)
+
+
+def pin_levels(strength: np.ndarray) -> np.ndarray:
+    """Index into ``PIN_LEVELS`` for each strength."""
+    return np.where(
+        strength >= MASTERED_THRESHOLD, 0, np.where(strength >= REVIEW_THRESHOLD, 1, 2)
+    ).astype(np.uint8)
+
+
+class StrengthColumns:
+    """Array-backed strength state for every anchor, decayed lazily on read.
+
+    ``base`` and ``reviewed_at`` are only written on review; current strength is
+    always derived from them, so nothing has to be rewritten as time passes.
+    ``published`` and ``pins`` remember what was last pushed to the models so a
+    full pass can find the few anchors that actually changed. Slots are dense
+    row numbers owned by the caller.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._size = 0
+        self.base = np.zeros(capacity, dtype=np.float32)
+        self.reviewed_at = np.zeros(capacity, dtype=np.float64)
+        self.fixed_pin = np.zeros(capacity, dtype=bool)
+        self.published = np.zeros(capacity, dtype=np.float32)
+        self.pins = np.zeros(capacity, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        for name in ("base", "reviewed_at", "fixed_pin", "published", "pins"):
+            column = getattr(self, name)
+            grown = np.zeros(2 * len(column), dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def upsert(self, slot: int, base: float, reviewed_at: float, fixed_pin: bool) -> None:
+        """Overwrite ``slot``; the next free slot (``len(self)``) appends."""
+        if slot == self._size:
+            if slot == len(self.base):
+                self._grow()
+            self._size += 1
+        self.base[slot] = base
+        self.reviewed_at[slot] = reviewed_at
+        self.fixed_pin[slot] = fixed_pin
+        self.published[slot] = base
+        self.pins[slot] = pin_levels(np.asarray([base]))[0]
+
+    def extend(self, base: np.ndarray, reviewed_at: np.ndarray, fixed_pin: np.ndarray) -> None:
+        """Append one slot per entry, as ``upsert`` at ``len(self)`` would."""
+        start, end = self._size, self._size + len(base)
+        while end > len(self.base):
+            self._grow()
+        self._size = end
+        self.base[start:end] = base
+        self.reviewed_at[start:end] = reviewed_at
+        self.fixed_pin[start:end] = fixed_pin
+        self.published[start:end] = base
+        self.pins[start:end] = pin_levels(self.base[start:end])
+
+    def current(self, slots: np.ndarray, now: float) -> tuple[np.ndarray, np.ndarray]:
+        strength = decayed_strength(self.base[slots], self.reviewed_at[slots], now)
+        return strength, pin_levels(strength)
+
+    def stale(self, now: float, tolerance: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Slots whose decayed strength or pin level drifted from the published values."""
+        n = self._size
+        strength, levels = self.current(np.arange(n), now)
+        drifted = (np.abs(strength - self.published[:n]) > tolerance) | (
+            (levels != self.pins[:n]) & ~self.fixed_pin[:n]
+        )
+        slots = np.flatnonzero(drifted)
+        return slots, strength[slots], levels[slots]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import re
+import string
+from collections.abc import Iterable
+from functools import lru_cache
+from itertools import repeat
+from operator import getitem, itemgetter
+from typing import Any
+
+import numpy as np
+
+from .kcs import CurriculumCatalog
+from .text import normalize
+
+# Word splitting runs over UTF-8 bytes so the common ASCII case is one C-level
+# table lookup per byte; bytes >= 0x80 pass through untouched.
+_ASCII_BREAKS = bytes.maketrans(
+    string.punctuation.replace("_", "").encode(), b" " * (len(string.punctuation) - 1)
+)
+# Marks NFKC leaves outside ASCII: typographic quotes and dashes, CJK punctuation.
+# A character class rather than str.translate, whose mapping lookup runs per character.
+_UNICODE_BREAKS = re.compile("[‘’‚“”„«»‹›·•…‐‑‒–—―。、〃「」『』【】〈〉《》〔〕・]")
+_HANGUL = re.compile("[가-힣]")
+_END = ""
+# Slots per first word in the start filter; about 6% of non-starting words pass it.
+FILTER_SLOTS_PER_HEAD = 16
+MIN_FILTER_SLOTS = 1 << 12
+
+
+def tokens(text: str) -> list[str]:
+    """Normalized words of ``text``; aliases and notes are split the same way."""
+    folded = normalize(text)
+    if not folded.isascii():
+        folded = _UNICODE_BREAKS.sub(" ", folded)
+    return folded.encode().translate(_ASCII_BREAKS).decode().split()
+
+
+def _hashes(words: Iterable[str], count: int) -> np.ndarray:
+    return np.fromiter(map(hash, words), dtype=np.int64, count=count)
+
+
+def _is_hangul(word: str) -> bool:
+    return "가" <= word[0] <= "힣"
+
+
+class AliasTrie:
+    """Concept names and aliases as a trie over normalized words.
+
+    Matching walks whole words, so "energy" never fires inside "synergy",
+    and a Hangul word also matches through its longest known prefix so that
+    attached particles (양자역학은, 이론을) do not hide a concept. Adding a
+    concept is a handful of dict inserts; there are no failure links to
+    rebuild because every walk restarts at its own starting word.
+
+    With hundreds of thousands of aliases the root dict no longer fits in
+    cache, so starts are screened first by a hashed bitmap of first words
+    checked for all words at once; only survivors touch the trie.
+    """
+
+    def __init__(self) -> None:
+        self._root: dict[str, Any] = {}
+        self._filter = np.zeros(MIN_FILTER_SLOTS, dtype=bool)
+        self._stem_lengths: list[int] = []
+        self.size = 0
+
+    def _admit(self, head: str) -> None:
+        if len(self._root) * FILTER_SLOTS_PER_HEAD <= len(self._filter):
+            self._filter[hash(head) & (len(self._filter) - 1)] = True
+            return
+        size = 2 * len(self._filter)
+        self._filter = np.zeros(size, dtype=bool)
+        self._filter[_hashes(self._root, len(self._root)) & (size - 1)] = True
+
+    def add(self, name: str, aliases: Iterable[str] = ()) -> None:
+        for label in (name, *aliases):
+            words = tokens(label)
+            if not words:
+                continue
+            if words[0] not in self._root:
+                self._root[words[0]] = {}
+                self._admit(words[0])
+            node = self._root
+            for word in words:
+                node = node.setdefault(word, {})
+                if _is_hangul(word) and len(word) not in self._stem_lengths:
+                    self._stem_lengths.append(len(word))
+                    self._stem_lengths.sort(reverse=True)
+            names = node.setdefault(_END, [])
+            if name not in names:
+                names.append(name)
+                self.size += 1
+
+    def _step(self, node: dict[str, Any], word: str) -> tuple[dict[str, Any] | None, bool]:
+        """Child for ``word`` and whether it was reached through a Hangul prefix."""
+        child = node.get(word)
+        if child is not None or not self._stem_lengths or not _is_hangul(word):
+            return child, False
+        for length in self._stem_lengths:
+            if length < len(word):
+                child = node.get(word[:length])
+                if child is not None:
+                    return child, True
+        return None, False
+
+    def scan(self, words: list[str], hangul: bool = True) -> list[tuple[int, str]]:
+        """``(position, name)`` for every alias occurrence in ``words``, in order.
+
+        Python only runs at words that pass the start filter.
+        ``hangul=False`` skips the prefix passes for text without Hangul.
+        """
+        root, n = self._root, len(words)
+        mask = len(self._filter) - 1
+        starts = np.flatnonzero(self._filter[_hashes(words, n) & mask])
+        if hangul:
+            for length in self._stem_lengths:
+                prefixes = map(getitem, words, repeat(slice(length)))
+                stems = np.flatnonzero(self._filter[_hashes(prefixes, n) & mask])
+                starts = np.union1d(starts, stems)
+        found: list[tuple[int, str]] = []
+        for start in starts.tolist():
+            node, stemmed = self._step(root, words[start])
+            position = start
+            while node is not None:
+                names = node.get(_END)
+                if names:
+                    found.extend((start, name) for name in names)
+                position += 1
+                # A particle ends the phrase, so a stemmed word is always the last one.
+                if stemmed or position == len(words):
+                    break
+                node, stemmed = self._step(node, words[position])
+        return found
+
+
+@lru_cache(maxsize=4)
+def catalog_trie(catalog: CurriculumCatalog) -> AliasTrie:
+    """Trie over every curriculum concept, built once per catalog and shared by all users."""
+    trie = AliasTrie()
+    for curriculum in catalog.subjects.values():
+        for name in curriculum.concepts:
+            trie.add(name, catalog.aliases.get(name, ()))
+    return trie
+
+
+class ConceptExtractor:
+    """Known concepts mentioned in a note: a shared catalog trie plus the learner's own.
+
+    New concepts are added to the learner's trie as they are interned and
+    apply to notes extracted afterwards; earlier notes keep their concepts.
+    """
+
+    def __init__(self, base: AliasTrie | None = None) -> None:
+        self.base = base
+        self.own = AliasTrie()
+
+    def add(self, name: str, aliases: Iterable[str] = ()) -> None:
+        self.own.add(name, aliases)
+
+    def extract(self, text: str) -> list[str]:
+        """Canonical names in order of first mention, each once."""
+        words = tokens(text)
+        hangul = not text.isascii() and _HANGUL.search(text) is not None
+        found = self.own.scan(words, hangul)
+        if self.base is not None:
+            found += self.base.scan(words, hangul)
+            found.sort(key=itemgetter(0))
+        return list(dict.fromkeys(name for _, name in found))
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+from .spatial import EARTH_RADIUS_KM
+
+MINUTES_PER_STOP = 5
+MINUTES_PER_1000_KM = 1.0
+TWO_OPT_PASSES = 20
+# Stops per route; planning cost is quadratic in this, never in the anchor count.
+ROUTE_STOPS = 200
+
+
+def select_stops(strengths: np.ndarray, limit: int = ROUTE_STOPS) -> np.ndarray:
+    """Rows of the ``limit`` weakest anchors, ascending, chosen in linear time."""
+    if len(strengths) <= limit:
+        return np.arange(len(strengths))
+    return np.sort(np.argpartition(strengths, limit - 1)[:limit])
+
+
+def haversine_matrix(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Pairwise great-circle distances in km for all points at once."""
+    phi = np.radians(latitudes)[:, None]
+    lmb = np.radians(longitudes)[:, None]
+    a = (
+        np.sin((phi - phi.T) / 2) ** 2
+        + np.cos(phi) * np.cos(phi.T) * np.sin((lmb - lmb.T) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _nearest_neighbour(dist: np.ndarray, nodes: np.ndarray, start: int | None) -> list[int]:
+    remaining = nodes.tolist()
+    if start is None:
+        # Open paths start best at an extreme point: the one farthest from all others.
+        current = remaining[int(np.argmax(dist[np.ix_(nodes, nodes)].sum(axis=1)))]
+    else:
+        current = remaining[int(np.argmin(dist[start, nodes]))]
+    order = [current]
+    remaining.remove(current)
+    while remaining:
+        candidates = np.asarray(remaining)
+        current = int(candidates[np.argmin(dist[current, candidates])])
+        order.append(current)
+        remaining.remove(current)
+    return order
+
+
+def _two_opt(dist: np.ndarray, route: np.ndarray, lo: int, hi: int) -> None:
+    """Improve ``route[lo:hi]`` in place by segment reversals; endpoints outside stay fixed."""
+    n = len(route)
+    for _ in range(TWO_OPT_PASSES):
+        improved = False
+        for i in range(lo, hi - 1):
+            j = np.arange(i + 1, hi)
+            a = route[i - 1] if i > 0 else -1
+            b = route[i]
+            c = route[j]
+            has_next = j + 1 < n
+            d = route[np.minimum(j + 1, n - 1)]
+            before = (dist[a, b] if a >= 0 else 0.0) + np.where(has_next, dist[c, d], 0.0)
+            after = (dist[a, c] if a >= 0 else 0.0) + np.where(has_next, dist[b, d], 0.0)
+            gain = before - after
+            best = int(np.argmax(gain))
+            if gain[best] > 1e-9:
+                route[i : j[best] + 1] = route[i : j[best] + 1][::-1].copy()
+                improved = True
+        if not improved:
+            return
+
+
+def plan_route(
+    latitudes: Sequence[float], longitudes: Sequence[float], group_keys: Sequence[tuple[int, int]]
+) -> tuple[list[int], float]:
+    """Order stops to keep travel short while visiting groups in ascending key order.
+
+    ``group_keys`` are ``(bloom index, prerequisite depth)`` per stop, so lower
+    Bloom levels and prerequisites always come first; stops sharing a key are
+    freely reordered with nearest-neighbour construction plus 2-opt. Returns
+    the stop order and total distance in km.
+    """
+    n = len(latitudes)
+    if n == 0:
+        return [], 0.0
+    dist = haversine_matrix(np.asarray(latitudes, float), np.asarray(longitudes, float))
+    keys = np.asarray(group_keys, dtype=np.int64).reshape(n, 2)
+    group_ids = np.unique(keys, axis=0, return_inverse=True)[1].ravel()
+
+    order: list[int] = []
+    spans: list[tuple[int, int]] = []
+    for group in range(int(group_ids.max()) + 1):
+        nodes = np.flatnonzero(group_ids == group)
+        spans.append((len(order), len(order) + len(nodes)))
+        order.extend(_nearest_neighbour(dist, nodes, order[-1] if order else None))
+
+    route = np.asarray(order, dtype=np.int64)
+    for lo, hi in spans:
+        if hi - lo > 2:
+            _two_opt(dist, route, lo, hi)
+    total = float(dist[route[:-1], route[1:]].sum()) if n > 1 else 0.0
+    return route.tolist(), total
+
+
+def estimate_minutes(stops: int, distance_km: float) -> int:
+    return math.ceil(stops * MINUTES_PER_STOP + distance_km / 1000.0 * MINUTES_PER_1000_KM)
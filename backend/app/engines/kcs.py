@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from .text import normalize
+
+
+@dataclass(slots=True)
+class Curriculum:
+    subject: str
+    concepts: list[str]
+    full_mask: int = 0
+
+    def __post_init__(self) -> None:
+        self.full_mask = (1 << len(self.concepts)) - 1
+
+
+class CurriculumCatalog:
+    """Subjects and their concept lists; each concept owns one bit in its subject."""
+
+    def __init__(self) -> None:
+        self.subjects: dict[str, Curriculum] = {}
+        self.aliases: dict[str, list[str]] = {}
+        self._bits: dict[str, list[tuple[str, int]]] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> CurriculumCatalog:
+        """Load ``{"Subject": [{"name": ..., "aliases": [...]}, ...]}`` JSON."""
+        catalog = cls()
+        for subject, entries in json.loads(path.read_text(encoding="utf-8")).items():
+            catalog.add_subject(
+                subject,
+                [(entry["name"], entry.get("aliases", [])) for entry in entries],
+            )
+        return catalog
+
+    def add_subject(self, subject: str, concepts: list[tuple[str, list[str]]]) -> None:
+        key = normalize(subject)
+        curriculum = Curriculum(subject=subject, concepts=[name for name, _ in concepts])
+        self.subjects[key] = curriculum
+        for bit, (name, aliases) in enumerate(concepts):
+            self.aliases.setdefault(name, []).extend(aliases)
+            for label in (name, *aliases):
+                self._bits.setdefault(normalize(label), []).append((key, bit))
+
+    def get(self, subject: str) -> Curriculum | None:
+        return self.subjects.get(normalize(subject))
+
+    def bits_for(self, concept: str) -> list[tuple[str, int]]:
+        return self._bits.get(normalize(concept), [])
+
+
+@lru_cache(maxsize=4)
+def load_catalog(path: Path) -> CurriculumCatalog:
+    return CurriculumCatalog.load(path)
+
+
+def _set_bits(mask: int) -> Iterator[int]:
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class KCSEngine:
+    """Per-learner curriculum coverage held as one integer bitset per subject.
+
+    Each set bit also carries the number of notes covering it, so a note
+    whose concepts change can withdraw its old ones without clearing bits
+    other notes still cover.
+    """
+
+    def __init__(self, catalog: CurriculumCatalog) -> None:
+        self.catalog = catalog
+        self._covered: dict[str, int] = {}
+        self._refs: dict[tuple[str, int], int] = {}
+
+    def cover(self, concepts: Iterable[str]) -> set[str]:
+        """Count one more note covering ``concepts``; cost is proportional to ``concepts``.
+
+        Returns the touched subjects.
+        """
+        return self._count(concepts, 1)
+
+    def uncover(self, concepts: Iterable[str]) -> set[str]:
+        """Withdraw an earlier ``cover(concepts)``; returns the touched subjects."""
+        return self._count(concepts, -1)
+
+    def _count(self, concepts: Iterable[str], delta: int) -> set[str]:
+        touched: set[str] = set()
+        for concept in concepts:
+            for key, bit in self.catalog.bits_for(concept):
+                refs = self._refs.get((key, bit), 0) + delta
+                mask = self._covered.get(key, 0)
+                if refs > 0:
+                    self._refs[key, bit] = refs
+                    self._covered[key] = mask | (1 << bit)
+                else:
+                    self._refs.pop((key, bit), None)
+                    mask &= ~(1 << bit)
+                    if mask:
+                        self._covered[key] = mask
+                    else:
+                        self._covered.pop(key, None)
+                touched.add(key)
+        return touched
+
+    def coverage(self, subject: str) -> float:
+        curriculum = self.catalog.get(subject)
+        if curriculum is None or not curriculum.concepts:
+            return 0.0
+        covered = self._covered.get(normalize(subject), 0)
+        return covered.bit_count() / len(curriculum.concepts)
+
+    def gap_count(self, subject: str) -> int:
+        curriculum = self.catalog.get(subject)
+        if curriculum is None:
+            return 0
+        return len(curriculum.concepts) - self._covered.get(normalize(subject), 0).bit_count()
+
+    def uncovered(self, subject: str, limit: int | None = None) -> list[str]:
+        curriculum = self.catalog.get(subject)
+        if curriculum is None:
+            return []
+        missing = curriculum.full_mask & ~self._covered.get(normalize(subject), 0)
+        names = []
+        for bit in _set_bits(missing):
+            if limit is not None and len(names) >= limit:
+                break
+            names.append(curriculum.concepts[bit])
+        return names
+
+    def touched_subjects(self) -> list[str]:
+        return [self.catalog.subjects[key].subject for key in self._covered]
+
+    def by_subject(self, subjects: Iterable[str]) -> list[dict[str, object]]:
+        rows = []
+        seen: set[str] = set()
+        for subject in subjects:
+            curriculum = self.catalog.get(subject)
+            if curriculum is None or normalize(subject) in seen:
+                continue
+            seen.add(normalize(subject))
+            rows.append(
+                {
+                    "subject": curriculum.subject,
+                    "coverage_pct": round(self.coverage(subject), 4),
+                    "gap_count": self.gap_count(subject),
+                }
+            )
+        return rows
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Literal, Protocol
+from uuid import UUID
+
+JobStatus = Literal["pending", "ready", "failed"]
+BatchFn = Callable[[list[dict[str, Any]]], list[Any]]
+# Terminal states remembered for status polls; older ones are forgotten first.
+FINISHED_HISTORY = 4096
+
+
+class AnalysisSink(Protocol):
+    """Receiver for a job's result, e.g. the store that owns the note."""
+
+    def complete_analysis(self, job_id: UUID, result: Any) -> None: ...
+
+    def flush_analyses(self) -> None: ...
+
+
+Job = tuple[UUID, dict[str, Any], AnalysisSink]
+
+
+class AnalysisQueueFull(Exception):
+    """Raised when the analysis backlog is at capacity; callers should retry later."""
+
+
+class AnalysisPipeline:
+    """Bounded job queue drained in batches by dispatcher threads into a worker pool.
+
+    ``batch_fn`` runs in the pool and must be a picklable top-level function when
+    the process executor is used. Each job names the sink that receives its
+    result back in this process, so one pool serves every user's store: sinks
+    get one ``complete_analysis`` call per job, then one ``flush_analyses``
+    call per batch they appeared in.
+
+    Bulk submissions (``submit_many``) never fail: jobs that do not fit wait
+    in an unbounded overflow that dispatchers feed into the queue as they
+    drain it, and only up to half its capacity, so interactive ``submit``
+    calls keep headroom while an import is being analysed.
+
+    Pending jobs are tracked unconditionally, counted per id so a job
+    resubmitted while an earlier run is in flight stays pending until both
+    finish; ready and failed states are kept for the last
+    ``FINISHED_HISTORY`` jobs, since a sink normally answers for finished
+    jobs itself.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFn,
+        workers: int,
+        queue_size: int,
+        batch_size: int,
+        executor: Literal["process", "thread"] = "process",
+    ) -> None:
+        self.batch_fn = batch_fn
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.executor_kind = executor
+        self._queue: queue.Queue[Job] = queue.Queue(maxsize=queue_size)
+        self._bulk_limit = max(1, queue_size // 2)
+        self._overflow: deque[Job] = deque()
+        self._overflow_lock = threading.Lock()
+        self._pending: dict[UUID, int] = {}
+        self._finished: OrderedDict[UUID, JobStatus] = OrderedDict()
+        self._status_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._executor: Executor | None = None
+        self._threads: list[threading.Thread] = []
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                return
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(
+                    target=self._dispatch, name=f"analysis-dispatch-{index}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, job_id: UUID, payload: dict[str, Any], sink: AnalysisSink) -> None:
+        self._start()
+        self._track([job_id], 1)
+        try:
+            self._queue.put_nowait((job_id, payload, sink))
+        except queue.Full:
+            self._track([job_id], -1)
+            raise AnalysisQueueFull("analysis queue is full") from None
+
+    def submit_many(self, jobs: list[tuple[UUID, dict[str, Any]]], sink: AnalysisSink) -> None:
+        """Queue a batch of jobs, parking whatever the queue cannot take yet."""
+        self._start()
+        self._track([job_id for job_id, _ in jobs], 1)
+        with self._overflow_lock:
+            self._overflow.extend((job_id, payload, sink) for job_id, payload in jobs)
+            self._refill()
+
+    def _refill(self) -> None:
+        """Move overflow jobs into the queue; caller holds ``_overflow_lock``."""
+        while self._overflow and self._queue.qsize() < self._bulk_limit:
+            try:
+                self._queue.put_nowait(self._overflow[0])
+            except queue.Full:
+                break
+            self._overflow.popleft()
+
+    def _track(self, job_ids: list[UUID], delta: int) -> None:
+        with self._status_lock:
+            for job_id in job_ids:
+                count = self._pending.get(job_id, 0) + delta
+                if count > 0:
+                    self._pending[job_id] = count
+                else:
+                    self._pending.pop(job_id, None)
+
+    def _finish(self, job_id: UUID, state: JobStatus) -> None:
+        self._track([job_id], -1)
+        self._remember(job_id, state)
+
+    def _remember(self, job_id: UUID, state: JobStatus) -> None:
+        with self._status_lock:
+            self._finished[job_id] = state
+            self._finished.move_to_end(job_id)
+            while len(self._finished) > FINISHED_HISTORY:
+                self._finished.popitem(last=False)
+
+    def status(self, job_id: UUID) -> JobStatus | None:
+        with self._status_lock:
+            if job_id in self._pending:
+                return "pending"
+            return self._finished.get(job_id)
+
+    def depth(self) -> int:
+        return self._queue.qsize() + len(self._overflow)
+
+    def _dispatch(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._overflow:
+                with self._overflow_lock:
+                    self._refill()
+            executor = self._executor
+            assert executor is not None
+            try:
+                results = executor.submit(self.batch_fn, [job[1] for job in batch]).result()
+            except Exception:
+                for job_id, _, _ in batch:
+                    self._finish(job_id, "failed")
+            else:
+                for (job_id, _, sink), result in zip(batch, results, strict=True):
+                    try:
+                        sink.complete_analysis(job_id, result)
+                    except Exception:
+                        self._finish(job_id, "failed")
+                    else:
+                        self._finish(job_id, "ready")
+                for sink in dict.fromkeys(job[2] for job in batch):
+                    try:
+                        sink.flush_analyses()
+                    except Exception:
+                        for job_id, _, owner in batch:
+                            if owner is sink:
+                                self._remember(job_id, "failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def join(self) -> None:
+        """Block until every queued job has completed."""
+        self._queue.join()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..constants import DAILY_QUEST_COUNT, QUEST_TYPES
+from .bloom import BLOOM_LEVELS
+from .zpd import TOP_LEVEL
+
+EXPLORE_LEVEL = BLOOM_LEVELS.index("understand")
+
+
+@dataclass(slots=True)
+class ConceptSignals:
+    """Per-concept planning inputs as aligned arrays, one slot per candidate concept."""
+
+    level: np.ndarray
+    readiness: np.ndarray
+    strength: np.ndarray
+    reviews: np.ndarray
+
+
+@dataclass(slots=True, frozen=True)
+class QuestPick:
+    type: str
+    concept: int | None
+    bloom_target: int | None
+
+
+def plan_daily(signals: ConceptSignals, count: int = DAILY_QUEST_COUNT) -> list[QuestPick]:
+    """Pick ``count`` quests cycling through ``QUEST_TYPES``, each on a distinct concept.
+
+    ``gap_review`` goes to the ready concept whose anchors decayed most and
+    targets its current level, ``bloom_push`` to the readiest concept below
+    the top level and targets the next one, and ``new_explore`` to the least
+    reviewed concept, readiest first. Concepts are only reused once every
+    candidate already has a quest.
+    """
+    n = len(signals.level)
+    if n == 0:
+        return [QuestPick(QUEST_TYPES[i % len(QUEST_TYPES)], None, None) for i in range(count)]
+    level, readiness = signals.level, signals.readiness
+    orders = {
+        "gap_review": np.argsort(-readiness * (1.0 - signals.strength), kind="stable"),
+        "bloom_push": np.lexsort((-readiness, level >= TOP_LEVEL)),
+        "new_explore": np.lexsort((-readiness, signals.reviews)),
+    }
+    targets = {
+        "gap_review": level,
+        "bloom_push": np.minimum(level + 1, TOP_LEVEL),
+        "new_explore": np.maximum(level, EXPLORE_LEVEL),
+    }
+    used = np.zeros(n, dtype=bool)
+    picks = []
+    for i in range(count):
+        kind = QUEST_TYPES[i % len(QUEST_TYPES)]
+        order = orders[kind]
+        free = order[~used[order]]
+        concept = int(free[0] if len(free) else order[0])
+        used[concept] = True
+        picks.append(QuestPick(kind, concept, int(targets[kind][concept])))
+    return picks
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from itertools import chain, product
+
+import numpy as np
+
+from .spatial import EARTH_RADIUS_KM
+
+REGION_EPS_KM = 150.0
+REGION_MIN_POINTS = 3
+
+PAIR_BLOCK = 1 << 20  # member x candidate pairs compared per NumPy block
+
+_OFFSETS = tuple(product((-1, 0, 1), repeat=3))
+
+
+@dataclass(slots=True)
+class RegionSummary:
+    latitude: float
+    longitude: float
+    radius_km: float
+    concept_count: int
+    size: int
+
+
+def _distinct(rows: np.ndarray, roots: np.ndarray, end: int) -> tuple[np.ndarray, np.ndarray]:
+    """Deduplicated ``(row, root)`` links, with every id below ``end``.
+
+    Pairs mostly arrive as runs of one row meeting a single root, so only
+    runs spanning several roots go through the sort.
+    """
+    if not len(rows):
+        return rows, roots
+    heads = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    low = np.minimum.reduceat(roots, heads)
+    mixed = np.repeat(low != np.maximum.reduceat(roots, heads), np.diff(heads, append=len(rows)))
+    pairs = np.unique(np.concatenate([rows[heads] * end + low, rows[mixed] * end + roots[mixed]]))
+    return pairs // end, pairs % end
+
+
+class _Forest:
+    """Union-find over one batch's nodes, merged by vectorised hooking.
+
+    New rows ``start..start + n`` take local ids ``0..n``; older nodes get the
+    following ids on first sight. ``link`` hooks each edge's root onto the
+    smaller one and pointer-jumps until every edge is settled, which takes a
+    logarithmic number of rounds however many edges a block carries.
+    """
+
+    def __init__(self, start: int, n: int) -> None:
+        self.start = start
+        self.size = n
+        self.label = np.arange(n)
+        self.old: dict[int, int] = {}
+
+    def ids(self, nodes: np.ndarray) -> np.ndarray:
+        """Local ids of ``nodes``; pass rows older than the batch in small, deduped sets."""
+        local = nodes - self.start
+        older = local < 0
+        if older.any():
+            base = self.size
+            old = self.old
+            local[older] = [old.setdefault(node, base + len(old)) for node in nodes[older].tolist()]
+            grown = np.arange(len(self.label), base + len(old))
+            if len(grown):
+                self.label = np.concatenate([self.label, grown])
+        return local
+
+    def link(self, a: np.ndarray, b: np.ndarray) -> None:
+        label = self.label
+        while True:
+            root_a, root_b = label[a], label[b]
+            if np.array_equal(root_a, root_b):
+                break
+            low = np.minimum(root_a, root_b)
+            np.minimum.at(label, root_a, low)
+            np.minimum.at(label, root_b, low)
+            while True:
+                jumped = label[label]
+                if np.array_equal(jumped, label):
+                    break
+                label = jumped
+        self.label = label
+
+    def roots(self) -> tuple[np.ndarray, np.ndarray]:
+        """``(nodes, roots)`` for every node whose component root is another node."""
+        nodes = np.concatenate(
+            [
+                np.arange(self.start, self.start + self.size),
+                np.fromiter(self.old, dtype=np.int64, count=len(self.old)),
+            ]
+        )
+        moved = np.flatnonzero(self.label != np.arange(len(self.label)))
+        return nodes[moved], nodes[self.label[moved]]
+
+
+class RegionClusterer:
+    """Insert-only DBSCAN over anchors on a grid of 3D unit vectors.
+
+    Points live on the unit sphere, so an ``eps_km`` great-circle radius is a
+    fixed chord length and a grid with that cell size finds every neighbour in
+    the 27 surrounding cells, with no special cases at the poles or the
+    antimeridian. Anchors are never moved or deleted, so clusters can only grow
+    or merge: each insert bumps the neighbour counts around it and unions any
+    point that just became core with its core neighbours, touching only the
+    clusters next to the new anchors. Cells are keyed by a single integer
+    code, so a batch of inserts finds all of its neighbour pairs with a few
+    sorted-array searches instead of a Python loop per point.
+    """
+
+    def __init__(
+        self,
+        eps_km: float = REGION_EPS_KM,
+        min_points: int = REGION_MIN_POINTS,
+        capacity: int = 1024,
+    ) -> None:
+        self.min_points = min_points
+        self._chord = 2.0 * math.sin(eps_km / EARTH_RADIUS_KM / 2.0)
+        # Cell coordinates lie in [-1 / chord - 1, 1 / chord]; shift them to be
+        # non-negative and pack (x, y, z) into one code with ``width`` per axis.
+        self._origin = math.ceil(1.0 / self._chord) + 2
+        self._width = 2 * self._origin + 1
+        self._offsets = np.array(
+            [(dx * self._width + dy) * self._width + dz for dx, dy, dz in _OFFSETS], dtype=np.int64
+        )
+        self._size = 0
+        self._cells: dict[int, array[int]] = {}
+        self._concept_codes: dict[str, int] = {}
+        self._xyz = np.zeros((capacity, 3), dtype=np.float64)
+        self._concept = np.zeros(capacity, dtype=np.int64)
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._parent = np.zeros(capacity, dtype=np.int64)
+        self._owner = np.full(capacity, -1, dtype=np.int64)
+        self._version = 0
+        self._cache: tuple[int, list[RegionSummary], np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        for name, fill in (
+            ("_xyz", 0.0),
+            ("_concept", 0),
+            ("_count", 0),
+            ("_parent", 0),
+            ("_owner", -1),
+        ):
+            column = getattr(self, name)
+            grown = np.full((2 * len(column), *column.shape[1:]), fill, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def _roots(self, rows: np.ndarray) -> np.ndarray:
+        """Current root of each row, pointing the rows straight at it."""
+        roots = rows
+        while True:
+            parents = self._parent[roots]
+            if np.array_equal(parents, roots):
+                self._parent[rows] = roots
+                return roots
+            roots = parents
+
+    def _codes(self, rows: np.ndarray) -> np.ndarray:
+        cells = np.floor(self._xyz[rows] / self._chord).astype(np.int64) + self._origin
+        return (cells[:, 0] * self._width + cells[:, 1]) * self._width + cells[:, 2]
+
+    def _pairs(self, rows: np.ndarray) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Every ``(row, neighbour)`` pair within eps for ``rows``, in bounded blocks.
+
+        Occupied cells around ``rows`` are gathered once, already sorted by
+        code, so each row's 27 candidate ranges are two ``searchsorted`` calls.
+        Blocks hold at most ``PAIR_BLOCK`` candidate pairs unless a single row
+        has more.
+        """
+        targets = self._codes(rows)[:, None] + self._offsets[None, :]
+        codes = [code for code in np.unique(targets).tolist() if code in self._cells]
+        cells = [self._cells[code] for code in codes]
+        sizes = [len(cell) for cell in cells]
+        candidates = np.fromiter(chain.from_iterable(cells), dtype=np.int64, count=sum(sizes))
+        candidate_codes = np.repeat(np.array(codes, dtype=np.int64), sizes)
+        starts = np.searchsorted(candidate_codes, targets, side="left")
+        lengths = np.searchsorted(candidate_codes, targets, side="right") - starts
+        totals = np.cumsum(lengths.sum(axis=1))
+        limit = self._chord * self._chord
+        lo = 0
+        while lo < len(rows):
+            base = totals[lo - 1] if lo else 0
+            hi = max(lo + 1, int(np.searchsorted(totals, base + PAIR_BLOCK, side="right")))
+            spans = lengths[lo:hi].ravel()
+            ends = np.cumsum(spans)
+            positions = np.repeat(starts[lo:hi].ravel() - (ends - spans), spans) + np.arange(
+                ends[-1] if len(ends) else 0
+            )
+            row = np.repeat(rows[lo:hi], lengths[lo:hi].sum(axis=1))
+            neighbour = candidates[positions]
+            gaps = self._xyz[row] - self._xyz[neighbour]
+            keep = (np.einsum("ij,ij->i", gaps, gaps) <= limit) & (row != neighbour)
+            yield row[keep], neighbour[keep]
+            lo = hi
+
+    def _settle(self, forest: _Forest, row: np.ndarray, neighbour: np.ndarray) -> None:
+        """Union core pairs in ``forest`` and let core points claim unowned borders.
+
+        Every endpoint is still a root or an old point here: new and
+        just-promoted rows have never been unioned.
+        """
+        start, end = forest.start, self._size
+        row_core = self._count[row] >= self.min_points
+        neighbour_core = self._count[neighbour] >= self.min_points
+        both = row_core & neighbour_core
+        linked, roots = row[both], self._roots(neighbour[both])
+        fresh = (linked >= start) & (roots >= start)
+        forest.link(linked[fresh] - start, roots[fresh] - start)
+        linked, roots = _distinct(linked[~fresh], roots[~fresh], end)
+        if len(linked):
+            forest.link(forest.ids(linked), forest.ids(roots))
+        claim = ~row_core & neighbour_core & (self._owner[row] < 0)
+        self._owner[row[claim]] = neighbour[claim]
+        claim = row_core & ~neighbour_core & (self._owner[neighbour] < 0)
+        self._owner[neighbour[claim]] = row[claim]
+
+    def add(self, latitude: float, longitude: float, concept_key: str) -> int:
+        """Insert a point and return its row; rows are numbered in insertion order."""
+        rows = self.add_many(np.array([latitude]), np.array([longitude]), [concept_key])
+        return int(rows[0])
+
+    def add_many(
+        self, latitudes: np.ndarray, longitudes: np.ndarray, concept_keys: list[str]
+    ) -> np.ndarray:
+        """Insert a batch of points and return their rows.
+
+        Neighbour counts are settled for the whole batch first, then every new
+        point and every old point that just became core is linked in one pass:
+        core neighbours are unioned through their current roots (so a dense
+        cluster adds one union per point rather than one per pair) and unowned
+        border points are claimed by a core neighbour.
+        """
+        start, n = self._size, len(latitudes)
+        if not n:
+            return np.empty(0, dtype=np.int64)
+        while start + n > len(self._xyz):
+            self._grow()
+        end = self._size = start + n
+        rows = np.arange(start, end)
+        lat, lon = np.radians(latitudes), np.radians(longitudes)
+        self._xyz[start:end] = np.stack(
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=1
+        )
+        codes = self._concept_codes
+        self._concept[start:end] = [codes.setdefault(key, len(codes)) for key in concept_keys]
+        self._parent[start:end] = rows
+        self._owner[start:end] = -1
+        self._count[start:end] = 1
+        for row, code in zip(rows.tolist(), self._codes(rows).tolist(), strict=True):
+            self._cells.setdefault(code, array("q")).append(row)
+
+        # Pass 1 settles neighbour counts and keeps what pass 2 needs from the
+        # pairs: each new pair once, and old core neighbours only through their
+        # roots, which no union has moved yet. Huge batches drop the kept pairs
+        # and enumerate again instead.
+        touched = [np.empty(0, dtype=np.int64)]
+        bumps = [np.empty(0, dtype=np.int64)]
+        kept: list[tuple[np.ndarray, np.ndarray]] | None = []
+        held = 0
+        for row, neighbour in self._pairs(rows):
+            self._count[start:end] += np.bincount(row - start, minlength=n)
+            old = neighbour < start
+            if old.any():
+                low = int(neighbour[old].min())
+                counts = np.bincount(neighbour[old] - low)
+                hit = np.flatnonzero(counts)
+                touched.append(hit + low)
+                bumps.append(counts[hit])
+            if kept is None:
+                continue
+            core = old & (self._count[neighbour] >= self.min_points)
+            linked, roots = _distinct(row[core], self._roots(neighbour[core]), end)
+            rest = (~old & (row < neighbour)) | (old & ~core)
+            kept.append(
+                (np.concatenate([row[rest], linked]), np.concatenate([neighbour[rest], roots]))
+            )
+            held += len(kept[-1][0])
+            if held > 4 * PAIR_BLOCK:
+                kept = None
+        changed, index = np.unique(np.concatenate(touched), return_inverse=True)
+        gained = np.bincount(index, weights=np.concatenate(bumps), minlength=len(changed))
+        gained = gained.astype(np.int64)
+        self._count[changed] += gained
+        after = self._count[changed]
+        promoted = changed[(after - gained < self.min_points) & (after >= self.min_points)]
+
+        forest = _Forest(start, n)
+        if kept is None:
+            blocks: Iterable[tuple[np.ndarray, np.ndarray]] = self._pairs(
+                np.concatenate([rows, promoted])
+            )
+        else:
+            blocks = chain(kept, self._pairs(promoted))
+        for row, neighbour in blocks:
+            self._settle(forest, row, neighbour)
+        nodes, roots = forest.roots()
+        self._parent[nodes] = roots
+        self._version += 1
+        return rows
+
+    def regions(self) -> tuple[list[RegionSummary], np.ndarray]:
+        """Region summaries plus each row's index into them (``-1`` for noise)."""
+        if self._cache is not None and self._cache[0] == self._version:
+            return self._cache[1], self._cache[2]
+
+        n = self._size
+        parent = self._parent[:n]
+        while True:
+            hop = parent[parent]
+            if np.array_equal(hop, parent):
+                break
+            parent = hop
+        self._parent[:n] = parent
+        core = self._count[:n] >= self.min_points
+        owner = self._owner[:n]
+        roots = np.where(core, parent, np.where(owner >= 0, parent[np.maximum(owner, 0)], -1))
+        labels = np.full(n, -1, dtype=np.int64)
+        clustered = roots >= 0
+        if not clustered.any():
+            self._cache = (self._version, [], labels)
+            return [], labels
+
+        _, inverse = np.unique(roots[clustered], return_inverse=True)
+        labels[clustered] = inverse
+        k = int(inverse.max()) + 1
+        xyz = self._xyz[:n][clustered]
+        sizes = np.bincount(inverse, minlength=k)
+        centres = np.stack(
+            [np.bincount(inverse, weights=xyz[:, axis], minlength=k) for axis in range(3)], axis=1
+        )
+        norms = np.linalg.norm(centres, axis=1, keepdims=True)
+        np.divide(centres, norms, out=centres, where=norms > 0)
+        angles = np.arccos(np.clip(np.einsum("ij,ij->i", xyz, centres[inverse]), -1.0, 1.0))
+        radius = np.zeros(k)
+        np.maximum.at(radius, inverse, angles)
+        pairs = np.unique(inverse * len(self._concept_codes) + self._concept[:n][clustered])
+        concepts = np.bincount(pairs // len(self._concept_codes), minlength=k)
+        latitudes = np.degrees(np.arcsin(np.clip(centres[:, 2], -1.0, 1.0)))
+        longitudes = np.degrees(np.arctan2(centres[:, 1], centres[:, 0]))
+
+        summaries = [
+            RegionSummary(
+                latitude=round(float(lat), 4),
+                longitude=round(float(lon), 4),
+                radius_km=round(float(r) * EARTH_RADIUS_KM, 1),
+                concept_count=int(c),
+                size=int(s),
+            )
+            for lat, lon, r, c, s in zip(
+                latitudes, longitudes, radius, concepts, sizes, strict=True
+            )
+        ]
+        self._cache = (self._version, summaries, labels)
+        return summaries, labels
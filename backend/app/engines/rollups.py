@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from uuid import UUID
+
+import numpy as np
+
+from .bloom import BLOOM_LEVELS
+
+CLI_TREND_WEEKS = 8
+
+WeekKey = tuple[int, int]
+
+
+def _week(day: date) -> WeekKey:
+    iso = day.isocalendar()
+    return iso.year, iso.week
+
+
+class DashboardRollup:
+    """Running aggregates behind the metacognition dashboard.
+
+    Each note's last contribution is remembered so a re-analysed note swaps
+    its old values out; every update and every read is O(1) in history size.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._bloom_sum = np.zeros(len(BLOOM_LEVELS))
+        self._bloom_notes = 0
+        self._cli: dict[WeekKey, list[float]] = {}
+        self._contrib: dict[UUID, tuple[np.ndarray, WeekKey, float]] = {}
+        self._last_active: date | None = None
+        self._streak = 0
+
+    def observe_note(
+        self, note_id: UUID, created: date, bloom: dict[str, float], cli_score: float
+    ) -> None:
+        vector = np.array([bloom.get(level, 0.0) for level in BLOOM_LEVELS])
+        week = _week(created)
+        previous = self._contrib.get(note_id)
+        if previous is not None:
+            old_vector, old_week, old_cli = previous
+            self._bloom_sum -= old_vector
+            bucket = self._cli[old_week]
+            bucket[0] -= old_cli
+            bucket[1] -= 1
+        else:
+            self._bloom_notes += 1
+        self._bloom_sum += vector
+        bucket = self._cli.setdefault(week, [0.0, 0])
+        bucket[0] += cli_score
+        bucket[1] += 1
+        self._contrib[note_id] = (vector, week, cli_score)
+
+    def record_activity(self, day: date) -> None:
+        last = self._last_active
+        if last is not None and day <= last:
+            return
+        self._streak = self._streak + 1 if last == day - timedelta(days=1) else 1
+        self._last_active = day
+
+    def bloom_distribution(self) -> dict[str, float]:
+        if not self._bloom_notes:
+            return {level: 0.0 for level in BLOOM_LEVELS}
+        total = float(self._bloom_sum.sum()) or 1.0
+        return {
+            level: round(float(value) / total, 4)
+            for level, value in zip(BLOOM_LEVELS, self._bloom_sum, strict=True)
+        }
+
+    def bloom_depth(self) -> float:
+        """Mean Bloom level on a 0-1 scale (remember = 0, create = 1)."""
+        total = float(self._bloom_sum.sum())
+        if total <= 0:
+            return 0.0
+        weights = np.arange(len(BLOOM_LEVELS)) / (len(BLOOM_LEVELS) - 1)
+        return float(self._bloom_sum @ weights) / total
+
+    def cli_trend(self, today: date) -> list[dict[str, object]]:
+        rows = []
+        for offset in range(CLI_TREND_WEEKS - 1, -1, -1):
+            week = _week(today - timedelta(weeks=offset))
+            bucket = self._cli.get(week)
+            if bucket and bucket[1]:
+                avg_cli = round(bucket[0] / bucket[1], 4)
+                rows.append({"week": f"{week[0]}-W{week[1]:02d}", "avg_cli": avg_cli})
+        return rows
+
+    def streak(self, today: date) -> int:
+        last = self._last_active
+        if last is None or (today - last).days > 1:
+            return 0
+        return self._streak
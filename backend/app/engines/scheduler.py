@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import heapq
+from array import array
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from ..constants import SRS_INTERVALS
+from .decay import SECONDS_PER_DAY
+
+PASSING_QUALITY = 3
+
+
+class ReviewLog:
+    """Append-only review history packed into typed arrays (9 bytes per review)."""
+
+    __slots__ = ("timestamps", "qualities")
+
+    def __init__(self) -> None:
+        self.timestamps = array("q")
+        self.qualities = array("B")
+
+    def append(self, timestamp: datetime, quality: int) -> None:
+        self.timestamps.append(int(timestamp.timestamp()))
+        self.qualities.append(quality)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def events(self) -> list[tuple[datetime, int]]:
+        return [
+            (datetime.fromtimestamp(ts, tz=UTC), quality)
+            for ts, quality in zip(self.timestamps, self.qualities, strict=True)
+        ]
+
+
+class ReviewScheduler:
+    """Spaced-repetition due queue over ``SRS_INTERVALS``, addressed by dense slot.
+
+    Due times and steps live in NumPy columns indexed by the caller's slot
+    numbers. A min-heap of ``(due, slot)`` pairs uses lazy invalidation:
+    rescheduling pushes a fresh entry and stale ones are discarded when they
+    reach the top, so reading the next ``k`` due items costs O(k log n).
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._heap: list[tuple[float, int]] = []
+        self._due = np.full(capacity, np.nan, dtype=np.float64)
+        self._step = np.zeros(capacity, dtype=np.uint8)
+        self._logs: dict[int, ReviewLog] = {}
+        self._live = 0
+
+    def _reserve(self, slot: int) -> None:
+        size = len(self._due)
+        if slot < size:
+            return
+        while size <= slot:
+            size *= 2
+        due = np.full(size, np.nan, dtype=np.float64)
+        due[: len(self._due)] = self._due
+        step = np.zeros(size, dtype=np.uint8)
+        step[: len(self._step)] = self._step
+        self._due, self._step = due, step
+
+    def _push(self, slot: int, due: datetime) -> None:
+        ts = due.timestamp()
+        self._reserve(slot)
+        if np.isnan(self._due[slot]):
+            self._live += 1
+        self._due[slot] = ts
+        heapq.heappush(self._heap, (ts, slot))
+        if len(self._heap) > 2 * self._live + 64:
+            self._heap = [entry for entry in self._heap if self._due[entry[1]] == entry[0]]
+            heapq.heapify(self._heap)
+
+    def schedule(self, slot: int, last_reviewed: datetime, step: int = 0) -> datetime:
+        """Register an item whose last review (or creation) was ``last_reviewed``."""
+        step = max(0, min(step, len(SRS_INTERVALS) - 1))
+        due = last_reviewed + timedelta(days=SRS_INTERVALS[step])
+        self._push(slot, due)
+        self._step[slot] = step
+        return due
+
+    def schedule_many(
+        self, slots: np.ndarray, last_reviewed: np.ndarray, steps: np.ndarray
+    ) -> None:
+        """``schedule`` for distinct slots, with ``last_reviewed`` in epoch seconds."""
+        if not len(slots):
+            return
+        self._reserve(int(slots.max()))
+        steps = np.clip(steps, 0, len(SRS_INTERVALS) - 1)
+        due = last_reviewed + np.asarray(SRS_INTERVALS, dtype=np.float64)[steps] * SECONDS_PER_DAY
+        self._live += int(np.isnan(self._due[slots]).sum())
+        self._due[slots] = due
+        self._step[slots] = steps
+        entries = list(zip(due.tolist(), slots.tolist(), strict=True))
+        if len(entries) > len(self._heap):
+            self._heap = [entry for entry in self._heap if self._due[entry[1]] == entry[0]]
+            self._heap.extend(entries)
+            heapq.heapify(self._heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+
+    def record(self, slot: int, quality: int, reviewed_at: datetime) -> datetime:
+        """Append a review and return the next due time."""
+        self._logs.setdefault(slot, ReviewLog()).append(reviewed_at, quality)
+        step = self.step(slot) if slot < len(self._due) and not np.isnan(self._due[slot]) else -1
+        step = min(step + 1, len(SRS_INTERVALS) - 1) if quality >= PASSING_QUALITY else 0
+        due = reviewed_at + timedelta(days=SRS_INTERVALS[step])
+        self._push(slot, due)
+        self._step[slot] = step
+        return due
+
+    def restore_review(self, slot: int, quality: int, reviewed_at: datetime) -> None:
+        """Append a persisted review to the history without rescheduling."""
+        self._logs.setdefault(slot, ReviewLog()).append(reviewed_at, quality)
+
+    def step(self, slot: int) -> int:
+        return int(self._step[slot]) if slot < len(self._step) else 0
+
+    def remove(self, slot: int) -> None:
+        if slot < len(self._due) and not np.isnan(self._due[slot]):
+            self._live -= 1
+            self._due[slot] = np.nan
+            self._step[slot] = 0
+        self._logs.pop(slot, None)
+
+    def due_at(self, slot: int) -> datetime | None:
+        if slot >= len(self._due) or np.isnan(self._due[slot]):
+            return None
+        return datetime.fromtimestamp(float(self._due[slot]), tz=UTC)
+
+    def history(self, slot: int) -> list[tuple[datetime, int]]:
+        log = self._logs.get(slot)
+        return log.events() if log is not None else []
+
+    def review_timestamps(self) -> list[int]:
+        """Every recorded review time (epoch seconds) across all items, unordered."""
+        return [ts for log in self._logs.values() for ts in log.timestamps]
+
+    def next_due(self, limit: int) -> list[tuple[int, datetime]]:
+        """The ``limit`` slots with the earliest due time, soonest first."""
+        taken: list[tuple[float, int]] = []
+        seen: set[int] = set()
+        while self._heap and len(taken) < limit:
+            entry = heapq.heappop(self._heap)
+            ts, slot = entry
+            if self._due[slot] != ts or slot in seen:
+                continue
+            seen.add(slot)
+            taken.append(entry)
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return [(slot, datetime.fromtimestamp(ts, tz=UTC)) for ts, slot in taken]
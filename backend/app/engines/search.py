@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from operator import add
+from typing import Any
+from uuid import UUID
+
+import numpy as np
+
+from .extraction import tokens
+from .text import note_text
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SEGMENT_SIZE = 128
+PREFIX_EXPANSIONS = 8
+PREFIX_SCAN = 256
+VOCABULARY_BUFFER = 1024
+RENUMBER_SLACK = 1024
+_CJK = re.compile("[ᄀ-ᇿ぀-ヿ㄰-㆏㐀-䶿一-鿿가-힣]")
+
+Segment = tuple[int, np.ndarray, np.ndarray]
+
+
+def _is_cjk(word: str) -> bool:
+    return not word.isascii() and _CJK.search(word) is not None
+
+
+def terms(text: str) -> list[str]:
+    """Index terms: normalized words, with CJK words split into overlapping bigrams.
+
+    Korean attaches particles and writes compounds without spaces, so
+    "양자역학은" is indexed as 양자/자역/역학/학은 and a query for "역학" finds it.
+    """
+    out: list[str] = []
+    for word in tokens(text):
+        if len(word) > 1 and _is_cjk(word):
+            out.extend(map(add, word[:-1], word[1:]))
+        else:
+            out.append(word)
+    return out
+
+
+def document_text(content: dict[str, Any], concepts: Iterable[str]) -> str:
+    """What a note is searchable by: its content and its extracted concept names."""
+    return "\n".join((note_text(content), *concepts))
+
+
+def _encode(docs: np.ndarray, tfs: np.ndarray) -> Segment:
+    """Delta-encode ascending doc slots in the narrowest unsigned width that fits."""
+    gaps = np.diff(docs)
+    widest = int(gaps.max()) if len(gaps) else 0
+    width = np.uint8 if widest < 1 << 8 else np.uint16 if widest < 1 << 16 else np.uint32
+    return int(docs[0]), gaps.astype(width), np.minimum(tfs, 255).astype(np.uint8)
+
+
+def _decode(segment: Segment) -> tuple[np.ndarray, np.ndarray]:
+    first, gaps, tfs = segment
+    docs = np.empty(len(gaps) + 1, dtype=np.int64)
+    docs[0] = 0
+    np.cumsum(gaps, out=docs[1:])
+    docs += first
+    return docs, tfs
+
+
+class _Postings:
+    """One term's postings: sealed delta-encoded segments plus a short mutable tail.
+
+    Segments merge like a binary counter, so a term with ``n`` postings has
+    ``O(log n)`` segments and decoding is a few ``cumsum`` calls.
+    """
+
+    __slots__ = ("segments", "docs", "tfs", "df", "stale")
+
+    def __init__(self) -> None:
+        self.segments: list[Segment] = []
+        self.docs: list[int] = []
+        self.tfs: list[int] = []
+        self.df = 0
+        self.stale = 0
+
+    def append(self, slot: int, tf: int) -> None:
+        self.docs.append(slot)
+        self.tfs.append(tf)
+        self.df += 1
+        if len(self.docs) < SEGMENT_SIZE:
+            return
+        self.segments.append(_encode(np.array(self.docs), np.array(self.tfs)))
+        self.docs.clear()
+        self.tfs.clear()
+        segments = self.segments
+        while len(segments) > 1 and len(segments[-2][2]) <= len(segments[-1][2]):
+            newer = segments.pop()
+            older_docs, older_tfs = _decode(segments[-1])
+            newer_docs, newer_tfs = _decode(newer)
+            segments[-1] = _encode(
+                np.concatenate((older_docs, newer_docs)), np.concatenate((older_tfs, newer_tfs))
+            )
+
+    def decode(self) -> tuple[np.ndarray, np.ndarray]:
+        parts = [_decode(segment) for segment in self.segments]
+        if self.docs:
+            parts.append((np.array(self.docs, dtype=np.int64), np.array(self.tfs, dtype=np.uint8)))
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8)
+        return (
+            np.concatenate([docs for docs, _ in parts]),
+            np.concatenate([tfs for _, tfs in parts]),
+        )
+
+    def rewrite(self, docs: np.ndarray, tfs: np.ndarray) -> None:
+        """Replace every posting with ``docs``/``tfs``, already ascending and live."""
+        self.segments = [_encode(docs, tfs)] if len(docs) else []
+        self.docs.clear()
+        self.tfs.clear()
+        self.stale = 0
+
+
+class SearchIndex:
+    """Incremental BM25 inverted index over note text.
+
+    Each indexed version of a note gets a fresh, ever-increasing slot, so
+    postings are appended in order and stay delta-encodable. Removing a note
+    only marks its slot dead and adjusts document frequencies; a term's stale
+    postings are dropped the next time a query decodes it with more stale
+    than live entries, and slots are renumbered once dead ones outnumber the
+    live. Queries score every matching document at once with NumPy.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._postings: dict[str, _Postings] = {}
+        self._vocabulary: list[str] = []
+        self._recent: set[str] = set()
+        self.ids: list[UUID | None] = []
+        self._slot: dict[UUID, int] = {}
+        self._length = np.zeros(capacity, dtype=np.float32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._total_length = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._slot
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self._length)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("_length", "_alive"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def add(self, doc_id: UUID, text: str) -> None:
+        """Index ``text`` under ``doc_id``; remove the previous version first."""
+        counts = Counter(terms(text))
+        slot = len(self.ids)
+        self._reserve(slot + 1)
+        self.ids.append(doc_id)
+        self._slot[doc_id] = slot
+        length = sum(counts.values())
+        self._length[slot] = length
+        self._alive[slot] = True
+        self._total_length += length
+        postings = self._postings
+        for term, tf in counts.items():
+            entry = postings.get(term)
+            if entry is None:
+                entry = postings[term] = _Postings()
+                self._recent.add(term)
+            entry.append(slot, tf)
+
+    def remove(self, doc_id: UUID, text: str) -> None:
+        """Drop ``doc_id``, whose indexed text was ``text``."""
+        slot = self._slot.pop(doc_id, None)
+        if slot is None:
+            return
+        self.ids[slot] = None
+        self._alive[slot] = False
+        self._total_length -= int(self._length[slot])
+        self._dead += 1
+        for term in set(terms(text)):
+            entry = self._postings[term]
+            entry.df -= 1
+            entry.stale += 1
+        if self._dead > len(self._slot) + RENUMBER_SLACK:
+            self._renumber()
+
+    def _renumber(self) -> None:
+        n = len(self.ids)
+        alive = self._alive[:n]
+        slots = np.cumsum(alive) - 1
+        for term in list(self._postings):
+            entry = self._postings[term]
+            if entry.df <= 0:
+                self._forget(term)
+                continue
+            docs, tfs = entry.decode()
+            keep = alive[docs]
+            entry.rewrite(slots[docs[keep]], tfs[keep])
+        live = np.flatnonzero(alive)
+        self.ids = [self.ids[slot] for slot in live.tolist()]
+        self._slot = {doc_id: slot for slot, doc_id in enumerate(self.ids) if doc_id is not None}
+        length = self._length[live]
+        self._length = np.zeros(len(self._length), dtype=np.float32)
+        self._length[: len(live)] = length
+        self._alive = np.zeros(len(self._alive), dtype=bool)
+        self._alive[: len(live)] = True
+        self._dead = 0
+
+    def _forget(self, term: str) -> None:
+        del self._postings[term]
+        if term in self._recent:
+            self._recent.discard(term)
+            return
+        position = bisect_left(self._vocabulary, term)
+        if position < len(self._vocabulary) and self._vocabulary[position] == term:
+            del self._vocabulary[position]
+
+    def _live_postings(self, term: str) -> tuple[np.ndarray, np.ndarray]:
+        entry = self._postings[term]
+        docs, tfs = entry.decode()
+        if entry.stale > entry.df:
+            keep = self._alive[docs]
+            docs, tfs = docs[keep], tfs[keep]
+            entry.rewrite(docs, tfs)
+        return docs, tfs
+
+    def _expand(self, prefix: str) -> list[str]:
+        """The most frequent indexed terms starting with ``prefix``."""
+        if len(self._recent) > VOCABULARY_BUFFER:
+            self._vocabulary = sorted([*self._vocabulary, *self._recent])
+            self._recent.clear()
+        vocabulary = self._vocabulary
+        start = bisect_left(vocabulary, prefix)
+        found = []
+        for term in vocabulary[start : start + PREFIX_SCAN]:
+            if not term.startswith(prefix):
+                break
+            found.append(term)
+        found.extend(term for term in self._recent if term.startswith(prefix))
+        found = [term for term in found if self._postings[term].df > 0]
+        found.sort(key=lambda term: self._postings[term].df, reverse=True)
+        return found[:PREFIX_EXPANSIONS]
+
+    def search(self, query: str, limit: int) -> tuple[list[tuple[UUID, float]], int]:
+        """Top ``limit`` ``(doc_id, score)`` by BM25, best first, and the number of matches.
+
+        Unless the query ends in whitespace its last word is treated as a
+        prefix, so results follow the user while they type.
+        """
+        weights = Counter(terms(query))
+        words = tokens(query)
+        if words and not query[-1].isspace() and not _is_cjk(words[-1]):
+            partial = words[-1]
+            weights[partial] -= 1
+            for term in self._expand(partial):
+                weights[term] += 1
+        live = len(self._slot)
+        n = len(self.ids)
+        if not live:
+            return [], 0
+        average = self._total_length / live or 1.0
+        scores = np.zeros(n, dtype=np.float32)
+        for term, weight in weights.items():
+            entry = self._postings.get(term)
+            if weight <= 0 or entry is None or entry.df <= 0:
+                continue
+            idf = math.log(1.0 + (live - entry.df + 0.5) / (entry.df + 0.5))
+            docs, tfs = self._live_postings(term)
+            tf = tfs.astype(np.float32)
+            norm = BM25_K1 * (1.0 - BM25_B + BM25_B * self._length[docs] / average)
+            scores[docs] += weight * idf * tf * (BM25_K1 + 1.0) / (tf + norm)
+        scores[~self._alive[:n]] = 0.0
+        matches = np.flatnonzero(scores > 0)
+        if len(matches) > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        # Best score first; among equal scores the most recently indexed first.
+        order = matches[np.lexsort((-matches, -scores[matches]))]
+        return [
+            (self.ids[slot], float(scores[slot]))  # type: ignore[misc]
+            for slot in order.tolist()
+        ], int(np.count_nonzero(scores))
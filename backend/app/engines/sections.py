@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any
+
+from .text import iter_strings
+
+# Content keys that make up each template's sections, in display order.
+SECTION_LAYOUT: dict[str, tuple[str, ...]] = {
+    "cornell": ("cue_column", "main_notes", "summary"),
+    "zettelkasten": ("atomic_note", "tags", "source"),
+    "outline": ("items",),
+    "concept_map": ("nodes", "edges"),
+}
+
+
+def note_sections(template_type: str, content: dict[str, Any]) -> dict[str, str]:
+    """Split template content into named text sections.
+
+    Keys outside the template layout are kept as extra sections so free-form
+    content still reaches the engines.
+    """
+    layout = SECTION_LAYOUT.get(template_type, ())
+    keys = [*layout, *(key for key in content if key not in layout)]
+    return {key: "\n".join(iter_strings(content.get(key))) for key in keys}
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import math
+from array import array
+from collections.abc import Iterable, Iterator
+from uuid import UUID
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def normalize_lon(lon: float) -> float:
+    if -180.0 <= lon <= 180.0:
+        return lon
+    return (lon + 180.0) % 360.0 - 180.0
+
+
+class _Bucket:
+    """Keys of one cell with their coordinates packed into parallel arrays."""
+
+    __slots__ = ("cell", "keys", "lats", "lons")
+
+    def __init__(self, cell: tuple[int, int]) -> None:
+        self.cell = cell
+        self.keys: list[UUID] = []
+        self.lats = array("d")
+        self.lons = array("d")
+
+    def append(self, key: UUID, lat: float, lon: float) -> None:
+        self.keys.append(key)
+        self.lats.append(lat)
+        self.lons.append(lon)
+
+    def discard(self, key: UUID) -> None:
+        i = self.keys.index(key)
+        # Swap with the last entry so removal never shifts the arrays.
+        for column in (self.keys, self.lats, self.lons):
+            column[i] = column[-1]
+            column.pop()
+
+
+class GeoCellIndex:
+    """Equirectangular cell grid over lat/lon keyed only by occupied cells.
+
+    Range queries visit either the cells covered by the query window or the
+    occupied cells, whichever is fewer, so cost tracks the result size rather
+    than the total number of indexed points.
+    """
+
+    def __init__(self, cell_deg: float = 1.0) -> None:
+        self.cell_deg = cell_deg
+        self._rows = math.ceil(180.0 / cell_deg)
+        self._cols = math.ceil(360.0 / cell_deg)
+        self._cells: dict[tuple[int, int], _Bucket] = {}
+        self._bucket_of: dict[UUID, _Bucket] = {}
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def _row(self, lat: float) -> int:
+        return min(self._rows - 1, max(0, int((lat + 90.0) // self.cell_deg)))
+
+    def _col(self, lon: float) -> int:
+        return min(self._cols - 1, max(0, int((lon + 180.0) // self.cell_deg)))
+
+    def insert(self, key: UUID, latitude: float, longitude: float) -> None:
+        self.remove(key)
+        lat = max(-90.0, min(90.0, latitude))
+        lon = normalize_lon(longitude)
+        cell = (self._row(lat), self._col(lon))
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            bucket = self._cells[cell] = _Bucket(cell)
+        bucket.append(key, lat, lon)
+        self._bucket_of[key] = bucket
+
+    def insert_many(self, keys: list[UUID], latitudes: np.ndarray, longitudes: np.ndarray) -> None:
+        lats = np.clip(latitudes, -90.0, 90.0)
+        lons = np.where(
+            np.abs(longitudes) <= 180.0, longitudes, (longitudes + 180.0) % 360.0 - 180.0
+        )
+        rows = np.clip((lats + 90.0) // self.cell_deg, 0, self._rows - 1).astype(np.int64)
+        cols = np.clip((lons + 180.0) // self.cell_deg, 0, self._cols - 1).astype(np.int64)
+        cells, bucket_of = self._cells, self._bucket_of
+        for key, lat, lon, cell in zip(
+            keys,
+            lats.tolist(),
+            lons.tolist(),
+            zip(rows.tolist(), cols.tolist(), strict=True),
+            strict=True,
+        ):
+            if key in bucket_of:
+                self.remove(key)
+            bucket = cells.get(cell)
+            if bucket is None:
+                bucket = cells[cell] = _Bucket(cell)
+            bucket.append(key, lat, lon)
+            bucket_of[key] = bucket
+
+    def remove(self, key: UUID) -> None:
+        bucket = self._bucket_of.pop(key, None)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if not bucket.keys:
+            del self._cells[bucket.cell]
+
+    def _candidates(
+        self, row_lo: int, row_hi: int, col_ranges: Iterable[tuple[int, int]]
+    ) -> Iterator[tuple[UUID, float, float]]:
+        col_ranges = list(col_ranges)
+        window = (row_hi - row_lo + 1) * sum(hi - lo + 1 for lo, hi in col_ranges)
+        if window <= len(self._cells):
+            cells: Iterable[tuple[int, int]] = (
+                (row, col)
+                for row in range(row_lo, row_hi + 1)
+                for lo, hi in col_ranges
+                for col in range(lo, hi + 1)
+            )
+        else:
+            cells = [
+                (row, col)
+                for row, col in self._cells
+                if row_lo <= row <= row_hi and any(lo <= col <= hi for lo, hi in col_ranges)
+            ]
+        for cell in cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                yield from zip(bucket.keys, bucket.lats, bucket.lons, strict=True)
+
+    def _col_ranges(self, west: float, east: float) -> list[tuple[int, int]]:
+        if west <= east:
+            return [(self._col(west), self._col(east))]
+        # Window crosses the antimeridian: split into [west, 180] and [-180, east].
+        return [(self._col(west), self._cols - 1), (0, self._col(east))]
+
+    def query_bbox(self, west: float, south: float, east: float, north: float) -> list[UUID]:
+        south, north = max(-90.0, south), min(90.0, north)
+        if south > north:
+            return []
+        full_lon = east - west >= 360.0
+        west, east = normalize_lon(west), normalize_lon(east)
+        if full_lon:
+            west, east = -180.0, 180.0
+        wraps = west > east
+        hits: list[UUID] = []
+        for key, lat, lon in self._candidates(
+            self._row(south), self._row(north), self._col_ranges(west, east)
+        ):
+            if not south <= lat <= north:
+                continue
+            in_lon = (lon >= west or lon <= east) if wraps else west <= lon <= east
+            if in_lon:
+                hits.append(key)
+        return hits
+
+    def query_radius(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> list[tuple[UUID, float]]:
+        """Return ``(key, distance_km)`` pairs within ``radius_km``, nearest first."""
+        lat = max(-90.0, min(90.0, latitude))
+        lon = normalize_lon(longitude)
+        dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        south, north = lat - dlat, lat + dlat
+        if south <= -90.0 or north >= 90.0:
+            # Circle covers a pole: every longitude is reachable.
+            col_ranges = [(0, self._cols - 1)]
+        else:
+            cos_lat = min(math.cos(math.radians(south)), math.cos(math.radians(north)))
+            dlon = 180.0 if cos_lat <= 0 else math.degrees(radius_km / EARTH_RADIUS_KM) / cos_lat
+            if dlon >= 180.0:
+                col_ranges = [(0, self._cols - 1)]
+            else:
+                col_ranges = self._col_ranges(normalize_lon(lon - dlon), normalize_lon(lon + dlon))
+
+        hits: list[tuple[UUID, float]] = []
+        for key, p_lat, p_lon in self._candidates(
+            self._row(max(-90.0, south)), self._row(min(90.0, north)), col_ranges
+        ):
+            distance = haversine_km(lat, lon, p_lat, p_lon)
+            if distance <= radius_km:
+                hits.append((key, distance))
+        hits.sort(key=lambda item: item[1])
+        return hits
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import zlib
+from itertools import chain
+from uuid import UUID
+
+import numpy as np
+
+from .text import words
+
+EMBEDDING_DIM = 256
+LSH_TABLES = 16
+LSH_BITS = 12
+# Rows scored per matching bucket, newest first; bounds a query however many
+# near-duplicates share one bucket.
+BUCKET_SCAN = 128
+QUERY_LIMIT = 10
+_LSH_SEED = 20260215
+
+
+def _features(text: str) -> list[str]:
+    tokens = words(text)
+    features = list(tokens)
+    features.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:], strict=False))
+    for token in tokens:
+        if not token.isascii():
+            padded = f"<{token}>"
+            features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+def embed_texts(texts: list[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """Deterministic signed feature-hashing embeddings, one L2-normalised row per text.
+
+    Word unigrams, bigrams and, for non-ASCII words, character trigrams (so
+    agglutinated Hangul forms still overlap) are hashed with CRC32, which unlike
+    ``hash()`` is stable across processes.
+    """
+    rows: list[int] = []
+    cols: list[int] = []
+    signs: list[float] = []
+    for row, text in enumerate(texts):
+        for feature in _features(text):
+            h = zlib.crc32(feature.encode())
+            rows.append(row)
+            cols.append(h % dim)
+            signs.append(1.0 if h & 0x80000000 else -1.0)
+
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    if rows:
+        np.add.at(matrix, (np.asarray(rows), np.asarray(cols)), np.asarray(signs, np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class SRSIndex:
+    """Growable embedding matrix plus random-hyperplane LSH tables.
+
+    A query only scores the newest ``BUCKET_SCAN`` rows of each bucket it
+    falls in, so its cost is bounded by ``tables * BUCKET_SCAN`` dot products
+    rather than growing with the note history, even when templated notes pile
+    up in the same buckets.
+    """
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        tables: int = LSH_TABLES,
+        bits: int = LSH_BITS,
+        capacity: int = 1024,
+    ) -> None:
+        rng = np.random.default_rng(_LSH_SEED)
+        self.dim = dim
+        self._planes = rng.standard_normal((dim, tables * bits)).astype(np.float32)
+        self._tables = tables
+        self._bits = bits
+        self._weights = (1 << np.arange(bits, dtype=np.int64))[None, :]
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._ids: list[UUID] = []
+        self._row_of: dict[UUID, int] = {}
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(tables)]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _signatures(self, vector: np.ndarray) -> list[int]:
+        bits = (vector @ self._planes > 0).reshape(self._tables, self._bits)
+        return (bits * self._weights).sum(axis=1).tolist()
+
+    def add(self, item_id: UUID, vector: np.ndarray) -> None:
+        """Index ``vector`` under ``item_id``, replacing any earlier vector for it."""
+        row = self._row_of.get(item_id)
+        if row is not None:
+            for table, signature in zip(
+                self._buckets, self._signatures(self._matrix[row]), strict=True
+            ):
+                bucket = table[signature]
+                bucket.remove(row)
+                if not bucket:
+                    del table[signature]
+            self._matrix[row] = vector
+            for table, signature in zip(self._buckets, self._signatures(vector), strict=True):
+                table.setdefault(signature, []).append(row)
+            return
+
+        row = len(self._ids)
+        if row == len(self._matrix):
+            grown = np.zeros((2 * len(self._matrix), self.dim), dtype=np.float32)
+            grown[:row] = self._matrix
+            self._matrix = grown
+        self._matrix[row] = vector
+        self._ids.append(item_id)
+        self._row_of[item_id] = row
+        for table, signature in zip(self._buckets, self._signatures(vector), strict=True):
+            table.setdefault(signature, []).append(row)
+
+    def query(
+        self,
+        vector: np.ndarray,
+        min_similarity: float,
+        limit: int = QUERY_LIMIT,
+        exclude: UUID | None = None,
+    ) -> list[tuple[UUID, float]]:
+        """Top ``limit`` ``(id, cosine)`` at or above ``min_similarity``, best first.
+
+        ``exclude`` names an item never to return, e.g. the note being queried.
+        """
+        parts = []
+        for table, signature in zip(self._buckets, self._signatures(vector), strict=True):
+            bucket = table.get(signature)
+            if bucket:
+                parts.append(bucket[-BUCKET_SCAN:])
+        if not parts:
+            return []
+
+        rows = np.unique(np.fromiter(chain.from_iterable(parts), dtype=np.int64))
+        skip = self._row_of.get(exclude) if exclude is not None else None
+        if skip is not None:
+            rows = rows[rows != skip]
+        similarities = self._matrix[rows] @ vector
+        keep = similarities >= min_similarity
+        rows, similarities = rows[keep], similarities[keep]
+        if len(rows) > limit:
+            top = np.argpartition(-similarities, limit - 1)[:limit]
+            rows, similarities = rows[top], similarities[top]
+        order = np.argsort(-similarities, kind="stable")
+        return [
+            (self._ids[row], float(sim))
+            for row, sim in zip(rows[order].tolist(), similarities[order].tolist(), strict=True)
+        ]
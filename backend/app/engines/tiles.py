@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import math
+import struct
+
+import numpy as np
+
+MAX_ZOOM = 14
+EAGER_ZOOM = 5  # deepest zoom whose cluster cells are maintained on every write
+CELL_BITS = 3  # each tile is split into 2**CELL_BITS x 2**CELL_BITS cluster cells
+MAX_MERCATOR_LAT = 85.05112878
+
+PIN_CODES = {"mastered": 0, "review": 1, "gap": 2, "path": 3, "personal": 4}
+UNKNOWN_PIN = 255
+
+# Tile layout (little-endian):
+#   header: magic b"MGT1", z u8, x u32, y u32, cluster count u32
+#   record: centroid lat f32, centroid lon f32, count u32, mean strength f32, pin code u8
+TILE_MAGIC = b"MGT1"
+TILE_HEADER = struct.Struct("<4sBIII")
+TILE_RECORD = struct.Struct("<ffIfB")
+TILE_MEDIA_TYPE = "application/vnd.memoglobe.tile"
+
+
+def _mercator_fraction(latitude: float, longitude: float) -> tuple[float, float]:
+    lat = math.radians(max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, latitude)))
+    fx = (longitude + 180.0) / 360.0
+    fy = (1.0 - math.log(math.tan(lat) + 1.0 / math.cos(lat)) / math.pi) / 2.0
+    return min(max(fx, 0.0), math.nextafter(1.0, 0.0)), min(max(fy, 0.0), math.nextafter(1.0, 0.0))
+
+
+def _mercator_fractions(
+    latitudes: np.ndarray, longitudes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorised ``_mercator_fraction``."""
+    lat = np.radians(np.clip(latitudes, -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT))
+    fx = (longitudes + 180.0) / 360.0
+    fy = (1.0 - np.log(np.tan(lat) + 1.0 / np.cos(lat)) / np.pi) / 2.0
+    top = math.nextafter(1.0, 0.0)
+    return np.clip(fx, 0.0, top), np.clip(fy, 0.0, top)
+
+
+class ClusterCell:
+    __slots__ = ("count", "sum_lat", "sum_lon", "sum_strength", "pins")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum_lat = 0.0
+        self.sum_lon = 0.0
+        self.sum_strength = 0.0
+        self.pins: dict[int, int] = {}
+
+    def dominant_pin(self) -> int:
+        """Most common pin code; ties go to the lowest code, as in scanned tiles."""
+        if not self.pins:
+            return UNKNOWN_PIN
+        return min(self.pins.items(), key=lambda item: (-item[1], item[0]))[0]
+
+
+class ClusterPyramid:
+    """Per-zoom cluster grids over anchors.
+
+    Zooms up to ``eager_zoom`` keep cluster cells that are updated by deltas
+    on every write, since each of their tiles summarises many anchors. Deeper
+    tiles cover few anchors each, so instead of holding a cell per point per
+    zoom they are aggregated on first request from per-point NumPy columns.
+    Either way encoded tiles are cached and only the tiles a write touches are
+    invalidated, so serving a tile is normally a dict lookup. Points are
+    addressed by the caller's dense slot numbers.
+    """
+
+    def __init__(
+        self, max_zoom: int = MAX_ZOOM, eager_zoom: int = EAGER_ZOOM, capacity: int = 1024
+    ) -> None:
+        self.max_zoom = max_zoom
+        self.eager_zoom = min(eager_zoom, max_zoom)
+        self._levels: list[dict[tuple[int, int], ClusterCell]] = [
+            {} for _ in range(self.eager_zoom + 1)
+        ]
+        self._size = 0
+        self._lat = np.zeros(capacity, dtype=np.float64)
+        self._lon = np.zeros(capacity, dtype=np.float64)
+        self._fx = np.zeros(capacity, dtype=np.float64)
+        self._fy = np.zeros(capacity, dtype=np.float64)
+        self._strength = np.zeros(capacity, dtype=np.float64)
+        self._pin = np.zeros(capacity, dtype=np.uint8)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._encoded: dict[tuple[int, int, int], bytes] = {}
+
+    def _reserve(self, slot: int) -> None:
+        size = len(self._lat)
+        if slot < size:
+            return
+        while size <= slot:
+            size *= 2
+        for name in ("_lat", "_lon", "_fx", "_fy", "_strength", "_pin", "_alive"):
+            column = getattr(self, name)
+            grown = np.zeros(size, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def _apply(
+        self,
+        slot: int,
+        count: int,
+        strength: float,
+        pin_deltas: dict[int, int],
+    ) -> None:
+        latitude, longitude = float(self._lat[slot]), float(self._lon[slot])
+        fx, fy = float(self._fx[slot]), float(self._fy[slot])
+        for z in range(self.max_zoom + 1):
+            # Scaling by a power of two is exact, so cell >> CELL_BITS is the tile.
+            self._encoded.pop((z, int(fx * (1 << z)), int(fy * (1 << z))), None)
+            if z > self.eager_zoom:
+                continue
+            scale = 1 << (z + CELL_BITS)
+            key = (int(fx * scale), int(fy * scale))
+            level = self._levels[z]
+            cell = level.get(key)
+            if cell is None:
+                cell = level[key] = ClusterCell()
+            cell.count += count
+            cell.sum_lat += latitude * count
+            cell.sum_lon += longitude * count
+            cell.sum_strength += strength
+            for pin, delta in pin_deltas.items():
+                remaining = cell.pins.get(pin, 0) + delta
+                if remaining:
+                    cell.pins[pin] = remaining
+                else:
+                    cell.pins.pop(pin, None)
+            if cell.count == 0:
+                del level[key]
+
+    def add(
+        self, slot: int, latitude: float, longitude: float, strength: float, pin_color: str
+    ) -> None:
+        self.remove(slot)
+        self._reserve(slot)
+        self._size = max(self._size, slot + 1)
+        pin = PIN_CODES.get(pin_color, UNKNOWN_PIN)
+        self._lat[slot], self._lon[slot] = latitude, longitude
+        self._fx[slot], self._fy[slot] = _mercator_fraction(latitude, longitude)
+        self._strength[slot] = strength
+        self._pin[slot] = pin
+        self._alive[slot] = True
+        self._apply(slot, 1, strength, {pin: 1})
+
+    def add_many(
+        self,
+        slots: np.ndarray,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        strengths: np.ndarray,
+        pin_colors: list[str],
+    ) -> None:
+        """``add`` for distinct slots, aggregating each eager level's deltas per cell."""
+        if not len(slots):
+            return
+        for slot in slots[slots < self._size].tolist():
+            self.remove(slot)
+        last = int(slots.max())
+        self._reserve(last)
+        self._size = max(self._size, last + 1)
+        pins = np.array([PIN_CODES.get(color, UNKNOWN_PIN) for color in pin_colors], np.uint8)
+        fx, fy = _mercator_fractions(latitudes, longitudes)
+        self._lat[slots], self._lon[slots] = latitudes, longitudes
+        self._fx[slots], self._fy[slots] = fx, fy
+        self._strength[slots] = strengths
+        self._pin[slots] = pins
+        self._alive[slots] = True
+        for z in range(self.max_zoom + 1):
+            if self._encoded:
+                side = 1 << z
+                tiles = np.unique(
+                    (fx * side).astype(np.int64) * side + (fy * side).astype(np.int64)
+                )
+                for tile in tiles.tolist():
+                    self._encoded.pop((z, *divmod(tile, side)), None)
+            if z > self.eager_zoom:
+                continue
+            side = 1 << (z + CELL_BITS)
+            keys, inverse = np.unique(
+                (fx * side).astype(np.int64) * side + (fy * side).astype(np.int64),
+                return_inverse=True,
+            )
+            k = len(keys)
+            counts = np.bincount(inverse, minlength=k)
+            sums = [
+                np.bincount(inverse, weights=column, minlength=k)
+                for column in (latitudes, longitudes, strengths)
+            ]
+            votes, tally = np.unique(inverse * (UNKNOWN_PIN + 1) + pins, return_counts=True)
+            level = self._levels[z]
+            cells = []
+            for key, count, sum_lat, sum_lon, sum_strength in zip(
+                keys.tolist(), counts.tolist(), *(total.tolist() for total in sums), strict=True
+            ):
+                cell = level.get(divmod(key, side))
+                if cell is None:
+                    cell = level[divmod(key, side)] = ClusterCell()
+                cell.count += count
+                cell.sum_lat += sum_lat
+                cell.sum_lon += sum_lon
+                cell.sum_strength += sum_strength
+                cells.append(cell)
+            for vote, count in zip(votes.tolist(), tally.tolist(), strict=True):
+                index, pin = divmod(vote, UNKNOWN_PIN + 1)
+                pins_of = cells[index].pins
+                pins_of[pin] = pins_of.get(pin, 0) + count
+
+    def remove(self, slot: int) -> None:
+        if slot >= self._size or not self._alive[slot]:
+            return
+        self._alive[slot] = False
+        self._apply(slot, -1, -float(self._strength[slot]), {int(self._pin[slot]): -1})
+
+    def update(self, slot: int, strength: float, pin_color: str) -> None:
+        if slot >= self._size or not self._alive[slot]:
+            return
+        old_strength, old_pin = float(self._strength[slot]), int(self._pin[slot])
+        pin = PIN_CODES.get(pin_color, UNKNOWN_PIN)
+        if strength == old_strength and pin == old_pin:
+            return
+        self._strength[slot] = strength
+        self._pin[slot] = pin
+        pin_deltas = {} if pin == old_pin else {old_pin: -1, pin: 1}
+        self._apply(slot, 0, strength - old_strength, pin_deltas)
+
+    def _eager_records(self, z: int, x: int, y: int) -> list[bytes]:
+        level = self._levels[z]
+        side = 1 << CELL_BITS
+        records = []
+        for cy in range(y << CELL_BITS, (y << CELL_BITS) + side):
+            for cx in range(x << CELL_BITS, (x << CELL_BITS) + side):
+                cell = level.get((cx, cy))
+                if cell is None:
+                    continue
+                records.append(
+                    TILE_RECORD.pack(
+                        cell.sum_lat / cell.count,
+                        cell.sum_lon / cell.count,
+                        cell.count,
+                        cell.sum_strength / cell.count,
+                        cell.dominant_pin(),
+                    )
+                )
+        return records
+
+    def _scanned_records(self, z: int, x: int, y: int) -> list[bytes]:
+        """Cluster one deep tile straight from the point columns."""
+        n = self._size
+        fx, fy = self._fx[:n], self._fy[:n]
+        scale = float(1 << z)
+        rows = np.flatnonzero(
+            self._alive[:n] & (np.floor(fx * scale) == x) & (np.floor(fy * scale) == y)
+        )
+        if not len(rows):
+            return []
+        side = 1 << CELL_BITS
+        cx = (fx[rows] * (scale * side)).astype(np.int64) - (x << CELL_BITS)
+        cy = (fy[rows] * (scale * side)).astype(np.int64) - (y << CELL_BITS)
+        # Row-major cell order, matching the scan over eager cells.
+        _, inverse = np.unique(cy * side + cx, return_inverse=True)
+        k = int(inverse.max()) + 1
+        counts = np.bincount(inverse, minlength=k)
+        sums = [
+            np.bincount(inverse, weights=column[rows], minlength=k)
+            for column in (self._lat, self._lon, self._strength)
+        ]
+        votes = np.zeros((k, UNKNOWN_PIN + 1), dtype=np.int64)
+        np.add.at(votes, (inverse, self._pin[rows]), 1)
+        return [
+            TILE_RECORD.pack(lat / count, lon / count, count, strength / count, pin)
+            for lat, lon, strength, count, pin in zip(
+                *(total.tolist() for total in sums),
+                counts.tolist(),
+                votes.argmax(axis=1).tolist(),
+                strict=True,
+            )
+        ]
+
+    def tile(self, z: int, x: int, y: int) -> bytes:
+        if not 0 <= z <= self.max_zoom or not (0 <= x < 1 << z and 0 <= y < 1 << z):
+            raise ValueError("tile coordinates out of range")
+        cached = self._encoded.get((z, x, y))
+        if cached is not None:
+            return cached
+
+        if z <= self.eager_zoom:
+            records = self._eager_records(z, x, y)
+        else:
+            records = self._scanned_records(z, x, y)
+        payload = TILE_HEADER.pack(TILE_MAGIC, z, x, y, len(records)) + b"".join(records)
+        self._encoded[(z, x, y)] = payload
+        return payload
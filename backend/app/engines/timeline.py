@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import base64
+from bisect import bisect_left, insort
+from datetime import datetime
+from uuid import UUID
+
+TimelineKey = tuple[datetime, UUID]
+
+
+def encode_cursor(key: TimelineKey) -> str:
+    created_at, item_id = key
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TimelineKey:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` for anything it did not produce.
+
+    Timelines hold aware timestamps, so a naive one could not be compared
+    against them and is rejected here rather than failing inside ``bisect``.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, item_id = raw.split("|", 1)
+        key = datetime.fromisoformat(created_at), UUID(item_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+    if key[0].tzinfo is None:
+        raise ValueError("invalid cursor")
+    return key
+
+
+class Timeline:
+    """Ascending ``(created_at, id)`` keys read newest-first by offset or keyset."""
+
+    def __init__(self) -> None:
+        self._keys: list[TimelineKey] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, created_at: datetime, item_id: UUID) -> None:
+        key = (created_at, item_id)
+        if not self._keys or self._keys[-1] < key:
+            self._keys.append(key)
+        else:
+            insort(self._keys, key)
+
+    def remove(self, created_at: datetime, item_id: UUID) -> None:
+        key = (created_at, item_id)
+        pos = bisect_left(self._keys, key)
+        if pos < len(self._keys) and self._keys[pos] == key:
+            del self._keys[pos]
+
+    def oldest(self, offset: int, limit: int) -> list[TimelineKey]:
+        return self._keys[offset : offset + limit]
+
+    def newest(self, offset: int, limit: int) -> list[TimelineKey]:
+        end = len(self._keys) - offset
+        if end <= 0:
+            return []
+        return self._keys[max(0, end - limit) : end][::-1]
+
+    def older_than(self, key: TimelineKey, limit: int) -> list[TimelineKey]:
+        end = bisect_left(self._keys, key)
+        return self._keys[max(0, end - limit) : end][::-1]
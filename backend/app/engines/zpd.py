@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import get_args
+from uuid import UUID
+
+import numpy as np
+
+from ..constants import (
+    CLI_OVERLOAD_THRESHOLD,
+    ZPD_READINESS_THRESHOLD,
+    ZPD_W1_BLOOM,
+    ZPD_W2_KCS,
+    ZPD_W3_CLI,
+)
+from ..schemas import ScaffoldingLevel
+from .anchors import ConceptRecord
+from .bloom import BLOOM_LEVELS
+from .kcs import KCSEngine
+from .text import normalize
+
+SCAFFOLDING_LEVELS: tuple[ScaffoldingLevel, ...] = get_args(ScaffoldingLevel)
+HINT, DECOMPOSE, SIMPLIFY = (
+    SCAFFOLDING_LEVELS.index("hint"),
+    SCAFFOLDING_LEVELS.index("decompose"),
+    SCAFFOLDING_LEVELS.index("simplify"),
+)
+TOP_LEVEL = len(BLOOM_LEVELS) - 1
+NEUTRAL_CLI = 0.5
+NEUTRAL_KCS = 0.5
+
+
+def zpd_readiness(bloom: np.ndarray, kcs: np.ndarray, cli: np.ndarray) -> np.ndarray:
+    """Readiness in [0, 1] from Bloom depth, curriculum coverage and (inverted) cognitive load."""
+    return ZPD_W1_BLOOM * bloom + ZPD_W2_KCS * kcs + ZPD_W3_CLI * (1.0 - np.clip(cli, 0.0, 1.0))
+
+
+class ZPDEngine:
+    """Per-concept ZPD readiness over columns aligned with ``AnchorTable.concepts``.
+
+    Bloom level, per-concept cognitive load and curriculum membership are
+    kept as vectors and updated incrementally as concepts are added and
+    notes analysed. Readiness and the scaffolding level it implies are then
+    one NumPy expression over the whole vocabulary, evaluated on the first
+    read after a change and served from the cached arrays until the next.
+    """
+
+    def __init__(self, kcs: KCSEngine, capacity: int = 64) -> None:
+        self.kcs = kcs
+        self._size = 0
+        self._rows_by_key: dict[str, list[int]] = {}
+        self.level = np.zeros(capacity, dtype=np.int64)
+        self._cli_sum = np.zeros(capacity, dtype=np.float64)
+        self._cli_count = np.zeros(capacity, dtype=np.int64)
+        # Sparse concept x subject membership, one entry per (row, subject) pair.
+        self._subjects: list[str] = []
+        self._subject_col: dict[str, int] = {}
+        self._member_row: list[int] = []
+        self._member_col: list[int] = []
+        self._member_weight: list[float] = []
+        self._load_by_key: dict[str, list[float]] = {}
+        self._note_load: dict[UUID, tuple[tuple[str, ...], float]] = {}
+        self._cli_total = [0.0, 0]
+        self._cache: tuple[np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, size: int) -> None:
+        capacity = len(self.level)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("level", "_cli_sum", "_cli_count"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: len(column)] = column
+            setattr(self, name, grown)
+
+    def add_concepts(self, concepts: list[ConceptRecord]) -> None:
+        """Append rows for newly interned concepts, in ``AnchorTable.concepts`` order."""
+        if not concepts:
+            return
+        start = self._size
+        self._grow(start + len(concepts))
+        for row, concept in enumerate(concepts, start):
+            self._rows_by_key.setdefault(concept.key, []).append(row)
+            self.level[row] = BLOOM_LEVELS.index(concept.bloom_level)
+            load = self._load_by_key.get(concept.key)
+            if load is not None:
+                self._cli_sum[row], self._cli_count[row] = load
+            subjects = sorted({key for key, _ in self.kcs.catalog.bits_for(concept.name)})
+            for subject in subjects:
+                column = self._subject_col.get(subject)
+                if column is None:
+                    column = self._subject_col[subject] = len(self._subjects)
+                    self._subjects.append(subject)
+                self._member_row.append(row)
+                self._member_col.append(column)
+                self._member_weight.append(1.0 / len(subjects))
+        self._size = start + len(concepts)
+        self._cache = None
+
+    def set_level(self, row: int, level: str) -> None:
+        self.level[row] = BLOOM_LEVELS.index(level)
+        self._cache = None
+
+    def _add_load(self, keys: tuple[str, ...], cli: float, sign: int) -> None:
+        self._cli_total[0] += sign * cli
+        self._cli_total[1] += sign
+        for key in keys:
+            load = self._load_by_key.setdefault(key, [0.0, 0])
+            load[0] += sign * cli
+            load[1] += sign
+            for row in self._rows_by_key.get(key, ()):
+                self._cli_sum[row] += sign * cli
+                self._cli_count[row] += sign
+
+    def observe_note(self, note_id: UUID, concepts: Iterable[str], cli: float) -> None:
+        """Record a note's analysed load against its concepts, replacing its earlier record."""
+        previous = self._note_load.get(note_id)
+        if previous is not None:
+            self._add_load(*previous, sign=-1)
+        keys = tuple(dict.fromkeys(normalize(name) for name in concepts))
+        self._note_load[note_id] = (keys, cli)
+        self._add_load(keys, cli, sign=1)
+        self._cache = None
+
+    def invalidate(self) -> None:
+        """Drop cached readiness, e.g. after curriculum coverage changed."""
+        self._cache = None
+
+    def _evaluate(self) -> tuple[np.ndarray, np.ndarray]:
+        cached = self._cache
+        if cached is not None:
+            return cached
+        n = self._size
+        coverage = np.array([self.kcs.coverage(subject) for subject in self._subjects], dtype=float)
+        members = np.asarray(self._member_row, dtype=np.int64)
+        weights = np.asarray(self._member_weight)
+        columns = np.asarray(self._member_col, dtype=np.int64)
+        # Mean coverage over the curricula listing each concept; neutral when none do.
+        kcs = np.bincount(members, weights=weights * coverage[columns], minlength=n)
+        kcs = np.where(np.bincount(members, minlength=n) > 0, kcs, NEUTRAL_KCS)
+        total, count = self._cli_total
+        overall = total / count if count else NEUTRAL_CLI
+        counts = self._cli_count[:n]
+        cli = np.where(counts > 0, self._cli_sum[:n] / np.maximum(counts, 1), overall)
+        readiness = zpd_readiness(self.level[:n] / TOP_LEVEL, kcs, cli)
+        scaffolding = np.where(
+            cli > CLI_OVERLOAD_THRESHOLD,
+            SIMPLIFY,
+            np.where(readiness < ZPD_READINESS_THRESHOLD, DECOMPOSE, HINT),
+        )
+        self._cache = (readiness, scaffolding)
+        return self._cache
+
+    def readiness(self) -> np.ndarray:
+        return self._evaluate()[0]
+
+    def scaffolding(self, row: int) -> ScaffoldingLevel:
+        """Scaffolding for the concept at ``row``.
+
+        ``simplify`` above ``CLI_OVERLOAD_THRESHOLD``, ``decompose`` below
+        ``ZPD_READINESS_THRESHOLD``, otherwise ``hint``.
+        """
+        return SCAFFOLDING_LEVELS[int(self._evaluate()[1][row])]
+
+    def growth_ready(self, rows: np.ndarray) -> np.ndarray:
+        """The subset of ``rows`` ready to move up a Bloom level."""
+        scaffolding = self._evaluate()[1]
+        return rows[(scaffolding[rows] == HINT) & (self.level[rows] < TOP_LEVEL)]
+
+    def rows_for(self, concepts: Iterable[str]) -> np.ndarray:
+        rows = [row for name in concepts for row in self._rows_by_key.get(normalize(name), ())]
+        return np.unique(np.asarray(rows, dtype=np.int64))
+
+    def proactive(self, limit: int) -> tuple[np.ndarray, np.ndarray]:
+        """Up to ``limit`` rows needing more than a hint, most severe and least ready first."""
+        readiness, scaffolding = self._evaluate()
+        needy = np.flatnonzero(scaffolding != HINT)
+        order = np.lexsort((readiness[needy], -scaffolding[needy]))[:limit]
+        rows = needy[order]
+        return rows, scaffolding[rows]
@@ -0,0 +1,25 @@
+"""Entity-tag comparison for conditional requests (RFC 9110 section 13.1)."""
+
+
+def _tags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _opaque(tag: str) -> str:
+    return tag.removeprefix("W/")
+
+
+def strong_match(header: str, etag: str) -> bool:
+    """``If-Match`` semantics: ``*`` or an identical strong tag; weak tags never match."""
+    if header.strip() == "*":
+        return True
+    return not etag.startswith("W/") and etag in _tags(header)
+
+
+def weak_match(header: str | None, etag: str) -> bool:
+    """``If-None-Match`` semantics: ``*`` or any tag equal once ``W/`` is ignored."""
+    if header is None:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in _tags(header)}
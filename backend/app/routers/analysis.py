@@ -1,16 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import JSONResponse
 from uuid import UUID
 
-from ..dependencies import AuthUser, get_current_user
-from ..schemas import AnalysisReport
-from ..store import store
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..encoding import JSON_MEDIA_TYPE
+from ..schemas import AnalysisJobStatus, AnalysisReport
+from ..store import InMemoryStore
 
 router = APIRouter(prefix="/notes", tags=["analysis"])
 
 
-@router.get("/{note_id}/analysis", response_model=AnalysisReport)
-def get_note_analysis(note_id: UUID, _: AuthUser = Depends(get_current_user)) -> AnalysisReport:
-    if note_id not in store.notes:
+@router.get(
+    "/{note_id}/analysis",
+    response_model=AnalysisReport,
+    responses={202: {"model": AnalysisJobStatus}},
+)
+def get_note_analysis(
+    note_id: UUID,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> Response:
+    if not store.has_note(note_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="note not found")
-    return store.get_analysis(note_id)
+
+    body = store.analysis_json(note_id)
+    if body is not None:
+        return Response(content=body, media_type=JSON_MEDIA_TYPE)
+    job = AnalysisJobStatus(note_id=note_id, status=store.analysis_status(note_id) or "pending")
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=job.model_dump(mode="json"),
+        headers={"Retry-After": "1"},
+    )
 
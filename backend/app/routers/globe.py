@@ -1,19 +1,28 @@
-from datetime import UTC, datetime
+import math
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from ..dependencies import AuthUser, get_current_user
+from ..bulk import NDJSON_MEDIA_TYPE, export_ndjson, import_ndjson
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..encoding import ANCHOR_LIST, JSON_MEDIA_TYPE, envelope
+from ..etag import weak_match
 from ..schemas import (
+    BatchReviewRequest,
+    BatchReviewResponse,
+    BatchReviewResult,
+    BulkImportResponse,
     CreateAnchorRequest,
+    DueAnchor,
     GeoAnchorWithLocation,
     GetAnchorResponse,
     ReviewAnchorRequest,
     ReviewAnchorResponse,
     ReviewEvent,
 )
-from ..store import store
+from ..store import InMemoryStore, UnknownAnchors, VersionConflict
 
 router = APIRouter(prefix="/globe/anchors", tags=["globe"])
 
@@ -26,15 +35,75 @@ class CreateAnchorResponse(BaseModel):
     anchor: GeoAnchorWithLocation
 
 
+class ListDueAnchorsResponse(BaseModel):
+    anchors: list[DueAnchor]
+
+
+def _parse_floats(raw: str, count: int, field: str) -> list[float]:
+    try:
+        values = [float(part) for part in raw.split(",")]
+    except ValueError:
+        values = []
+    if len(values) != count or not all(map(math.isfinite, values)):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{field} must be {count} comma-separated numbers",
+        )
+    return values
+
+
+def _check_latitudes(field: str, *latitudes: float) -> None:
+    if not all(-90.0 <= latitude <= 90.0 for latitude in latitudes):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{field} latitudes must be within [-90, 90]",
+        )
+
+
 @router.get("", response_model=ListAnchorsResponse)
-def list_anchors(_: AuthUser = Depends(get_current_user)) -> ListAnchorsResponse:
-    return ListAnchorsResponse(anchors=store.list_anchors())
+def list_anchors(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    bbox: str | None = Query(default=None, description="west,south,east,north in degrees"),
+    near: str | None = Query(default=None, description="lat,lon in degrees"),
+    radius_km: float | None = Query(default=None, gt=0, allow_inf_nan=False),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    if bbox is not None and near is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="bbox and near are mutually exclusive",
+        )
+    if near is not None and radius_km is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="radius_km is required with near",
+        )
+    etag = store.etag("anchors")
+    if weak_match(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if bbox is not None:
+        west, south, east, north = _parse_floats(bbox, 4, "bbox")
+        _check_latitudes("bbox", south, north)
+        body = ANCHOR_LIST.dump_json(store.anchors_in_bbox(west, south, east, north))
+    elif near is not None and radius_km is not None:
+        latitude, longitude = _parse_floats(near, 2, "near")
+        _check_latitudes("near", latitude)
+        body = ANCHOR_LIST.dump_json(store.anchors_near(latitude, longitude, radius_km))
+    else:
+        body = store.encoded.get(
+            "anchors", etag, lambda: ANCHOR_LIST.dump_json(store.list_anchors())
+        )
+    return Response(
+        content=envelope("anchors", body), media_type=JSON_MEDIA_TYPE, headers={"ETag": etag}
+    )
 
 
 @router.post("", response_model=CreateAnchorResponse, status_code=201)
 def create_anchor(
     payload: CreateAnchorRequest,
     _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
 ) -> CreateAnchorResponse:
     anchor = store.create_personal_anchor(
         concept_id=payload.concept_id,
@@ -45,21 +114,89 @@ def create_anchor(
     return CreateAnchorResponse(anchor=anchor)
 
 
+@router.post("/import", response_model=BulkImportResponse)
+async def import_anchors(
+    request: Request,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> BulkImportResponse:
+    return await import_ndjson(request.stream(), CreateAnchorRequest, store.import_anchors)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_anchors(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> StreamingResponse:
+    return StreamingResponse(export_ndjson(store.export_anchors), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.post("/reviews", response_model=BatchReviewResponse)
+def review_anchors(
+    payload: BatchReviewRequest,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> BatchReviewResponse:
+    try:
+        reviewed = store.review_anchors(
+            [
+                (review.anchor_id, review.recall_quality, review.reviewed_at)
+                for review in payload.reviews
+            ]
+        )
+    except UnknownAnchors as exc:
+        missing = ", ".join(str(anchor_id) for anchor_id in exc.anchor_ids)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f"anchors not found: {missing}"
+        ) from None
+    return BatchReviewResponse(
+        results=[
+            BatchReviewResult(
+                anchor_id=outcome.anchor.id,
+                updated_strength=round(outcome.anchor.strength, 3),
+                next_review_at=outcome.due_at,
+            )
+            for outcome in reviewed
+        ]
+    )
+
+
+@router.get("/due", response_model=ListDueAnchorsResponse)
+def list_due_anchors(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    limit: int = Query(default=20, ge=1, le=200),
+) -> ListDueAnchorsResponse:
+    return ListDueAnchorsResponse(
+        anchors=[
+            DueAnchor(anchor=anchor, due_at=due_at) for anchor, due_at in store.due_anchors(limit)
+        ]
+    )
+
+
 @router.get("/{anchor_id}", response_model=GetAnchorResponse)
-def get_anchor(anchor_id: UUID, _: AuthUser = Depends(get_current_user)) -> GetAnchorResponse:
-    anchor = store.anchors.get(anchor_id)
-    if anchor is None:
+def get_anchor(
+    anchor_id: UUID,
+    response: Response,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    if_none_match: str | None = Header(default=None),
+) -> GetAnchorResponse | Response:
+    tagged = store.get_anchor_tagged(anchor_id)
+    if tagged is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="anchor not found")
+    anchor, etag = tagged
+    if weak_match(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
 
     return GetAnchorResponse(
         anchor=anchor,
         concept_detail=anchor.concept,
         location_detail=anchor.location,
         review_history=[
-            ReviewEvent(
-                timestamp=anchor.last_reviewed or datetime.now(tz=UTC),
-                recall_quality=4,
-            )
+            ReviewEvent(timestamp=timestamp, recall_quality=quality)
+            for timestamp, quality in store.review_history(anchor.id)
         ],
     )
 
@@ -68,18 +205,23 @@ def get_anchor(anchor_id: UUID, _: AuthUser = Depends(get_current_user)) -> GetA
 def review_anchor(
     anchor_id: UUID,
     payload: ReviewAnchorRequest,
+    response: Response,
     _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    if_match: str | None = Header(default=None),
 ) -> ReviewAnchorResponse:
-    anchor = store.anchors.get(anchor_id)
-    if anchor is None:
+    try:
+        reviewed = store.review_anchor(anchor_id, payload.recall_quality, if_match=if_match)
+    except VersionConflict:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="anchor changed since it was read",
+        ) from None
+    if reviewed is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="anchor not found")
 
-    anchor.review_count += 1
-    anchor.last_reviewed = datetime.now(tz=UTC)
-    anchor.strength = min(1.0, max(0.2, anchor.strength + (payload.recall_quality - 3) * 0.03))
-
+    response.headers["ETag"] = reviewed.etag
     return ReviewAnchorResponse(
-        updated_strength=round(anchor.strength, 3),
-        next_review_at=store.next_review_at(payload.recall_quality),
+        updated_strength=round(reviewed.anchor.strength, 3), next_review_at=reviewed.due_at
     )
 
@@ -1,11 +1,13 @@
 from pydantic import BaseModel
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
-from ..dependencies import AuthUser, get_current_user
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..encoding import JSON_MEDIA_TYPE, ROUTE_LIST, envelope
+from ..etag import weak_match
 from ..schemas import GetRouteResponse, JourneyRoute
-from ..store import store
+from ..store import InMemoryStore
 
 router = APIRouter(prefix="/journey/routes", tags=["journey"])
 
@@ -15,17 +17,31 @@ class ListRoutesResponse(BaseModel):
 
 
 @router.get("", response_model=ListRoutesResponse)
-def list_routes(_: AuthUser = Depends(get_current_user)) -> ListRoutesResponse:
-    return ListRoutesResponse(routes=[store.route()])
+def list_routes(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    etag = store.etag("routes")
+    if weak_match(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    body = store.encoded.get("routes", etag, lambda: ROUTE_LIST.dump_json([store.route()]))
+    return Response(
+        content=envelope("routes", body), media_type=JSON_MEDIA_TYPE, headers={"ETag": etag}
+    )
 
 
 @router.get("/{route_id}", response_model=GetRouteResponse)
-def get_route(route_id: UUID, _: AuthUser = Depends(get_current_user)) -> GetRouteResponse:
+def get_route(
+    route_id: UUID,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> GetRouteResponse:
     route = store.route()
     if route.id != route_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="route not found")
 
-    stops = [store.anchors[sid] for sid in route.stops if sid in store.anchors]
+    stops = store.anchors_by_ids(route.stops)
     return GetRouteResponse(
         route=route,
         stops=stops,
@@ -1,9 +1,12 @@
 from pydantic import BaseModel
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
 
-from ..dependencies import AuthUser, get_current_user
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..encoding import JSON_MEDIA_TYPE
+from ..etag import weak_match
 from ..schemas import KnowledgeRegion, MetacogDashboard
+from ..store import InMemoryStore
 
 router = APIRouter(prefix="/metacog", tags=["metacog"])
 
@@ -13,29 +16,23 @@ class KnowledgeMapResponse(BaseModel):
 
 
 @router.get("/dashboard", response_model=MetacogDashboard)
-def get_dashboard(_: AuthUser = Depends(get_current_user)) -> MetacogDashboard:
-    from ..store import store
-
-    return store.dashboard()
+def get_dashboard(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    etag = store.etag("dashboard")
+    if weak_match(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    body = store.encoded.get(
+        "dashboard", etag, lambda: store.dashboard().model_dump_json().encode()
+    )
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers={"ETag": etag})
 
 
 @router.get("/knowledge-map", response_model=KnowledgeMapResponse)
-def get_knowledge_map(_: AuthUser = Depends(get_current_user)) -> KnowledgeMapResponse:
-    regions = [
-        KnowledgeRegion(
-            latitude=55.6961,
-            longitude=12.5713,
-            radius=130.0,
-            coverage_pct=0.72,
-            concept_count=5,
-        ),
-        KnowledgeRegion(
-            latitude=37.9715,
-            longitude=23.7267,
-            radius=100.0,
-            coverage_pct=0.60,
-            concept_count=8,
-        ),
-    ]
-    return KnowledgeMapResponse(regions=regions)
-
+def get_knowledge_map(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> KnowledgeMapResponse:
+    return KnowledgeMapResponse(regions=store.knowledge_regions())
@@ -1,44 +1,150 @@
-from fastapi import APIRouter, Depends, Query
+from uuid import UUID
 
-from ..dependencies import AuthUser, get_current_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from ..bulk import NDJSON_MEDIA_TYPE, export_ndjson, import_ndjson
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..engines.pipeline import AnalysisQueueFull
 from ..schemas import (
+    BulkImportResponse,
     CreateNoteAccepted,
     CreateNoteRequest,
     GetNoteResponse,
     ListNotesResponse,
+    NoteObject,
+    NoteSearchHit,
+    SearchNotesResponse,
+    UpdateNoteRequest,
 )
-from ..store import store
+from ..store import InMemoryStore
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
 
 @router.post("", response_model=CreateNoteAccepted, status_code=202)
-def create_note(payload: CreateNoteRequest, _: AuthUser = Depends(get_current_user)) -> CreateNoteAccepted:
-    note = store.create_note(
-        template_type=payload.template_type,
-        subject=payload.subject,
-        content=payload.content,
-    )
+def create_note(
+    payload: CreateNoteRequest,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> CreateNoteAccepted:
+    try:
+        note = store.create_note(
+            template_type=payload.template_type,
+            subject=payload.subject,
+            content=payload.content,
+        )
+    except AnalysisQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="analysis queue is full",
+            headers={"Retry-After": "5"},
+        ) from None
     return CreateNoteAccepted(note_id=note.id, analysis_eta_seconds=3)
 
 
 @router.get("", response_model=ListNotesResponse)
 def list_notes(
     _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
     subject: str | None = Query(default=None),
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None),
 ) -> ListNotesResponse:
-    items = store.list_notes(subject=subject)
-    start = (page - 1) * limit
-    end = start + limit
-    return ListNotesResponse(notes=items[start:end], total=len(items), page=page)
+    try:
+        items, total, next_cursor = store.list_notes(
+            subject=subject, offset=(page - 1) * limit, limit=limit, cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invalid cursor"
+        ) from None
+    return ListNotesResponse(notes=items, total=total, page=page, next_cursor=next_cursor)
+
+
+@router.post("/import", response_model=BulkImportResponse)
+async def import_notes(
+    request: Request,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> BulkImportResponse:
+    return await import_ndjson(request.stream(), CreateNoteRequest, store.import_notes)
+
+
+@router.get("/export", response_class=StreamingResponse)
+def export_notes(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> StreamingResponse:
+    return StreamingResponse(export_ndjson(store.export_notes), media_type=NDJSON_MEDIA_TYPE)
+
+
+@router.get("/search", response_model=SearchNotesResponse)
+def search_notes(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> SearchNotesResponse:
+    hits, total = store.search_notes(q, limit)
+    return SearchNotesResponse(
+        hits=[NoteSearchHit(note=note, score=round(score, 4)) for note, score in hits],
+        total=total,
+    )
 
 
 @router.get("/{note_id}", response_model=GetNoteResponse)
-def get_note(note_id: str, _: AuthUser = Depends(get_current_user)) -> GetNoteResponse:
-    parsed = next((note for note in store.notes.values() if str(note.id) == note_id), None)
+def get_note(
+    note_id: str,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> GetNoteResponse:
+    try:
+        parsed = store.get_note(UUID(note_id))
+    except ValueError:
+        parsed = None
     if parsed is None:
-        parsed = store.create_note("cornell", "General", {"cue_column": [], "main_notes": "", "summary": ""})
+        try:
+            parsed = store.create_note(
+                "cornell", "General", {"cue_column": [], "main_notes": "", "summary": ""}
+            )
+        except AnalysisQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="analysis queue is full",
+                headers={"Retry-After": "5"},
+            ) from None
     return GetNoteResponse(note=parsed, analysis=store.get_analysis(parsed.id))
 
+
+@router.patch(
+    "/{note_id}",
+    response_model=CreateNoteAccepted,
+    status_code=202,
+    responses={200: {"model": NoteObject}},
+)
+def update_note(
+    note_id: UUID,
+    payload: UpdateNoteRequest,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> Response:
+    try:
+        updated = store.update_note(note_id, content=payload.content, subject=payload.subject)
+    except AnalysisQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="analysis queue is full",
+            headers={"Retry-After": "5"},
+        ) from None
+    if updated is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="note not found")
+    note, queued = updated
+    if not queued:
+        # Nothing the analysis reads changed, so the current report stays valid.
+        return JSONResponse(content=note.model_dump(mode="json"))
+    accepted = CreateNoteAccepted(note_id=note.id, analysis_eta_seconds=3)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content=accepted.model_dump(mode="json")
+    )
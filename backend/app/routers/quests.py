@@ -1,17 +1,29 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 
-from ..dependencies import AuthUser, get_current_user
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..encoding import JSON_MEDIA_TYPE
+from ..etag import weak_match
 from ..schemas import CompleteQuestRequest, DailyQuestPayload, QuestCompletionResponse
-from ..store import store
+from ..store import InMemoryStore
 
 router = APIRouter(prefix="/quests", tags=["quests"])
 
 
 @router.get("/daily", response_model=DailyQuestPayload)
-def get_daily_quests(_: AuthUser = Depends(get_current_user)) -> DailyQuestPayload:
-    return store.daily_quests()
+def get_daily_quests(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    if_none_match: str | None = Header(default=None),
+) -> Response:
+    etag = store.etag("quests")
+    if weak_match(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    body = store.encoded.get(
+        "quests", etag, lambda: store.daily_quests().model_dump_json().encode()
+    )
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers={"ETag": etag})
 
 
 @router.post("/{quest_id}/complete", response_model=QuestCompletionResponse)
@@ -19,16 +31,18 @@ def complete_quest(
     quest_id: UUID,
     payload: CompleteQuestRequest,
     _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
 ) -> QuestCompletionResponse:
     daily = store.daily_quests()
-    quest = next((q for q in daily.quests if q.id == quest_id), None)
-    if quest is None:
+    if not any(q.id == quest_id for q in daily.quests):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="quest not found")
 
-    if payload.note_id not in store.notes:
+    if not store.has_note(payload.note_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="note not found")
 
-    quest.completed = True
+    quest = store.complete_quest(quest_id)
+    if quest is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="quest not found")
     return QuestCompletionResponse(
         quest=quest,
         xp_earned=50,
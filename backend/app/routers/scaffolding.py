@@ -1,38 +1,70 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 
-from ..dependencies import AuthUser, get_current_user
-from ..schemas import ScaffoldingResponse, ScaffoldingTriggerRequest
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..encoding import JSON_MEDIA_TYPE
+from ..engines.zpd import SCAFFOLDING_LEVELS
+from ..schemas import (
+    ScaffoldingResponse,
+    ScaffoldingSuggestion,
+    ScaffoldingSuggestionsResponse,
+    ScaffoldingTriggerRequest,
+)
+from ..store import InMemoryStore
 
 router = APIRouter(prefix="/scaffolding", tags=["scaffolding"])
 
+LEVEL_BY_TRIGGER = {
+    "cli_overload": "simplify",
+    "zpd_not_ready": "decompose",
+    "student_request": "hint",
+}
+
+CONTENT_BY_LEVEL = {
+    "hint": {
+        "question": "What prior concept can explain this new concept?",
+        "connected_concept": "Prerequisites",
+    },
+    "decompose": {
+        "sub_concepts": ["Foundation", "Core Principle", "Application"],
+        "suggested_notes": [{"template_type": "cornell", "subject": "General"}],
+    },
+    "simplify": {
+        "analogy": "Think in smaller chunks and map one concept to one location first.",
+        "visual_url": "",
+        "simplified_explanation": "Start from one anchor and expand outward.",
+    },
+}
+
+# The content never changes at runtime, so each level is encoded once at import.
+_ENCODED_BY_LEVEL = {
+    level: ScaffoldingResponse(level=level, content=content).model_dump_json().encode()
+    for level, content in CONTENT_BY_LEVEL.items()
+}
+
 
 @router.post("/trigger", response_model=ScaffoldingResponse)
 def trigger_scaffolding(
     payload: ScaffoldingTriggerRequest,
     _: AuthUser = Depends(get_current_user),
-) -> ScaffoldingResponse:
-    level_map = {
-        "cli_overload": "simplify",
-        "zpd_not_ready": "decompose",
-        "student_request": "hint",
-    }
-    level = level_map.get(payload.trigger_reason, "hint")
-
-    content_by_level = {
-        "hint": {
-            "question": "What prior concept can explain this new concept?",
-            "connected_concept": "Prerequisites",
-        },
-        "decompose": {
-            "sub_concepts": ["Foundation", "Core Principle", "Application"],
-            "suggested_notes": [{"template_type": "cornell", "subject": "General"}],
-        },
-        "simplify": {
-            "analogy": "Think in smaller chunks and map one concept to one location first.",
-            "visual_url": "",
-            "simplified_explanation": "Start from one anchor and expand outward.",
-        },
-    }
-
-    return ScaffoldingResponse(level=level, content=content_by_level[level])
+    store: InMemoryStore = Depends(get_store),
+) -> Response:
+    # The stronger of what the client reports and what the learner's ZPD state calls for.
+    level = LEVEL_BY_TRIGGER.get(payload.trigger_reason, "hint")
+    assessed = store.scaffolding(payload.concept_id)
+    if assessed is not None:
+        level = max(level, assessed, key=SCAFFOLDING_LEVELS.index)
+    return Response(content=_ENCODED_BY_LEVEL[level], media_type=JSON_MEDIA_TYPE)
 
+
+@router.get("/suggestions", response_model=ScaffoldingSuggestionsResponse)
+def get_scaffolding_suggestions(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    limit: int = Query(default=20, ge=1, le=200),
+) -> ScaffoldingSuggestionsResponse:
+    return ScaffoldingSuggestionsResponse(
+        suggestions=[
+            ScaffoldingSuggestion(concept_id=concept_id, level=level)
+            for concept_id, level in store.scaffolding_suggestions(limit)
+        ]
+    )
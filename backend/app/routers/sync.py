@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..schemas import SyncResponse
+from ..store import InMemoryStore
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+def sync(
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+    since: str | None = Query(default=None, description="cursor from the previous sync"),
+    limit: int = Query(default=500, ge=1, le=5000),
+) -> SyncResponse:
+    try:
+        return store.sync(since, limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invalid cursor"
+        ) from None
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+
+from ..dependencies import AuthUser, get_current_user, get_store
+from ..engines.tiles import TILE_MEDIA_TYPE
+from ..store import InMemoryStore
+
+router = APIRouter(prefix="/globe/tiles", tags=["globe"])
+
+
+@router.get("/{z}/{x}/{y}", response_class=Response)
+def get_tile(
+    z: int,
+    x: int,
+    y: int,
+    _: AuthUser = Depends(get_current_user),
+    store: InMemoryStore = Depends(get_store),
+) -> Response:
+    try:
+        payload = store.tile(z, x, y)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="tile not found"
+        ) from None
+    return Response(content=payload, media_type=TILE_MEDIA_TYPE)
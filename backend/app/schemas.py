@@ -26,6 +26,11 @@ class CreateNoteRequest(BaseModel):
     content: dict[str, Any]
 
 
+class UpdateNoteRequest(BaseModel):
+    subject: str | None = None
+    content: dict[str, Any] = Field(default_factory=dict)
+
+
 class CreateNoteAccepted(BaseModel):
     note_id: UUID
     status: Literal["processing"] = "processing"
@@ -60,6 +65,11 @@ class AnalysisReport(BaseModel):
     feedback_cards: list[FeedbackCard]
 
 
+class AnalysisJobStatus(BaseModel):
+    note_id: UUID
+    status: Literal["pending", "failed"]
+
+
 class GetNoteResponse(BaseModel):
     note: NoteObject
     analysis: AnalysisReport | None = None
@@ -69,6 +79,28 @@ class ListNotesResponse(BaseModel):
     notes: list[NoteObject]
     total: int
     page: int
+    next_cursor: str | None = None
+
+
+class ImportLineError(BaseModel):
+    line: int
+    detail: str
+
+
+class BulkImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ImportLineError]
+
+
+class NoteSearchHit(BaseModel):
+    note: NoteObject
+    score: float
+
+
+class SearchNotesResponse(BaseModel):
+    hits: list[NoteSearchHit]
+    total: int
 
 
 class LocationInput(BaseModel):
@@ -127,6 +159,11 @@ class GetAnchorResponse(BaseModel):
     review_history: list[ReviewEvent]
 
 
+class DueAnchor(BaseModel):
+    anchor: GeoAnchorWithLocation
+    due_at: datetime
+
+
 class ReviewAnchorRequest(BaseModel):
     recall_quality: int = Field(ge=1, le=5)
 
@@ -136,6 +173,23 @@ class ReviewAnchorResponse(BaseModel):
     next_review_at: datetime
 
 
+class BatchReviewItem(ReviewAnchorRequest):
+    anchor_id: UUID
+    reviewed_at: datetime
+
+
+class BatchReviewRequest(BaseModel):
+    reviews: list[BatchReviewItem] = Field(min_length=1, max_length=500)
+
+
+class BatchReviewResult(ReviewAnchorResponse):
+    anchor_id: UUID
+
+
+class BatchReviewResponse(BaseModel):
+    results: list[BatchReviewResult]
+
+
 class JourneyRoute(BaseModel):
     id: UUID
     estimated_minutes: int
@@ -164,6 +218,21 @@ class DailyQuestPayload(BaseModel):
     journey_route: JourneyRoute | None = None
 
 
+class SyncAnalysis(BaseModel):
+    note_id: UUID
+    analysis: AnalysisReport
+
+
+class SyncResponse(BaseModel):
+    cursor: str
+    reset: bool
+    has_more: bool
+    anchors: list[GeoAnchorWithLocation]
+    notes: list[NoteObject]
+    analyses: list[SyncAnalysis]
+    quests: DailyQuestPayload | None = None
+
+
 class CompleteQuestRequest(BaseModel):
     note_id: UUID
 
@@ -199,3 +268,12 @@ class ScaffoldingResponse(BaseModel):
     level: ScaffoldingLevel
     content: dict[str, Any]
 
+
+class ScaffoldingSuggestion(BaseModel):
+    concept_id: UUID
+    level: ScaffoldingLevel
+
+
+class ScaffoldingSuggestionsResponse(BaseModel):
+    suggestions: list[ScaffoldingSuggestion]
+
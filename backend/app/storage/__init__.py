@@ -0,0 +1 @@
+"""Durable persistence behind the in-memory store's indexes."""
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Protocol
+from uuid import UUID
+
+from ..schemas import AnalysisReport, DailyQuest, GeoAnchorWithLocation, NoteObject
+
+
+class Repository(Protocol):
+    """System of record for one deployment; every call is scoped by ``user_id``.
+
+    The store keeps its engines and indexes in memory, writes through to the
+    repository on every mutation and rebuilds itself from the ``load_*``
+    iterators on startup. Backends shared by several processes report, via
+    ``changed_elsewhere``, when a user was written by someone else since
+    ``track`` so the store can be rebuilt.
+    """
+
+    def track(self, user_id: UUID) -> None:
+        """Take the user's current state as this process's view; call before loading it."""
+        ...
+
+    def changed_elsewhere(self, user_id: UUID) -> bool:
+        """Whether another writer changed the user since ``track``."""
+        ...
+
+    def load_notes(self, user_id: UUID) -> Iterator[NoteObject]:
+        """Notes oldest first."""
+        ...
+
+    def load_analyses(self, user_id: UUID) -> Iterator[tuple[UUID, AnalysisReport]]: ...
+
+    def load_anchors(self, user_id: UUID) -> Iterator[tuple[GeoAnchorWithLocation, int]]:
+        """Anchors in creation order, each with its spaced-repetition step."""
+        ...
+
+    def load_reviews(self, user_id: UUID) -> Iterator[tuple[UUID, datetime, int]]:
+        """``(anchor_id, reviewed_at, quality)`` oldest first."""
+        ...
+
+    def save_note(self, user_id: UUID, note: NoteObject) -> None: ...
+
+    def save_notes(self, user_id: UUID, notes: list[NoteObject]) -> None:
+        """Upsert a batch of notes in one write."""
+        ...
+
+    def save_analyses(self, user_id: UUID, reports: list[tuple[UUID, AnalysisReport]]) -> None:
+        """Upsert a batch of reports in one write."""
+        ...
+
+    def save_anchor(self, user_id: UUID, anchor: GeoAnchorWithLocation, srs_step: int) -> None: ...
+
+    def save_anchors(self, user_id: UUID, anchors: list[tuple[GeoAnchorWithLocation, int]]) -> None:
+        """Upsert a batch of ``(anchor, srs_step)`` pairs in one write."""
+        ...
+
+    def record_review(
+        self,
+        user_id: UUID,
+        anchor: GeoAnchorWithLocation,
+        srs_step: int,
+        quality: int,
+        reviewed_at: datetime,
+    ) -> None:
+        """Persist the reviewed anchor and append the review atomically."""
+        ...
+
+    def record_reviews(
+        self, user_id: UUID, reviews: list[tuple[GeoAnchorWithLocation, int, int, datetime]]
+    ) -> None:
+        """Apply ``(anchor, srs_step, quality, reviewed_at)`` reviews in order, atomically."""
+        ...
+
+    def load_quests(self, user_id: UUID, day: date) -> list[DailyQuest]:
+        """The quests planned for ``day`` in order, or an empty list if none were."""
+        ...
+
+    def save_quests(self, user_id: UUID, day: date, quests: list[DailyQuest]) -> list[DailyQuest]:
+        """Store ``quests`` as ``day``'s plan unless one already is; returns the stored plan.
+
+        Quests of earlier days are dropped.
+        """
+        ...
+
+    def complete_quest(self, user_id: UUID, day: date, quest_id: UUID) -> None:
+        """Mark one of ``day``'s stored quests completed."""
+        ...
+
+    def close(self) -> None: ...
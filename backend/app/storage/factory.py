@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from ..config import Settings
+from .base import Repository
+from .memory import MemoryRepository
+from .sqlite import SQLiteRepository
+
+
+def open_repository(settings: Settings) -> Repository:
+    if settings.storage_backend == "sqlite":
+        return SQLiteRepository(settings.sqlite_path, pool_size=settings.sqlite_pool_size)
+    return MemoryRepository()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from datetime import date, datetime
+from uuid import UUID
+
+from ..schemas import AnalysisReport, DailyQuest, GeoAnchorWithLocation, NoteObject
+
+
+class MemoryRepository:
+    """Process-local repository for tests and throwaway dev servers.
+
+    Holds copies so a fresh store built on the same repository rehydrates the
+    same state, but nothing survives the process.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._notes: dict[UUID, dict[UUID, NoteObject]] = {}
+        self._analyses: dict[UUID, dict[UUID, AnalysisReport]] = {}
+        self._anchors: dict[UUID, dict[UUID, tuple[GeoAnchorWithLocation, int]]] = {}
+        self._reviews: dict[UUID, list[tuple[UUID, datetime, int]]] = {}
+        self._quests: dict[UUID, tuple[date, list[DailyQuest]]] = {}
+
+    def track(self, user_id: UUID) -> None:
+        pass
+
+    def changed_elsewhere(self, user_id: UUID) -> bool:
+        return False
+
+    def load_notes(self, user_id: UUID) -> Iterator[NoteObject]:
+        with self._lock:
+            notes = sorted(self._notes.get(user_id, {}).values(), key=lambda n: n.created_at)
+        return iter(notes)
+
+    def load_analyses(self, user_id: UUID) -> Iterator[tuple[UUID, AnalysisReport]]:
+        with self._lock:
+            return iter(list(self._analyses.get(user_id, {}).items()))
+
+    def load_anchors(self, user_id: UUID) -> Iterator[tuple[GeoAnchorWithLocation, int]]:
+        with self._lock:
+            return iter(list(self._anchors.get(user_id, {}).values()))
+
+    def load_reviews(self, user_id: UUID) -> Iterator[tuple[UUID, datetime, int]]:
+        with self._lock:
+            return iter(sorted(self._reviews.get(user_id, []), key=lambda r: r[1]))
+
+    def save_note(self, user_id: UUID, note: NoteObject) -> None:
+        self.save_notes(user_id, [note])
+
+    def save_notes(self, user_id: UUID, notes: list[NoteObject]) -> None:
+        with self._lock:
+            stored = self._notes.setdefault(user_id, {})
+            for note in notes:
+                stored[note.id] = note.model_copy(deep=True)
+
+    def save_analyses(self, user_id: UUID, reports: list[tuple[UUID, AnalysisReport]]) -> None:
+        with self._lock:
+            analyses = self._analyses.setdefault(user_id, {})
+            for note_id, report in reports:
+                analyses[note_id] = report
+
+    def save_anchor(self, user_id: UUID, anchor: GeoAnchorWithLocation, srs_step: int) -> None:
+        self.save_anchors(user_id, [(anchor, srs_step)])
+
+    def save_anchors(self, user_id: UUID, anchors: list[tuple[GeoAnchorWithLocation, int]]) -> None:
+        with self._lock:
+            stored = self._anchors.setdefault(user_id, {})
+            for anchor, srs_step in anchors:
+                stored[anchor.id] = (anchor.model_copy(deep=True), srs_step)
+
+    def record_review(
+        self,
+        user_id: UUID,
+        anchor: GeoAnchorWithLocation,
+        srs_step: int,
+        quality: int,
+        reviewed_at: datetime,
+    ) -> None:
+        self.record_reviews(user_id, [(anchor, srs_step, quality, reviewed_at)])
+
+    def record_reviews(
+        self, user_id: UUID, reviews: list[tuple[GeoAnchorWithLocation, int, int, datetime]]
+    ) -> None:
+        with self._lock:
+            stored = self._anchors.setdefault(user_id, {})
+            log = self._reviews.setdefault(user_id, [])
+            for anchor, srs_step, quality, reviewed_at in reviews:
+                stored[anchor.id] = (anchor.model_copy(deep=True), srs_step)
+                log.append((anchor.id, reviewed_at, quality))
+
+    def load_quests(self, user_id: UUID, day: date) -> list[DailyQuest]:
+        with self._lock:
+            stored = self._quests.get(user_id)
+            if stored is None or stored[0] != day:
+                return []
+            return [quest.model_copy() for quest in stored[1]]
+
+    def save_quests(self, user_id: UUID, day: date, quests: list[DailyQuest]) -> list[DailyQuest]:
+        with self._lock:
+            stored = self._quests.get(user_id)
+            if stored is None or stored[0] != day or not stored[1]:
+                stored = self._quests[user_id] = (day, [quest.model_copy() for quest in quests])
+            return [quest.model_copy() for quest in stored[1]]
+
+    def complete_quest(self, user_id: UUID, day: date, quest_id: UUID) -> None:
+        with self._lock:
+            stored = self._quests.get(user_id)
+            if stored is None or stored[0] != day:
+                return
+            stored[1][:] = [
+                quest.model_copy(update={"completed": True}) if quest.id == quest_id else quest
+                for quest in stored[1]
+            ]
+
+    def close(self) -> None:
+        pass
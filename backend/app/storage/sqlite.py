@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, date, datetime
+from pathlib import Path
+from uuid import UUID
+
+from ..schemas import AnalysisReport, DailyQuest, GeoAnchorWithLocation, NoteObject
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    template_type TEXT NOT NULL,
+    session_number INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    content TEXT NOT NULL,
+    extracted_concepts TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_user_created ON notes (user_id, created_at);
+CREATE INDEX IF NOT EXISTS notes_user_subject_created ON notes (user_id, subject, created_at);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    note_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    report TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS analyses_user ON analyses (user_id);
+
+CREATE TABLE IF NOT EXISTS anchors (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    srs_step INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    review_count INTEGER,
+    last_reviewed REAL,
+    strength REAL,
+    pin_color TEXT
+);
+CREATE INDEX IF NOT EXISTS anchors_user ON anchors (user_id);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    anchor_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    reviewed_at INTEGER NOT NULL,
+    quality INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reviews_user_time ON reviews (user_id, reviewed_at);
+
+CREATE TABLE IF NOT EXISTS quests (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (user_id, day, position)
+);
+
+CREATE TABLE IF NOT EXISTS revisions (
+    user_id TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+"""
+# Per-field review state added after the first release; databases created
+# before it get the columns on open, backfilled from the anchor payload.
+ANCHOR_REVIEW_COLUMNS = {
+    "review_count": "INTEGER",
+    "last_reviewed": "REAL",
+    "strength": "REAL",
+    "pin_color": "TEXT",
+}
+
+# Statement texts are module constants so each pooled connection's statement
+# cache compiles them once and reuses the prepared statement afterwards.
+UPSERT_NOTE = """
+INSERT INTO notes
+    (id, user_id, subject, template_type, session_number, created_at, content, extracted_concepts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    subject = excluded.subject,
+    content = excluded.content,
+    extracted_concepts = excluded.extracted_concepts
+"""
+UPSERT_ANALYSIS = """
+INSERT INTO analyses (note_id, user_id, report) VALUES (?, ?, ?)
+ON CONFLICT (note_id) DO UPDATE SET report = excluded.report
+"""
+UPSERT_ANCHOR = """
+INSERT INTO anchors
+    (id, user_id, srs_step, payload, review_count, last_reviewed, strength, pin_color)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET payload = excluded.payload
+"""
+# A review touches only the fields it changes; the count is incremented in
+# place so reviews committed by other processes are never overwritten.
+REVIEW_ANCHOR = """
+UPDATE anchors SET
+    review_count = review_count + 1,
+    last_reviewed = max(coalesce(last_reviewed, ?), ?),
+    strength = ?,
+    pin_color = ?,
+    srs_step = ?
+WHERE id = ? AND user_id = ?
+"""
+BACKFILL_ANCHOR = """
+UPDATE anchors SET review_count = ?, last_reviewed = ?, strength = ?, pin_color = ? WHERE id = ?
+"""
+INSERT_QUEST = """
+INSERT INTO quests (user_id, day, position, payload) VALUES (?, ?, ?, ?)
+ON CONFLICT (user_id, day, position) DO NOTHING
+"""
+COMPLETE_QUEST = """
+UPDATE quests SET payload = json_set(payload, '$.completed', json('true'))
+WHERE user_id = ? AND day = ? AND json_extract(payload, '$.id') = ?
+"""
+DELETE_OLD_QUESTS = "DELETE FROM quests WHERE user_id = ? AND day < ?"
+BUMP_REVISION = """
+INSERT INTO revisions (user_id, revision) VALUES (?, 1)
+ON CONFLICT (user_id) DO UPDATE SET revision = revision + 1
+RETURNING revision
+"""
+SELECT_REVISION = "SELECT revision FROM revisions WHERE user_id = ?"
+INSERT_REVIEW = "INSERT INTO reviews (anchor_id, user_id, reviewed_at, quality) VALUES (?, ?, ?, ?)"
+SELECT_NOTES = """
+SELECT id, subject, template_type, session_number, created_at, content, extracted_concepts
+FROM notes WHERE user_id = ? ORDER BY created_at
+"""
+SELECT_ANALYSES = "SELECT note_id, report FROM analyses WHERE user_id = ?"
+SELECT_ANCHORS = """
+SELECT payload, srs_step, review_count, last_reviewed, strength, pin_color
+FROM anchors WHERE user_id = ? ORDER BY rowid
+"""
+SELECT_REVIEWS = """
+SELECT anchor_id, reviewed_at, quality FROM reviews WHERE user_id = ? ORDER BY reviewed_at
+"""
+SELECT_QUESTS = "SELECT payload FROM quests WHERE user_id = ? AND day = ? ORDER BY position"
+
+STATEMENT_CACHE_SIZE = 64
+FETCH_SIZE = 1024
+
+
+class SQLiteRepository:
+    """SQLite system of record in WAL mode, safe to share between processes.
+
+    A fixed pool of connections is shared across request and analysis threads;
+    WAL lets readers proceed while a single writer commits, and ``busy_timeout``
+    queues concurrent writers instead of failing them.
+
+    Several worker processes may open the same file. Writes only set the
+    fields they change, so concurrent writers do not clobber each other: a
+    review increments ``review_count`` in place rather than writing back a
+    snapshot. Every write transaction also bumps the user's row in
+    ``revisions``; a process that sees a revision it did not write itself
+    reports it through ``changed_elsewhere`` so the caller can reload that
+    user.
+    """
+
+    def __init__(self, path: Path, pool_size: int = 4, busy_timeout_ms: int = 5000) -> None:
+        self.path = path
+        self._pool: queue.Queue[sqlite3.Connection] = queue.Queue()
+        for _ in range(max(1, pool_size)):
+            self._pool.put(self._connect(busy_timeout_ms))
+        # SQLite admits one writer at a time anyway; holding this across each
+        # write transaction keeps ``_seen`` in commit order within the process.
+        self._write_lock = threading.Lock()
+        self._seen: dict[UUID, int] = {}
+        with self._connection() as conn, conn:
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    def _connect(self, busy_timeout_ms: int) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(anchors)")}
+        missing = [name for name in ANCHOR_REVIEW_COLUMNS if name not in columns]
+        if not missing:
+            return
+        for name in missing:
+            conn.execute(f"ALTER TABLE anchors ADD COLUMN {name} {ANCHOR_REVIEW_COLUMNS[name]}")
+        rows = conn.execute("SELECT id, payload FROM anchors WHERE review_count IS NULL").fetchall()
+        conn.executemany(
+            BACKFILL_ANCHOR,
+            [(*_review_fields(GeoAnchorWithLocation.model_validate_json(p)), i) for i, p in rows],
+        )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def _write(self, user_id: UUID) -> Iterator[sqlite3.Connection]:
+        """One write transaction for ``user_id`` that also bumps its revision.
+
+        The bump is the transaction's first statement, so it takes the write
+        lock before anything else runs. If the revision it replaces is the
+        one this process last saw, the write is ours alone and ``_seen``
+        moves on; otherwise another process wrote in between and ``_seen``
+        stays behind, which ``changed_elsewhere`` reports.
+        """
+        with self._write_lock, self._connection() as conn:
+            with conn:
+                (revision,) = conn.execute(BUMP_REVISION, (str(user_id),)).fetchone()
+                yield conn
+            if self._seen.get(user_id) == revision - 1:
+                self._seen[user_id] = revision
+
+    def _revision(self, user_id: UUID) -> int:
+        with self._connection() as conn:
+            row = conn.execute(SELECT_REVISION, (str(user_id),)).fetchone()
+        return 0 if row is None else row[0]
+
+    def track(self, user_id: UUID) -> None:
+        self._seen[user_id] = self._revision(user_id)
+
+    def changed_elsewhere(self, user_id: UUID) -> bool:
+        seen = self._seen.get(user_id)
+        return seen is not None and self._revision(user_id) != seen
+
+    def _rows(self, sql: str, user_id: UUID) -> Iterator[tuple]:
+        with self._connection() as conn:
+            cursor = conn.execute(sql, (str(user_id),))
+            while batch := cursor.fetchmany(FETCH_SIZE):
+                yield from batch
+
+    def load_notes(self, user_id: UUID) -> Iterator[NoteObject]:
+        for note_id, subject, template, session, created, content, concepts in self._rows(
+            SELECT_NOTES, user_id
+        ):
+            yield NoteObject(
+                id=UUID(note_id),
+                template_type=template,
+                subject=subject,
+                content=json.loads(content),
+                extracted_concepts=json.loads(concepts),
+                session_number=session,
+                created_at=datetime.fromisoformat(created),
+            )
+
+    def load_analyses(self, user_id: UUID) -> Iterator[tuple[UUID, AnalysisReport]]:
+        for note_id, report in self._rows(SELECT_ANALYSES, user_id):
+            yield UUID(note_id), AnalysisReport.model_validate_json(report)
+
+    def load_anchors(self, user_id: UUID) -> Iterator[tuple[GeoAnchorWithLocation, int]]:
+        for payload, srs_step, count, reviewed, strength, pin_color in self._rows(
+            SELECT_ANCHORS, user_id
+        ):
+            anchor = GeoAnchorWithLocation.model_validate_json(payload)
+            # The payload is the anchor as created; review state lives in its columns.
+            yield (
+                anchor.model_copy(
+                    update={
+                        "review_count": count,
+                        "last_reviewed": (
+                            None if reviewed is None else datetime.fromtimestamp(reviewed, tz=UTC)
+                        ),
+                        "strength": strength,
+                        "pin_color": pin_color,
+                    }
+                ),
+                srs_step,
+            )
+
+    def load_reviews(self, user_id: UUID) -> Iterator[tuple[UUID, datetime, int]]:
+        for anchor_id, reviewed_at, quality in self._rows(SELECT_REVIEWS, user_id):
+            yield UUID(anchor_id), datetime.fromtimestamp(reviewed_at, tz=UTC), quality
+
+    def save_note(self, user_id: UUID, note: NoteObject) -> None:
+        self.save_notes(user_id, [note])
+
+    def save_notes(self, user_id: UUID, notes: list[NoteObject]) -> None:
+        if not notes:
+            return
+        rows = [
+            (
+                str(note.id),
+                str(user_id),
+                note.subject,
+                note.template_type,
+                note.session_number,
+                note.created_at.isoformat(),
+                json.dumps(note.content, ensure_ascii=False),
+                json.dumps(note.extracted_concepts, ensure_ascii=False),
+            )
+            for note in notes
+        ]
+        with self._write(user_id) as conn:
+            conn.executemany(UPSERT_NOTE, rows)
+
+    def save_analyses(self, user_id: UUID, reports: list[tuple[UUID, AnalysisReport]]) -> None:
+        if not reports:
+            return
+        rows = [
+            (str(note_id), str(user_id), report.model_dump_json()) for note_id, report in reports
+        ]
+        with self._write(user_id) as conn:
+            conn.executemany(UPSERT_ANALYSIS, rows)
+
+    def save_anchor(self, user_id: UUID, anchor: GeoAnchorWithLocation, srs_step: int) -> None:
+        self.save_anchors(user_id, [(anchor, srs_step)])
+
+    def save_anchors(self, user_id: UUID, anchors: list[tuple[GeoAnchorWithLocation, int]]) -> None:
+        if not anchors:
+            return
+        rows = [
+            (
+                str(anchor.id),
+                str(user_id),
+                srs_step,
+                anchor.model_dump_json(),
+                *_review_fields(anchor),
+            )
+            for anchor, srs_step in anchors
+        ]
+        with self._write(user_id) as conn:
+            conn.executemany(UPSERT_ANCHOR, rows)
+
+    def record_review(
+        self,
+        user_id: UUID,
+        anchor: GeoAnchorWithLocation,
+        srs_step: int,
+        quality: int,
+        reviewed_at: datetime,
+    ) -> None:
+        self.record_reviews(user_id, [(anchor, srs_step, quality, reviewed_at)])
+
+    def record_reviews(
+        self, user_id: UUID, reviews: list[tuple[GeoAnchorWithLocation, int, int, datetime]]
+    ) -> None:
+        if not reviews:
+            return
+        user = str(user_id)
+        updates = [
+            (
+                reviewed_at.timestamp(),
+                reviewed_at.timestamp(),
+                anchor.strength,
+                anchor.pin_color,
+                srs_step,
+                str(anchor.id),
+                user,
+            )
+            for anchor, srs_step, _, reviewed_at in reviews
+        ]
+        events = [
+            (str(anchor.id), user, int(reviewed_at.timestamp()), quality)
+            for anchor, _, quality, reviewed_at in reviews
+        ]
+        with self._write(user_id) as conn:
+            conn.executemany(REVIEW_ANCHOR, updates)
+            conn.executemany(INSERT_REVIEW, events)
+
+    def load_quests(self, user_id: UUID, day: date) -> list[DailyQuest]:
+        with self._connection() as conn:
+            rows = conn.execute(SELECT_QUESTS, (str(user_id), day.isoformat())).fetchall()
+        return [DailyQuest.model_validate_json(payload) for (payload,) in rows]
+
+    def save_quests(self, user_id: UUID, day: date, quests: list[DailyQuest]) -> list[DailyQuest]:
+        user, today = str(user_id), day.isoformat()
+        rows = [
+            (user, today, position, quest.model_dump_json())
+            for position, quest in enumerate(quests)
+        ]
+        with self._write(user_id) as conn:
+            conn.execute(DELETE_OLD_QUESTS, (user, today))
+            conn.executemany(INSERT_QUEST, rows)
+            stored = conn.execute(SELECT_QUESTS, (user, today)).fetchall()
+        return [DailyQuest.model_validate_json(payload) for (payload,) in stored]
+
+    def complete_quest(self, user_id: UUID, day: date, quest_id: UUID) -> None:
+        with self._write(user_id) as conn:
+            conn.execute(COMPLETE_QUEST, (str(user_id), day.isoformat(), str(quest_id)))
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+def _review_fields(anchor: GeoAnchorWithLocation) -> tuple[int, float | None, float, str]:
+    """The anchor's ``review_count, last_reviewed, strength, pin_color`` column values."""
+    reviewed = anchor.last_reviewed
+    return (
+        anchor.review_count,
+        None if reviewed is None else reviewed.timestamp(),
+        anchor.strength,
+        anchor.pin_color,
+    )
@@ -1,62 +1,181 @@
 from __future__ import annotations
 
+import functools
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
-from uuid import UUID, uuid4
+from typing import Any, Literal, cast
+from uuid import UUID, uuid4, uuid5
 
+import numpy as np
+
+from .config import get_settings
+from .constants import CLI_OVERLOAD_THRESHOLD, KCS_COVERAGE_TARGET, SRS_REDUNDANCY_THRESHOLD
+from .encoding import ANALYSIS_REPORT, EncodedCache
+from .engines.analysis import NoteAnalysis, analyze_batch, cognitive_load, seed_analysis
+from .engines.anchors import AnchorTable
+from .engines.bloom import BLOOM_LEVELS, distribution, dominant_level
+from .engines.changelog import (
+    CHANGE_KINDS,
+    ChangeLog,
+    decode_sync_cursor,
+    encode_sync_cursor,
+)
+from .engines.dag import DAGEngine, load_graph
+from .engines.decay import PIN_LEVELS, StrengthColumns
+from .engines.extraction import ConceptExtractor, catalog_trie
+from .engines.journey import estimate_minutes, plan_route, select_stops
+from .engines.kcs import KCSEngine, load_catalog
+from .engines.pipeline import AnalysisPipeline, AnalysisQueueFull, JobStatus
+from .engines.quests import ConceptSignals, plan_daily
+from .engines.regions import RegionClusterer
+from .engines.rollups import DashboardRollup
+from .engines.scheduler import ReviewScheduler
+from .engines.search import SearchIndex, document_text
+from .engines.sections import note_sections
+from .engines.spatial import GeoCellIndex
+from .engines.srs import SRSIndex, embed_texts
+from .engines.text import content_hash, normalize, note_text
+from .engines.tiles import ClusterPyramid
+from .engines.timeline import Timeline, decode_cursor, encode_cursor
+from .engines.zpd import SCAFFOLDING_LEVELS, ZPDEngine
+from .etag import strong_match
 from .schemas import (
     AnalysisReport,
+    BloomLevel,
     ConceptObject,
+    CreateAnchorRequest,
+    CreateNoteRequest,
     DailyQuest,
     DailyQuestPayload,
     FeedbackCard,
     GeoAnchorWithLocation,
     JourneyRoute,
+    KnowledgeRegion,
     LocationObject,
     MetacogDashboard,
     NoteObject,
+    QuestType,
+    ScaffoldingLevel,
+    SyncAnalysis,
+    SyncResponse,
 )
+from .storage.base import Repository
+from .storage.factory import open_repository
+
+DECAY_PUBLISH_TOLERANCE = 0.01
+DECAY_PASS_INTERVAL_SECONDS = 300.0
+HYDRATE_EMBED_CHUNK = 512
+HYDRATE_ANCHOR_CHUNK = 1000
+STORE_LOCK_STRIPES = 64
+QUEST_PLAN_INTERVAL_SECONDS = 600.0
+
+Resource = Literal["anchors", "routes", "dashboard", "quests"]
+
+
+@dataclass(slots=True)
+class ReviewOutcome:
+    anchor: GeoAnchorWithLocation
+    due_at: datetime
+    etag: str
+
+
+class VersionConflict(Exception):
+    """Raised when a write's expected version (an ``If-Match`` ETag) is stale."""
+
+
+class UnknownAnchors(LookupError):
+    """Raised by batch writes naming anchors that do not exist; nothing was applied."""
+
+    def __init__(self, anchor_ids: list[UUID]) -> None:
+        super().__init__(*anchor_ids)
+        self.anchor_ids = anchor_ids
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
-def seed_analysis() -> AnalysisReport:
-    return AnalysisReport(
-        srs_score=0.08,
-        kcs_score=0.72,
-        bloom_distribution={
-            "remember": 0.30,
-            "understand": 0.25,
-            "apply": 0.20,
-            "analyze": 0.15,
-            "evaluate": 0.07,
-            "create": 0.03,
-        },
-        cli_score=0.45,
-        dag_violations=["Linear Algebra", "Calculus II"],
-        uncovered_concepts=["Wave Function", "Quantum Entanglement", "Superposition"],
-        redundant_with=[],
-        feedback_cards=[
-            FeedbackCard(
-                type="gap_alert",
-                severity="warning",
-                message="3 concepts in Physics remain uncovered.",
-                action={"suggest": "Review Wave Function and Superposition"},
-            )
-        ],
-    )
+def _aware(moment: datetime) -> datetime:
+    """Treat naive client timestamps as UTC."""
+    return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
+
+
+def _locked[M: Callable[..., Any]](method: M) -> M:
+    """Run a store method under the store's stripe lock."""
+
+    @functools.wraps(method)
+    def wrapper(self: InMemoryStore, *args: Any, **kwargs: Any) -> Any:
+        with self.lock:
+            return method(self, *args, **kwargs)
+
+    return cast(M, wrapper)
 
 
 class InMemoryStore:
-    def __init__(self) -> None:
+    """One user's engines and indexes, held in memory over a durable ``Repository``.
+
+    Every mutation writes through to the repository; on creation the store
+    replays the repository's contents to rebuild its indexes. Public methods
+    run under ``lock``, which is shared with the other users on the same
+    stripe of the ``StoreRegistry``.
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        user_id: UUID,
+        pipeline: AnalysisPipeline,
+        lock: threading.RLock | None = None,
+    ) -> None:
+        self.repository = repository
+        self.user_id = user_id
+        self.pipeline = pipeline
+        self.lock = lock or threading.RLock()
+        self._pending_reports: list[tuple[UUID, AnalysisReport]] = []
+        self._pending_lock = threading.Lock()
         self.notes: dict[UUID, NoteObject] = {}
+        self.note_timeline = Timeline()
+        self.notes_by_subject: dict[str, Timeline] = {}
         self.analysis_by_note: dict[UUID, AnalysisReport] = {}
-        self.anchors: dict[UUID, GeoAnchorWithLocation] = {}
+        self.section_hashes: dict[UUID, dict[str, str]] = {}
+        self.text_hashes: dict[UUID, str] = {}
+        self.section_bloom: dict[UUID, dict[str, tuple[str, np.ndarray]]] = {}
+        self.embedded_hashes: dict[UUID, str] = {}
+        self.concept_inputs: dict[UUID, tuple[str, tuple[str, ...]]] = {}
+        self.srs = SRSIndex()
+        self.anchors = AnchorTable()
+        self.concept_bloom: dict[str, BloomLevel] = {}
+        self.anchor_index = GeoCellIndex()
+        self.regions = RegionClusterer()
+        self.tiles = ClusterPyramid()
+        self.scheduler = ReviewScheduler()
+        self.strengths = StrengthColumns()
+        self._decay_pass_at = 0.0
         self.route_id: UUID = uuid4()
-        self.quest_ids: list[UUID] = [uuid4(), uuid4(), uuid4()]
+        self.anchor_version = 0
+        self.version = 0
+        self._epoch = uuid4().hex[:12]
+        self._stamps: dict[Resource, int] = {}
+        self.changes = ChangeLog()
+        self.encoded = EncodedCache()
+        self._report_json: dict[UUID, tuple[AnalysisReport, bytes]] = {}
+        self._route_cache: tuple[tuple[int, date], JourneyRoute] | None = None
+        self.rollup = DashboardRollup()
+        self.search = SearchIndex()
+        self._quests: tuple[date, list[DailyQuest]] | None = None
 
-        self._seed_anchor()
+        settings = get_settings()
+        self.kcs = KCSEngine(load_catalog(settings.curriculum_path))
+        self.zpd = ZPDEngine(self.kcs)
+        self.extractor = ConceptExtractor(catalog_trie(self.kcs.catalog))
+        self.dag = DAGEngine(load_graph(settings.prerequisites_path))
+
+        self._hydrate()
+        if not self.anchors:
+            self._seed_anchor()
 
     def _seed_anchor(self) -> None:
         concept = ConceptObject(
@@ -87,134 +206,1095 @@ class InMemoryStore:
             review_count=4,
             last_reviewed=utc_now(),
         )
-        self.anchors[anchor.id] = anchor
+        self._put_anchors([anchor])
+        self.repository.save_anchor(self.user_id, anchor, self._srs_step(anchor.id))
 
-    def create_note(self, template_type: str, subject: str, content: dict) -> NoteObject:
-        note = NoteObject(
+    def _hydrate(self) -> None:
+        """Rebuild every in-memory index from the repository.
+
+        Embeddings, KCS coverage, prerequisite state and concept Bloom levels
+        are derived data and are recomputed here instead of being stored;
+        section scores are not, so a note's first edit after a restart
+        re-scores all of its sections.
+        """
+        self.repository.track(self.user_id)
+        notes = list(self.repository.load_notes(self.user_id))
+        reports = dict(self.repository.load_analyses(self.user_id))
+        for note in notes:
+            self._index_note(note)
+        stored = list(self.repository.load_anchors(self.user_id))
+        for start in range(0, len(stored), HYDRATE_ANCHOR_CHUNK):
+            chunk = stored[start : start + HYDRATE_ANCHOR_CHUNK]
+            self._put_anchors([anchor for anchor, _ in chunk], [step for _, step in chunk])
+        for anchor_id, reviewed_at, quality in list(self.repository.load_reviews(self.user_id)):
+            row = self.anchors.row.get(anchor_id)
+            if row is not None:
+                self.scheduler.restore_review(row, quality, reviewed_at)
+
+        analysed = [note for note in notes if note.id in reports]
+        for start in range(0, len(analysed), HYDRATE_EMBED_CHUNK):
+            chunk = analysed[start : start + HYDRATE_EMBED_CHUNK]
+            vectors = embed_texts([note_text(note.content) for note in chunk])
+            for note, vector in zip(chunk, vectors, strict=True):
+                self.srs.add(note.id, vector)
+                self.embedded_hashes[note.id] = self.text_hashes[note.id]
+        for note in analysed:
+            report = self.analysis_by_note[note.id] = reports[note.id]
+            self.concept_inputs[note.id] = (note.subject, tuple(note.extracted_concepts))
+            self.kcs.cover(note.extracted_concepts)
+            self.dag.observe(note.extracted_concepts)
+            self.zpd.observe_note(note.id, note.extracted_concepts, report.cli_score)
+            levels = report.bloom_distribution
+            self._apply_bloom_level(note, max(levels, key=levels.__getitem__))  # type: ignore[arg-type]
+        self.changes.record(self._touch("dashboard"), "analysis", [note.id for note in analysed])
+        self.rebuild_dashboard()
+
+        pending = [note for note in notes if note.id not in reports]
+        if pending:
+            self.pipeline.submit_many(
+                [(note.id, self._analysis_job(note)) for note in pending], self
+            )
+
+    def flush_analyses(self) -> None:
+        with self._pending_lock:
+            reports, self._pending_reports = self._pending_reports, []
+        self.repository.save_analyses(self.user_id, reports)
+
+    def _put_anchors(
+        self, anchors: list[GeoAnchorWithLocation], steps: list[int] | None = None
+    ) -> None:
+        """Index new anchors; every per-anchor engine appends in the same row order.
+
+        ``steps`` are the SRS steps to schedule at, defaulting to each anchor's
+        review count.
+        """
+        start, known_concepts = len(self.anchors), len(self.anchors.concepts)
+        rows = self.anchors.extend(anchors)
+        # First sighting of each id that was not indexed before, in row order.
+        _, first = np.unique(rows, return_index=True)
+        first = first[rows[first] >= start]
+        if not len(first):
+            return
+        fresh = [anchors[i] for i in first.tolist()]
+        rows = rows[first]
+        self.anchor_version += 1
+        self._touch_anchors(rows, "routes", "quests")
+        for concept in self.anchors.concepts[known_concepts:]:
+            if concept.key in self.concept_bloom:
+                concept.bloom_level = self.concept_bloom[concept.key]
+        self.zpd.add_concepts(self.anchors.concepts[known_concepts:])
+        for concept in self.anchors.concepts[known_concepts:]:
+            self.extractor.add(concept.name, concept.aliases)
+        latitudes = np.array([anchor.location.latitude for anchor in fresh])
+        longitudes = np.array([anchor.location.longitude for anchor in fresh])
+        strengths = np.array([anchor.strength for anchor in fresh])
+        reviewed_at = np.array(
+            [(anchor.last_reviewed or utc_now()).timestamp() for anchor in fresh]
+        )
+        pin_colors = [anchor.pin_color for anchor in fresh]
+        self.anchor_index.insert_many([anchor.id for anchor in fresh], latitudes, longitudes)
+        self.regions.add_many(
+            latitudes, longitudes, [self.anchors.concept_of(row).key for row in rows.tolist()]
+        )
+        self.tiles.add_many(rows, latitudes, longitudes, strengths, pin_colors)
+        self.scheduler.schedule_many(
+            rows,
+            reviewed_at,
+            np.array(
+                [anchor.review_count for anchor in fresh]
+                if steps is None
+                else [steps[i] for i in first.tolist()]
+            ),
+        )
+        self.strengths.extend(
+            strengths, reviewed_at, np.array([color == "personal" for color in pin_colors])
+        )
+
+    def _touch(self, *resources: Resource) -> int:
+        self.version += 1
+        for resource in resources:
+            self._stamps[resource] = self.version
+        return self.version
+
+    def _touch_anchors(self, rows: int | np.ndarray, *resources: Resource) -> None:
+        version = self._touch("anchors", *resources)
+        self.anchors.stamp[rows] = version
+        ids = self.anchors.ids
+        self.changes.record(version, "anchor", (ids[row] for row in np.atleast_1d(rows).tolist()))
+
+    @_locked
+    def etag(self, resource: Resource) -> str:
+        """Weak ETag for one of the user's collections, taken before reading it.
+
+        Tags carry a per-process epoch so counters restarting at zero never
+        collide with tags handed out before a restart; day-dependent payloads
+        also carry the date.
+        """
+        if resource == "anchors":
+            self.refresh_decay()
+        tag = f"{self._epoch}-{self._stamps.get(resource, 0)}"
+        if resource in ("dashboard", "routes", "quests"):
+            tag = f"{tag}-{utc_now().date().isoformat()}"
+        return f'W/"{tag}"'
+
+    @_locked
+    def anchor_etag(self, anchor_id: UUID) -> str:
+        row = self.anchors.row.get(anchor_id)
+        stamp = 0 if row is None else int(self.anchors.stamp[row])
+        return f'"{self._epoch}-{stamp}"'
+
+    def _pin_colors(self, rows: np.ndarray, levels: np.ndarray) -> list[str]:
+        fixed = self.strengths.fixed_pin[rows].tolist()
+        return [
+            "personal" if pinned else PIN_LEVELS[level]
+            for pinned, level in zip(fixed, levels.tolist(), strict=True)
+        ]
+
+    def _republish(self, rows: np.ndarray, strengths: np.ndarray, levels: np.ndarray) -> None:
+        """Push strength/pin changes beyond tolerance to the tiles and version stamps."""
+        columns = self.strengths
+        drifted = (np.abs(columns.published[rows] - strengths) > DECAY_PUBLISH_TOLERANCE) | (
+            columns.pins[rows] != levels
+        )
+        if not drifted.any():
+            return
+        rows, strengths, levels = rows[drifted], strengths[drifted], levels[drifted]
+        columns.published[rows] = strengths
+        columns.pins[rows] = levels
+        for row, strength, pin_color in zip(
+            rows.tolist(), strengths.tolist(), self._pin_colors(rows, levels), strict=True
+        ):
+            self.tiles.update(row, round(strength, 4), pin_color)
+        self._touch_anchors(rows)
+
+    def _read(self, rows: np.ndarray, now: float | None = None) -> list[GeoAnchorWithLocation]:
+        """Materialize ``rows`` with lazily decayed strength, republishing any drift."""
+        if not len(rows):
+            return []
+        now = utc_now().timestamp() if now is None else now
+        strengths, levels = self.strengths.current(rows, now)
+        self._republish(rows, strengths, levels)
+        return self.anchors.materialize(rows, strengths, self._pin_colors(rows, levels))
+
+    def _srs_step(self, anchor_id: UUID) -> int:
+        return self.scheduler.step(self.anchors.row[anchor_id])
+
+    def _rows(self, anchor_ids: list[UUID]) -> np.ndarray:
+        row = self.anchors.row
+        return np.fromiter((row[aid] for aid in anchor_ids if aid in row), dtype=np.int64)
+
+    @_locked
+    def tile(self, z: int, x: int, y: int) -> bytes:
+        """Encoded cluster tile after a decay pass; raises ``ValueError`` out of range."""
+        self.refresh_decay()
+        return self.tiles.tile(z, x, y)
+
+    @_locked
+    def refresh_decay(self, max_age_seconds: float = DECAY_PASS_INTERVAL_SECONDS) -> int:
+        """Batch decay/recolour pass over every anchor; returns how many were republished.
+
+        Skipped when the previous pass is younger than ``max_age_seconds``.
+        """
+        now = utc_now().timestamp()
+        if now - self._decay_pass_at < max_age_seconds:
+            return 0
+        self._decay_pass_at = now
+        rows, strengths, levels = self.strengths.stale(now, DECAY_PUBLISH_TOLERANCE)
+        self._republish(rows, strengths, levels)
+        return len(rows)
+
+    def _new_note(self, template_type: str, subject: str, content: dict) -> NoteObject:
+        return NoteObject(
             id=uuid4(),
             template_type=template_type,  # type: ignore[arg-type]
             subject=subject,
             content=content,
-            extracted_concepts=["Placeholder Concept A", "Placeholder Concept B"],
+            extracted_concepts=self.extractor.extract(note_text(content)),
             session_number=len(self.notes) + 1,
             created_at=utc_now(),
         )
-        self.notes[note.id] = note
-        self.analysis_by_note[note.id] = seed_analysis()
+
+    @_locked
+    def create_note(self, template_type: str, subject: str, content: dict) -> NoteObject:
+        """Store a note and queue its analysis; raises ``AnalysisQueueFull`` under backpressure."""
+        note = self._new_note(template_type, subject, content)
+        self._index_note(note)
+        try:
+            self.pipeline.submit(note.id, self._analysis_job(note), self)
+        except AnalysisQueueFull:
+            self._unindex_note(note)
+            raise
+        self.repository.save_note(self.user_id, note)
         return note
 
-    def list_notes(self, subject: str | None = None) -> list[NoteObject]:
-        notes = list(self.notes.values())
+    @_locked
+    def import_notes(self, requests: list[CreateNoteRequest]) -> int:
+        """Store a chunk of validated notes in one write and queue their analyses in bulk.
+
+        Unlike ``create_note`` this never fails under backpressure: jobs the
+        pipeline queue cannot take yet wait in its overflow.
+        """
+        notes = []
+        for request in requests:
+            note = self._new_note(request.template_type, request.subject, request.content)
+            self._index_note(note)
+            notes.append(note)
+        self.repository.save_notes(self.user_id, notes)
+        self.pipeline.submit_many([(note.id, self._analysis_job(note)) for note in notes], self)
+        return len(notes)
+
+    @_locked
+    def export_notes(self, offset: int, limit: int) -> list[NoteObject]:
+        """Oldest-first page of notes; offsets stay valid while notes are added."""
+        return [self.notes[note_id] for _, note_id in self.note_timeline.oldest(offset, limit)]
+
+    @_locked
+    def update_note(
+        self, note_id: UUID, content: dict[str, Any], subject: str | None = None
+    ) -> tuple[NoteObject, bool] | None:
+        """Merge ``content`` keys into a note and re-analyse only what changed.
+
+        Returns the updated note and whether a re-analysis was queued; raises
+        ``AnalysisQueueFull`` (leaving the note untouched) under backpressure.
+        """
+        note = self.notes.get(note_id)
+        if note is None:
+            return None
+        merged = {**note.content, **content}
+        updated = note.model_copy(
+            update={
+                "content": merged,
+                "subject": subject or note.subject,
+                "extracted_concepts": self.extractor.extract(note_text(merged)),
+            }
+        )
+        self._unindex_note(note)
+        self._index_note(updated)
+        job = self._analysis_job(updated)
+        queued = bool(
+            job["embed"] is not None or job["sections"] or updated.subject != note.subject
+        )
+        if queued:
+            try:
+                self.pipeline.submit(note_id, job, self)
+            except AnalysisQueueFull:
+                self._unindex_note(updated)
+                self._index_note(note)
+                raise
+        self.repository.save_note(self.user_id, updated)
+        return updated, queued
+
+    def _index_note(self, note: NoteObject) -> None:
+        self.changes.record(self._touch("dashboard"), "note", [note.id])
+        sections = note_sections(note.template_type, note.content)
+        self.notes[note.id] = note
+        self.section_hashes[note.id] = {name: content_hash(text) for name, text in sections.items()}
+        self.text_hashes[note.id] = content_hash(note_text(note.content))
+        self.note_timeline.add(note.created_at, note.id)
+        self.notes_by_subject.setdefault(note.subject, Timeline()).add(note.created_at, note.id)
+        self.search.add(note.id, document_text(note.content, note.extracted_concepts))
+
+    def _unindex_note(self, note: NoteObject) -> None:
+        self._touch("dashboard")
+        self.notes.pop(note.id, None)
+        self.section_hashes.pop(note.id, None)
+        self.text_hashes.pop(note.id, None)
+        self.search.remove(note.id, document_text(note.content, note.extracted_concepts))
+        self.note_timeline.remove(note.created_at, note.id)
+        subject_timeline = self.notes_by_subject.get(note.subject)
+        if subject_timeline is not None:
+            subject_timeline.remove(note.created_at, note.id)
+            if not len(subject_timeline):
+                del self.notes_by_subject[note.subject]
+
+    def _analysis_job(self, note: NoteObject) -> dict[str, Any]:
+        """Pool job covering only the stages whose input hashes differ from the last analysis."""
+        analyzed = self.section_bloom.get(note.id, {})
+        text_hash = self.text_hashes[note.id]
+        return {
+            "template_type": note.template_type,
+            "content": note.content,
+            "embed": None if self.embedded_hashes.get(note.id) == text_hash else text_hash,
+            "sections": {
+                name: digest
+                for name, digest in self.section_hashes[note.id].items()
+                if name not in analyzed or analyzed[name][0] != digest
+            },
+        }
+
+    @_locked
+    def complete_analysis(self, note_id: UUID, result: NoteAnalysis) -> None:
+        """Merge a (possibly partial) pool result into the note's report.
+
+        Results computed from content that has since been edited again are
+        dropped; the newer job re-requests those stages.
+        """
+        note = self.notes.get(note_id)
+        if note is None:
+            return
+        base = self.analysis_by_note.get(note_id) or seed_analysis()
+        updates: dict[str, Any] = {}
+        cards: list[FeedbackCard] = []
+        rerun: set[str] = set()
+
+        if result.embedding is not None and result.embedding[0] == self.text_hashes.get(note_id):
+            self.embedded_hashes[note_id] = result.embedding[0]
+            self._apply_srs(note_id, result.embedding[1], updates, cards)
+            rerun.add("redundancy_warning")
+
+        self._apply_sections(note, result, updates)
+
+        concept_inputs = (note.subject, tuple(note.extracted_concepts))
+        previous = self.concept_inputs.get(note_id)
+        if previous != concept_inputs:
+            if previous is not None:
+                # Withdraw the concepts the note covered before this edit.
+                self.kcs.uncover(previous[1])
+                self.dag.forget(previous[1])
+            self.concept_inputs[note_id] = concept_inputs
+            self._apply_kcs(note, updates, cards)
+            self.dag.observe(note.extracted_concepts)
+            self.zpd.invalidate()
+            updates["dag_violations"] = self.dag.missing_prerequisites(note.extracted_concepts)
+            rerun.add("gap_alert")
+
+        cli_score = self._apply_cli(note, base, updates, cards)
+        rerun.add("cognitive_overload")
+        self.zpd.observe_note(note_id, note.extracted_concepts, cli_score)
+        cards.extend(self._growth_cards(note))
+        rerun.add("growth_ready")
+
+        kept = [card for card in base.feedback_cards if card.type not in rerun]
+        updates["feedback_cards"] = kept + cards
+        report = self.analysis_by_note[note_id] = base.model_copy(update=updates)
+        self.changes.record(self._touch("dashboard"), "analysis", [note_id])
+        with self._pending_lock:
+            self._pending_reports.append((note_id, report))
+        self.rollup.observe_note(
+            note_id, note.created_at.date(), report.bloom_distribution, report.cli_score
+        )
+        self.rollup.record_activity(note.created_at.date())
+
+    def _apply_srs(
+        self,
+        note_id: UUID,
+        embedding: np.ndarray,
+        updates: dict[str, Any],
+        cards: list[FeedbackCard],
+    ) -> None:
+        hits = self.srs.query(embedding, min_similarity=0.0, exclude=note_id)
+        redundant = [hit_id for hit_id, sim in hits if 1.0 - sim <= SRS_REDUNDANCY_THRESHOLD]
+        self.srs.add(note_id, embedding)
+
+        updates["srs_score"] = round(hits[0][1], 4) if hits else 0.0
+        updates["redundant_with"] = redundant
+        if redundant:
+            cards.append(
+                FeedbackCard(
+                    type="redundancy_warning",
+                    severity="info",
+                    message=f"This note overlaps {len(redundant)} earlier note(s).",
+                    action={"note_ids": [str(hit_id) for hit_id in redundant]},
+                )
+            )
+
+    def _apply_sections(
+        self, note: NoteObject, result: NoteAnalysis, updates: dict[str, Any]
+    ) -> None:
+        current = self.section_hashes.get(note.id, {})
+        analyzed = self.section_bloom.setdefault(note.id, {})
+        changed = False
+        for name, (digest, scores) in result.section_scores.items():
+            if current.get(name) == digest:
+                analyzed[name] = (digest, scores)
+                changed = True
+        for name in [name for name in analyzed if name not in current]:
+            del analyzed[name]
+            changed = True
+        if not changed:
+            return
+
+        total = sum((scores for _, scores in analyzed.values()), np.zeros(len(BLOOM_LEVELS)))
+        updates["bloom_distribution"] = distribution(total)
+        self._apply_bloom_level(note, dominant_level(total))  # type: ignore[arg-type]
+
+    def _apply_cli(
+        self,
+        note: NoteObject,
+        base: AnalysisReport,
+        updates: dict[str, Any],
+        cards: list[FeedbackCard],
+    ) -> float:
+        bloom = updates.get("bloom_distribution", base.bloom_distribution)
+        sections = note_sections(note.template_type, note.content)
+        score = updates["cli_score"] = cognitive_load(sections, len(note.extracted_concepts), bloom)
+        if score > CLI_OVERLOAD_THRESHOLD:
+            cards.append(
+                FeedbackCard(
+                    type="cognitive_overload",
+                    severity="warning",
+                    message=f"This note's cognitive load is {score:.0%}.",
+                    action={"suggest": "Split it into smaller notes"},
+                )
+            )
+        return score
+
+    def _apply_kcs(
+        self, note: NoteObject, updates: dict[str, Any], cards: list[FeedbackCard]
+    ) -> None:
+        touched = self.kcs.cover(note.extracted_concepts)
+        subject = note.subject if self.kcs.catalog.get(note.subject) else None
+        if subject is None and touched:
+            subject = self.kcs.catalog.subjects[min(touched)].subject
+        if subject is None:
+            updates["kcs_score"] = 0.0
+            updates["uncovered_concepts"] = []
+            return
+
+        score = self.kcs.coverage(subject)
+        uncovered = self.kcs.uncovered(subject, limit=5)
+        updates["kcs_score"] = round(score, 4)
+        updates["uncovered_concepts"] = uncovered
+        if score < KCS_COVERAGE_TARGET:
+            cards.append(
+                FeedbackCard(
+                    type="gap_alert",
+                    severity="warning",
+                    message=(
+                        f"{self.kcs.gap_count(subject)} concepts in {subject} remain uncovered."
+                    ),
+                    action={"suggest": f"Review {' and '.join(uncovered[:2])}"},
+                )
+            )
+
+    def _apply_bloom_level(self, note: NoteObject, level: BloomLevel) -> None:
+        concepts = self.anchors.concepts
+        for name in note.extracted_concepts:
+            concept_key = normalize(name)
+            self.concept_bloom[concept_key] = level
+            changed = [
+                row
+                for row in self.anchors.concepts_by_key.get(concept_key, ())
+                if concepts[row].bloom_level != level
+            ]
+            if changed:
+                for row in changed:
+                    concepts[row].bloom_level = level
+                    self.zpd.set_level(row, level)
+                self.anchor_version += 1
+                self._touch_anchors(self.anchors.rows_with_concepts(changed), "routes", "quests")
+
+    def _growth_cards(self, note: NoteObject) -> list[FeedbackCard]:
+        rows = self.zpd.rows_for(note.extracted_concepts)
+        if len(rows):
+            rows = self.zpd.growth_ready(rows)
+        if not len(rows):
+            return []
+        concepts = [self.anchors.concepts[row] for row in rows.tolist()]
+        return [
+            FeedbackCard(
+                type="growth_ready",
+                severity="info",
+                message=f"{len(concepts)} concept(s) are ready for the next Bloom level.",
+                action={"concept_ids": [str(concept.id) for concept in concepts]},
+            )
+        ]
+
+    @_locked
+    def analysis_status(self, note_id: UUID) -> JobStatus | None:
+        """``pending`` while a (re-)analysis is in flight, even if an older report exists."""
+        state = self.pipeline.status(note_id)
+        if state != "pending" and note_id in self.analysis_by_note:
+            return "ready"
+        return state
+
+    @_locked
+    def get_note(self, note_id: UUID) -> NoteObject | None:
+        return self.notes.get(note_id)
+
+    def has_note(self, note_id: UUID) -> bool:
+        return note_id in self.notes
+
+    def _timeline(self, subject: str | None) -> Timeline:
         if subject:
-            notes = [n for n in notes if n.subject == subject]
-        return sorted(notes, key=lambda x: x.created_at, reverse=True)
+            return self.notes_by_subject.get(subject) or Timeline()
+        return self.note_timeline
+
+    @_locked
+    def list_notes(
+        self,
+        subject: str | None = None,
+        offset: int = 0,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[NoteObject], int, str | None]:
+        """Newest-first page by offset, or keyset page older than ``cursor``.
 
-    def get_analysis(self, note_id: UUID) -> AnalysisReport:
-        return self.analysis_by_note.get(note_id, seed_analysis())
+        Raises ``ValueError`` for a malformed cursor.
+        """
+        timeline = self._timeline(subject)
+        if cursor is None:
+            keys = timeline.newest(offset, limit + 1)
+        else:
+            keys = timeline.older_than(decode_cursor(cursor), limit + 1)
+        next_cursor = encode_cursor(keys[limit - 1]) if len(keys) > limit else None
+        return [self.notes[note_id] for _, note_id in keys[:limit]], len(timeline), next_cursor
 
+    @_locked
+    def search_notes(
+        self, query: str, limit: int = 20
+    ) -> tuple[list[tuple[NoteObject, float]], int]:
+        """Best ``limit`` notes for ``query`` by BM25 with their scores, and the match count."""
+        hits, total = self.search.search(query, limit)
+        return [(self.notes[note_id], score) for note_id, score in hits], total
+
+    @_locked
+    def get_analysis(self, note_id: UUID) -> AnalysisReport | None:
+        return self.analysis_by_note.get(note_id)
+
+    @_locked
+    def analysis_json(self, note_id: UUID) -> bytes | None:
+        """The note's report as JSON, re-encoded only after the report is replaced.
+
+        ``None`` while the note is being (re-)analysed, so an edit never
+        serves the report of the content it replaced.
+        """
+        report = self.analysis_by_note.get(note_id)
+        if report is None or self.pipeline.status(note_id) == "pending":
+            return None
+        cached = self._report_json.get(note_id)
+        if cached is None or cached[0] is not report:
+            cached = self._report_json[note_id] = (report, ANALYSIS_REPORT.dump_json(report))
+        return cached[1]
+
+    @_locked
     def list_anchors(self) -> list[GeoAnchorWithLocation]:
-        return list(self.anchors.values())
+        return self._read(np.arange(len(self.anchors)))
 
-    def create_personal_anchor(self, concept_id: UUID, latitude: float, longitude: float, name: str) -> GeoAnchorWithLocation:
-        concept = ConceptObject(
-            id=concept_id,
-            name="Personal Concept",
-            domain="general",
-            bloom_level="understand",
+    @_locked
+    def get_anchor(self, anchor_id: UUID) -> GeoAnchorWithLocation | None:
+        anchors = self._read(self._rows([anchor_id]))
+        return anchors[0] if anchors else None
+
+    @_locked
+    def get_anchor_tagged(self, anchor_id: UUID) -> tuple[GeoAnchorWithLocation, str] | None:
+        """The anchor and its ETag, read after any lazy decay the read republished."""
+        anchor = self.get_anchor(anchor_id)
+        return None if anchor is None else (anchor, self.anchor_etag(anchor_id))
+
+    @_locked
+    def anchors_by_ids(self, anchor_ids: list[UUID]) -> list[GeoAnchorWithLocation]:
+        return self._read(self._rows(anchor_ids))
+
+    @_locked
+    def anchors_in_bbox(
+        self, west: float, south: float, east: float, north: float
+    ) -> list[GeoAnchorWithLocation]:
+        return self.anchors_by_ids(self.anchor_index.query_bbox(west, south, east, north))
+
+    @_locked
+    def anchors_near(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> list[GeoAnchorWithLocation]:
+        hits = self.anchor_index.query_radius(latitude, longitude, radius_km)
+        return self.anchors_by_ids([aid for aid, _ in hits])
+
+    def _personal_anchors(
+        self, places: list[tuple[UUID, float, float, str]]
+    ) -> list[GeoAnchorWithLocation]:
+        """Create and index one personal anchor per ``(concept_id, lat, lon, name)``.
+
+        Anchors at the same named place share one location, whether it was
+        interned earlier or first appears in this batch.
+        """
+        now = utc_now()
+        location_ids: dict[tuple[str, float, float, str], UUID] = {}
+        anchors = []
+        for concept_id, latitude, longitude, name in places:
+            place = (name, latitude, longitude, "personal")
+            location_id = location_ids.get(place) or self.anchors.find_place(*place) or uuid4()
+            location_ids[place] = location_id
+            concept = ConceptObject(
+                id=concept_id,
+                name="Personal Concept",
+                domain="general",
+                bloom_level="understand",
+            )
+            location = LocationObject(
+                id=location_id,
+                name=name,
+                latitude=latitude,
+                longitude=longitude,
+                type="personal",
+                metadata={},
+            )
+            anchors.append(
+                GeoAnchorWithLocation(
+                    id=uuid4(),
+                    concept=concept,
+                    location=location,
+                    anchor_strategy="personal",
+                    strength=1.0,
+                    pin_color="personal",
+                    review_count=0,
+                    last_reviewed=now,
+                )
+            )
+        self._put_anchors(anchors)
+        return anchors
+
+    @_locked
+    def create_personal_anchor(
+        self, concept_id: UUID, latitude: float, longitude: float, name: str
+    ) -> GeoAnchorWithLocation:
+        (anchor,) = self._personal_anchors([(concept_id, latitude, longitude, name)])
+        self.repository.save_anchor(self.user_id, anchor, self._srs_step(anchor.id))
+        return self._read(self._rows([anchor.id]))[0]
+
+    @_locked
+    def import_anchors(self, requests: list[CreateAnchorRequest]) -> int:
+        """Create a chunk of personal anchors and persist them in one write."""
+        anchors = self._personal_anchors(
+            [
+                (
+                    request.concept_id,
+                    request.location.latitude,
+                    request.location.longitude,
+                    request.location.name,
+                )
+                for request in requests
+            ]
         )
-        location = LocationObject(
-            id=uuid4(),
-            name=name,
-            latitude=latitude,
-            longitude=longitude,
-            type="personal",
-            metadata={},
+        self.repository.save_anchors(
+            self.user_id, [(anchor, self._srs_step(anchor.id)) for anchor in anchors]
         )
-        anchor = GeoAnchorWithLocation(
-            id=uuid4(),
-            concept=concept,
-            location=location,
-            anchor_strategy="personal",
-            strength=1.0,
-            pin_color="personal",
-            review_count=0,
-            last_reviewed=utc_now(),
+        return len(anchors)
+
+    @_locked
+    def export_anchors(self, offset: int, limit: int) -> list[GeoAnchorWithLocation]:
+        """Anchors in creation order with current strength; rows are never reused."""
+        return self._read(np.arange(offset, min(offset + limit, len(self.anchors))))
+
+    @_locked
+    def review_anchor(
+        self, anchor_id: UUID, recall_quality: int, if_match: str | None = None
+    ) -> ReviewOutcome | None:
+        """Apply a review; returns an anchor snapshot, its next due time and new ETag.
+
+        Raises ``VersionConflict`` if ``if_match`` is given and does not match
+        the anchor's current ETag.
+        """
+        row = self.anchors.row.get(anchor_id)
+        if row is None:
+            return None
+        if if_match is not None and not strong_match(if_match, self.anchor_etag(anchor_id)):
+            raise VersionConflict(anchor_id)
+
+        now = utc_now()
+        anchor, due_at = self._review(row, recall_quality, now)
+        self.repository.record_review(
+            self.user_id, anchor, self.scheduler.step(row), recall_quality, now
+        )
+        self._touch_anchors(row, "dashboard")
+        return ReviewOutcome(anchor, due_at, self.anchor_etag(anchor_id))
+
+    @_locked
+    def review_anchors(self, reviews: list[tuple[UUID, int, datetime]]) -> list[ReviewOutcome]:
+        """Apply queued ``(anchor_id, quality, reviewed_at)`` reviews atomically, oldest first.
+
+        Raises ``UnknownAnchors`` before applying anything if any id is
+        unknown. Times in the future count as now, and a review older than
+        the anchor's last one counts as happening just after it, so replaying
+        a stale queue never moves an anchor's review clock backwards.
+        Outcomes come back in the order the reviews were applied.
+        """
+        missing = [anchor_id for anchor_id, _, _ in reviews if anchor_id not in self.anchors]
+        if missing:
+            raise UnknownAnchors(missing)
+
+        now = utc_now()
+        queued = sorted(
+            (
+                (min(_aware(reviewed_at), now), anchor_id, quality)
+                for anchor_id, quality, reviewed_at in reviews
+            ),
+            key=lambda review: review[0],
         )
-        self.anchors[anchor.id] = anchor
-        return anchor
+        applied = []
+        outcomes = []
+        for reviewed_at, anchor_id, quality in queued:
+            row = self.anchors.row[anchor_id]
+            last = float(self.anchors.last_reviewed[row])
+            if not np.isnan(last):
+                reviewed_at = max(reviewed_at, datetime.fromtimestamp(last, tz=UTC))
+            anchor, due_at = self._review(row, quality, reviewed_at)
+            applied.append((anchor, self.scheduler.step(row), quality, reviewed_at))
+            outcomes.append((anchor, due_at))
+        self.repository.record_reviews(self.user_id, applied)
+        self._touch_anchors(self._rows([anchor_id for _, anchor_id, _ in queued]), "dashboard")
+        return [
+            ReviewOutcome(anchor, due_at, self.anchor_etag(anchor.id))
+            for anchor, due_at in outcomes
+        ]
+
+    def _review(
+        self, row: int, recall_quality: int, reviewed_at: datetime
+    ) -> tuple[GeoAnchorWithLocation, datetime]:
+        """Apply one review to the in-memory engines; returns the snapshot and next due time."""
+        timestamp = reviewed_at.timestamp()
+        rows = np.array([row])
+        current, _ = self.strengths.current(rows, timestamp)
+        strength = min(1.0, max(0.2, round(float(current[0]), 4) + (recall_quality - 3) * 0.03))
+        self.anchors.review_count[row] += 1
+        self.anchors.last_reviewed[row] = timestamp
+        self.strengths.upsert(
+            row, strength, timestamp, fixed_pin=bool(self.strengths.fixed_pin[row])
+        )
+        anchor = self._read(rows, timestamp)[0]
+        self.tiles.update(row, anchor.strength, anchor.pin_color)
+        due_at = self.scheduler.record(row, recall_quality, reviewed_at)
+        self.rollup.record_activity(reviewed_at.date())
+        return anchor, due_at
+
+    @_locked
+    def review_history(self, anchor_id: UUID) -> list[tuple[datetime, int]]:
+        row = self.anchors.row.get(anchor_id)
+        return [] if row is None else self.scheduler.history(row)
+
+    @_locked
+    def due_anchors(self, limit: int) -> list[tuple[GeoAnchorWithLocation, datetime]]:
+        due = self.scheduler.next_due(limit)
+        anchors = self._read(np.array([row for row, _ in due], dtype=np.int64))
+        return list(zip(anchors, [due_at for _, due_at in due], strict=True))
 
     def route(self) -> JourneyRoute:
-        stop_ids = [a.id for a in self.anchors.values()]
-        return JourneyRoute(
+        """Distance-optimised journey over the ``ROUTE_STOPS`` weakest anchors.
+
+        Cached per anchor version and day. Stops are copied out under the lock
+        and the tour is planned outside it, so a cache miss does not stall the
+        user's other requests.
+        """
+        now = utc_now()
+        with self.lock:
+            key = (self.anchor_version, now.date())
+            cached = self._route_cache
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            table = self.anchors
+            strengths, _ = self.strengths.current(np.arange(len(table)), now.timestamp())
+            rows = select_stops(strengths)
+            latitudes, longitudes = table.latitude[rows], table.longitude[rows]
+            concepts = [table.concept_of(row) for row in rows.tolist()]
+            ids = [table.ids[row] for row in rows.tolist()]
+            group_keys = [
+                (BLOOM_LEVELS.index(c.bloom_level), self.dag.graph.depth_of(c.name))
+                for c in concepts
+            ]
+            levels = [c.bloom_level for c in concepts]
+
+        order, distance_km = plan_route(latitudes, longitudes, group_keys)
+        route = JourneyRoute(
             id=self.route_id,
-            estimated_minutes=45,
-            bloom_progression=["remember", "understand", "apply"],
-            stops=stop_ids,
+            estimated_minutes=estimate_minutes(len(order), distance_km),
+            bloom_progression=list(dict.fromkeys(levels[i] for i in order)),
+            stops=[ids[i] for i in order],
         )
+        with self.lock:
+            if self.anchor_version == key[0]:
+                self._route_cache = (key, route)
+        return route
+
+    def _quest_signals(self, strengths: np.ndarray) -> ConceptSignals:
+        """Per-concept inputs for ``plan_daily``, aligned with ``self.anchors.concepts``."""
+        table = self.anchors
+        n, k = len(table), len(table.concepts)
+        concept_rows = table.concept[:n]
+        counts = np.maximum(np.bincount(concept_rows, minlength=k), 1)
+        return ConceptSignals(
+            level=self.zpd.level[:k].copy(),
+            readiness=self.zpd.readiness(),
+            strength=np.bincount(concept_rows, weights=strengths, minlength=k) / counts,
+            reviews=np.bincount(concept_rows, weights=table.review_count[:n], minlength=k),
+        )
+
+    def _plan_quests(self, day: date) -> list[DailyQuest]:
+        table = self.anchors
+        n = len(table)
+        concept_rows = table.concept[:n]
+        strengths, _ = self.strengths.current(np.arange(n), utc_now().timestamp())
+        # Each concept's quest is set at its weakest anchor.
+        order = np.lexsort((strengths, concept_rows))
+        first = order[np.flatnonzero(np.diff(concept_rows[order], prepend=-1))]
+        weakest = np.zeros(len(table.concepts), dtype=np.int64)
+        weakest[concept_rows[first]] = first
+        quests = []
+        for position, pick in enumerate(plan_daily(self._quest_signals(strengths))):
+            quest = DailyQuest(
+                id=uuid5(self.user_id, f"{day.isoformat()}/{position}"),
+                type=cast(QuestType, pick.type),
+            )
+            if pick.concept is not None and pick.bloom_target is not None:
+                quest.concept_id = table.concepts[pick.concept].id
+                quest.location_id = table.location_of(int(weakest[pick.concept])).id
+                quest.bloom_target = cast(BloomLevel, BLOOM_LEVELS[pick.bloom_target])
+            quests.append(quest)
+        return quests
+
+    @_locked
+    def plan_quests(self, day: date) -> list[DailyQuest]:
+        """``day``'s quests, planned and persisted on first request and fixed for the day.
+
+        A store rebuilt mid-day reloads the persisted plan, completion
+        included, rather than re-planning.
+        """
+        cached = self._quests
+        if cached is not None and cached[0] == day:
+            return cached[1]
+        quests = self.repository.load_quests(self.user_id, day)
+        if not quests:
+            # Another process may have stored its plan first; keep whichever won.
+            quests = self.repository.save_quests(self.user_id, day, self._plan_quests(day))
+        self._quests = (day, quests)
+        self._touch("quests")
+        return quests
 
     def daily_quests(self) -> DailyQuestPayload:
-        anchor_ids = list(self.anchors.values())
-        concept_id = anchor_ids[0].concept.id if anchor_ids else None
-        location_id = anchor_ids[0].location.id if anchor_ids else None
-        quests = [
-            DailyQuest(
-                id=self.quest_ids[0],
-                type="gap_review",
-                concept_id=concept_id,
-                location_id=location_id,
-                bloom_target="understand",
-                completed=False,
-            ),
-            DailyQuest(
-                id=self.quest_ids[1],
-                type="bloom_push",
-                concept_id=concept_id,
-                location_id=location_id,
-                bloom_target="analyze",
-                completed=False,
-            ),
-            DailyQuest(
-                id=self.quest_ids[2],
-                type="new_explore",
-                concept_id=concept_id,
-                location_id=location_id,
-                bloom_target="apply",
-                completed=False,
-            ),
-        ]
+        route = self.route()
+        today = utc_now().date()
         return DailyQuestPayload(
-            date=date.today(),
+            date=today, quests=list(self.plan_quests(today)), journey_route=route
+        )
+
+    @_locked
+    def complete_quest(self, quest_id: UUID) -> DailyQuest | None:
+        """Mark one of today's quests completed and persist it; ``None`` if it is not today's."""
+        today = utc_now().date()
+        quests = self.plan_quests(today)
+        position = next((i for i, quest in enumerate(quests) if quest.id == quest_id), None)
+        if position is None:
+            return None
+        if not quests[position].completed:
+            quests = list(quests)
+            quests[position] = quests[position].model_copy(update={"completed": True})
+            self.repository.complete_quest(self.user_id, today, quest_id)
+            self._quests = (today, quests)
+            self._touch("quests")
+        return quests[position]
+
+    @_locked
+    def scaffolding(self, concept_id: UUID) -> ScaffoldingLevel | None:
+        """Scaffolding the learner's state calls for on a concept; ``None`` if not on the globe."""
+        row = self.anchors.concept_row(concept_id)
+        return None if row is None else self.zpd.scaffolding(row)
+
+    @_locked
+    def scaffolding_suggestions(self, limit: int) -> list[tuple[UUID, ScaffoldingLevel]]:
+        """Concepts that need more than a hint, most severe and least ready first."""
+        rows, levels = self.zpd.proactive(limit)
+        concepts = self.anchors.concepts
+        return [
+            (concepts[row].id, SCAFFOLDING_LEVELS[level])
+            for row, level in zip(rows.tolist(), levels.tolist(), strict=True)
+        ]
+
+    @_locked
+    def sync(self, cursor: str | None, limit: int) -> SyncResponse:
+        """Everything that changed since ``cursor``, in pages of about ``limit`` changes.
+
+        With no cursor, or one issued before this store was rebuilt (its
+        version counter restarted), the whole change log is replayed with
+        ``reset`` set so the client drops its copy first. Quests ride on the
+        last page when they changed or the day rolled over. Raises
+        ``ValueError`` for a malformed cursor.
+        """
+        today = utc_now().date()
+        since, day, reset = 0, date.min, True
+        if cursor is not None:
+            epoch, version, day = decode_sync_cursor(cursor)
+            reset = epoch != self._epoch or version > self.version
+            since, day = (0, date.min) if reset else (version, day)
+        self.refresh_decay()
+        changes, through = self.changes.since(since, limit)
+        changed: dict[str, list[UUID]] = {kind: [] for kind in CHANGE_KINDS}
+        for kind, key in changes:
+            changed[kind].append(key)
+        anchors = self._read(self._rows(changed["anchor"]))
+        quests_due = day != today or self._stamps.get("quests", 0) > since
+        # Planning the day's quests bumps the version, so do it before taking the cursor.
+        quests = self.daily_quests() if through is None and quests_due else None
+        if through is None:
+            next_cursor = encode_sync_cursor(self._epoch, self.version, today)
+        else:
+            # Later pages start past the quest change, so keep quests due in the cursor.
+            next_cursor = encode_sync_cursor(self._epoch, through, date.min if quests_due else day)
+        return SyncResponse(
+            cursor=next_cursor,
+            reset=reset,
+            has_more=through is not None,
+            anchors=anchors,
+            notes=[self.notes[note_id] for note_id in changed["note"] if note_id in self.notes],
+            analyses=[
+                SyncAnalysis(note_id=note_id, analysis=self.analysis_by_note[note_id])
+                for note_id in changed["analysis"]
+                if note_id in self.analysis_by_note
+            ],
             quests=quests,
-            journey_route=self.route(),
         )
 
+    @_locked
     def dashboard(self) -> MetacogDashboard:
+        today = utc_now().date()
+        kcs_rows = self.kcs.by_subject([*self.notes_by_subject, *self.kcs.touched_subjects()])
+        coverage = (
+            sum(float(row["coverage_pct"]) for row in kcs_rows) / len(kcs_rows) if kcs_rows else 0.0
+        )
         return MetacogDashboard(
-            bloom_distribution={
-                "remember": 0.25,
-                "understand": 0.22,
-                "apply": 0.20,
-                "analyze": 0.18,
-                "evaluate": 0.10,
-                "create": 0.05,
-            },
-            kcs_by_subject=[
-                {"subject": "Physics", "coverage_pct": 0.72, "gap_count": 5},
-                {"subject": "Biology", "coverage_pct": 0.95, "gap_count": 1},
-            ],
-            cli_trend=[
-                {"week": "W1", "avg_cli": 0.35},
-                {"week": "W2", "avg_cli": 0.42},
-                {"week": "W3", "avg_cli": 0.48},
-            ],
-            evolution_index=0.68,
-            streak=7,
+            bloom_distribution=self.rollup.bloom_distribution(),
+            kcs_by_subject=kcs_rows,
+            cli_trend=self.rollup.cli_trend(today),
+            evolution_index=round(0.5 * self.rollup.bloom_depth() + 0.5 * coverage, 4),
+            streak=self.rollup.streak(today),
         )
 
-    def next_review_at(self, recall_quality: int) -> datetime:
-        spacing_days = {1: 1, 2: 1, 3: 3, 4: 7, 5: 14}.get(recall_quality, 1)
-        return utc_now() + timedelta(days=spacing_days)
+    @_locked
+    def knowledge_regions(self) -> list[KnowledgeRegion]:
+        summaries, labels = self.regions.regions()
+        if not summaries:
+            return []
+        # Region rows line up with strength slots: both are appended in _put_anchors.
+        clustered = labels >= 0
+        rows = np.flatnonzero(clustered)
+        strengths, _ = self.strengths.current(rows, utc_now().timestamp())
+        totals = np.bincount(labels[clustered], weights=strengths, minlength=len(summaries))
+        return [
+            KnowledgeRegion(
+                latitude=region.latitude,
+                longitude=region.longitude,
+                radius=region.radius_km,
+                coverage_pct=round(float(total) / region.size, 4),
+                concept_count=region.concept_count,
+            )
+            for region, total in zip(summaries, totals, strict=True)
+        ]
+
+    @_locked
+    def rebuild_dashboard(self) -> None:
+        """Recompute the dashboard rollups from stored notes, analyses and reviews."""
+        self._touch("dashboard")
+        self.rollup.reset()
+        active_days = set()
+        for note_id, report in self.analysis_by_note.items():
+            note = self.notes.get(note_id)
+            if note is None:
+                continue
+            self.rollup.observe_note(
+                note_id, note.created_at.date(), report.bloom_distribution, report.cli_score
+            )
+            active_days.add(note.created_at.date())
+        active_days.update(
+            datetime.fromtimestamp(ts, tz=UTC).date() for ts in self.scheduler.review_timestamps()
+        )
+        for day in sorted(active_days):
+            self.rollup.record_activity(day)
+
+
+class StoreRegistry:
+    """Per-user stores partitioned across ``stripes`` shards.
+
+    Each shard has one re-entrant lock that guards both shard membership and
+    every store in it, so requests from users on different stripes never
+    contend while writes to the same user are serialized. Stores are built and
+    hydrated from the repository on first use, and rebuilt on access once the
+    repository reports that another process wrote to their user; all of them
+    share one analysis pipeline. A background thread, started with the first
+    store, plans each loaded user's daily quests every ``quest_plan_interval``
+    seconds and just after midnight UTC, so the first read of the day finds
+    them ready.
+    """
 
+    def __init__(
+        self,
+        repository: Repository,
+        pipeline: AnalysisPipeline,
+        stripes: int = STORE_LOCK_STRIPES,
+        quest_plan_interval: float = QUEST_PLAN_INTERVAL_SECONDS,
+    ) -> None:
+        self.repository = repository
+        self.pipeline = pipeline
+        self.quest_plan_interval = quest_plan_interval
+        self._locks = [threading.RLock() for _ in range(max(1, stripes))]
+        self._shards: list[dict[UUID, InMemoryStore]] = [{} for _ in self._locks]
+        self._planner: threading.Thread | None = None
+        self._planner_lock = threading.Lock()
+
+    def _start_planner(self) -> None:
+        with self._planner_lock:
+            if self._planner is None:
+                self._planner = threading.Thread(
+                    target=self._plan_forever, name="quest-planner", daemon=True
+                )
+                self._planner.start()
+
+    def _plan_forever(self) -> None:
+        while True:
+            now = utc_now()
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), UTC)
+            time.sleep(min(self.quest_plan_interval, (midnight - now).total_seconds() + 1.0))
+            self.plan_quests(utc_now().date())
+
+    def plan_quests(self, day: date) -> int:
+        """Plan ``day``'s quests for every loaded store; returns how many stores were planned.
+
+        Stores that are already planned for ``day`` return immediately. A
+        store that fails is skipped and retried on the next pass.
+        """
+        planned = 0
+        for lock, shard in zip(self._locks, self._shards, strict=True):
+            with lock:
+                loaded = list(shard.values())
+            for store in loaded:
+                try:
+                    store.plan_quests(day)
+                except Exception:
+                    continue
+                planned += 1
+        return planned
+
+    def _current(self, user_id: UUID, store: InMemoryStore | None) -> bool:
+        return store is not None and not self.repository.changed_elsewhere(user_id)
+
+    def get(self, user_id: UUID) -> InMemoryStore:
+        """The user's store, rebuilt if another process wrote to the user since it loaded."""
+        stripe = user_id.int % len(self._locks)
+        shard = self._shards[stripe]
+        store = shard.get(user_id)
+        if not self._current(user_id, store):
+            with self._locks[stripe]:
+                store = shard.get(user_id)
+                if not self._current(user_id, store):
+                    store = InMemoryStore(
+                        self.repository, user_id, self.pipeline, self._locks[stripe]
+                    )
+                    shard[user_id] = store
+            if self._planner is None:
+                self._start_planner()
+        return store
+
+
+def _build_registry() -> StoreRegistry:
+    settings = get_settings()
+    pipeline = AnalysisPipeline(
+        batch_fn=analyze_batch,
+        workers=settings.analysis_workers,
+        queue_size=settings.analysis_queue_size,
+        batch_size=settings.analysis_batch_size,
+        executor=settings.analysis_executor,
+    )
+    return StoreRegistry(
+        open_repository(settings),
+        pipeline,
+        quest_plan_interval=settings.quest_plan_interval_seconds,
+    )
 
-store = InMemoryStore()
 
+stores = _build_registry()
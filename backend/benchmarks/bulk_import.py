@@ -0,0 +1,133 @@
+"""Bulk NDJSON import: request time, and for notes the time until all are analysed.
+
+Run from ``backend/``, in memory or against a scratch SQLite file::
+
+    MEMOGLOBE_STORAGE_BACKEND=memory python -m benchmarks.bulk_import --notes 10000
+    MEMOGLOBE_SQLITE_PATH=/tmp/bench.db python -m benchmarks.bulk_import \\
+        --notes 100000 --anchors 100000
+
+Notes are templated (same subject, near-identical text), the worst case for
+redundancy scoring because every note collides with the history in LSH.
+Anchors are personal pins spread over a few thousand concepts and places.
+Each kind is imported in ``--rounds`` equal batches into the same user so a
+per-item cost that grows with history shows up as slower later rounds;
+``--budget`` fails the run if any round takes longer than that many seconds.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from uuid import UUID
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import get_settings
+from app.routers import globe, notes
+from app.store import stores
+
+
+def _notes_body(count: int, offset: int) -> bytes:
+    lines = (
+        json.dumps(
+            {
+                "template_type": "cornell",
+                "subject": "Physics",
+                "content": {
+                    "cue_column": ["What is momentum?"],
+                    "main_notes": f"Momentum is mass times velocity. Example {offset + i}.",
+                    "summary": "Newton's laws relate force and momentum.",
+                },
+            }
+        )
+        for i in range(count)
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _anchors_body(count: int, offset: int) -> bytes:
+    rng = random.Random(offset)
+    lines = (
+        json.dumps(
+            {
+                "concept_id": str(UUID(int=rng.randrange(2000) + 1)),
+                "location": {
+                    "latitude": round(rng.uniform(-80.0, 80.0), 5),
+                    "longitude": round(rng.uniform(-180.0, 180.0), 5),
+                    "name": f"Place {rng.randrange(5000)}",
+                },
+            }
+        )
+        for _ in range(count)
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _run(
+    client: TestClient,
+    path: str,
+    body: Callable[[int, int], bytes],
+    total: int,
+    rounds: int,
+    drain: bool,
+) -> float:
+    """Import ``total`` items in ``rounds`` requests; returns the slowest round in seconds."""
+    per_round = total // rounds
+    print(f"{path}")
+    print(f"{'round':<8}{'items':>8}{'request s':>12}{'drained s':>12}{'ms/item':>10}")
+    slowest = 0.0
+    for round_ in range(rounds):
+        payload = body(per_round, round_ * per_round)
+        start = time.perf_counter()
+        response = client.post(path, content=payload)
+        requested = time.perf_counter() - start
+        assert response.json()["imported"] == per_round, response.text
+        if drain:
+            stores.pipeline.join()
+        drained = time.perf_counter() - start
+        slowest = max(slowest, drained)
+        ms = drained / per_round * 1e3
+        print(f"{round_:<8}{per_round:>8}{requested:>12.2f}{drained:>12.2f}{ms:>10.3f}")
+    return slowest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--anchors", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--budget", type=float, default=30.0)
+    args = parser.parse_args()
+
+    app = FastAPI()
+    app.include_router(notes.router)
+    app.include_router(globe.router)
+    client = TestClient(app, headers={"Authorization": "Bearer benchmark"})
+    store = stores.get(get_settings().dev_user_id)
+    print(f"storage: {get_settings().storage_backend}")
+
+    slowest = 0.0
+    if args.anchors:
+        slowest = _run(
+            client, "/globe/anchors/import", _anchors_body, args.anchors, args.rounds, False
+        )
+    if args.notes:
+        slowest = max(
+            slowest, _run(client, "/notes/import", _notes_body, args.notes, args.rounds, True)
+        )
+        expected = args.notes // args.rounds * args.rounds
+        analysed = sum(
+            store.analysis_status(note.id) == "ready" for note in store.export_notes(0, 10**9)
+        )
+        print(f"analysed {analysed} of {expected}")
+        if analysed != expected:
+            sys.exit("some imported notes were not analysed")
+    if slowest > args.budget:
+        sys.exit(f"import slower than {args.budget:.0f} s per round")
+
+
+if __name__ == "__main__":
+    main()
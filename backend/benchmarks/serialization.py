@@ -0,0 +1,142 @@
+"""Per-endpoint serialization time: ``response_model`` round trip vs pre-encoded bytes.
+
+Run from ``backend/`` with an in-memory store so nothing touches disk::
+
+    MEMOGLOBE_STORAGE_BACKEND=memory python -m benchmarks.serialization
+
+"model" repeats what FastAPI does with a returned Pydantic object: validate it
+against the route's ``response_model``, dump it to JSON-able Python and render
+it with ``json.dumps``. "encoded" is what the routers do now: read the
+resource's ETag and reuse the cached bytes. Transport and routing are left out
+so the numbers isolate the serialization step.
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID, uuid4
+
+from pydantic import TypeAdapter
+
+from app.encoding import ANCHOR_LIST, ROUTE_LIST, envelope
+from app.routers import scaffolding
+from app.routers.globe import ListAnchorsResponse
+from app.routers.journey import ListRoutesResponse
+from app.schemas import (
+    AnalysisReport,
+    DailyQuestPayload,
+    MetacogDashboard,
+    ScaffoldingResponse,
+)
+from app.store import InMemoryStore, stores
+
+
+def _model(response_model: type, build: Callable[[], Any]) -> Callable[[], bytes]:
+    adapter = TypeAdapter(response_model)
+
+    def run() -> bytes:
+        value = adapter.validate_python(build(), from_attributes=True)
+        return json.dumps(adapter.dump_python(value, mode="json")).encode()
+
+    return run
+
+
+def _seed(store: InMemoryStore, anchors: int, notes: int) -> UUID:
+    for i in range(anchors):
+        store.create_personal_anchor(
+            concept_id=uuid4(),
+            latitude=(i * 7) % 170 - 85,
+            longitude=(i * 13) % 360 - 180,
+            name=f"place-{i}",
+        )
+    note_ids = [
+        store.create_note("cornell", f"subject-{i % 5}", {"cue": str(i)}).id for i in range(notes)
+    ]
+    while store.analysis_json(note_ids[0]) is None:
+        time.sleep(0.05)
+    return note_ids[0]
+
+
+def _time(call: Callable[[], bytes], repeat: int) -> float:
+    call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--anchors", type=int, default=500)
+    parser.add_argument("--notes", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    store = stores.get(uuid4())
+    note_id = _seed(store, args.anchors, args.notes)
+    level = "simplify"
+
+    def anchors() -> bytes:
+        etag = store.etag("anchors")
+        return envelope(
+            "anchors",
+            store.encoded.get("anchors", etag, lambda: ANCHOR_LIST.dump_json(store.list_anchors())),
+        )
+
+    def routes() -> bytes:
+        etag = store.etag("routes")
+        return envelope(
+            "routes",
+            store.encoded.get("routes", etag, lambda: ROUTE_LIST.dump_json([store.route()])),
+        )
+
+    def dashboard() -> bytes:
+        etag = store.etag("dashboard")
+        return store.encoded.get(
+            "dashboard", etag, lambda: store.dashboard().model_dump_json().encode()
+        )
+
+    def daily() -> bytes:
+        etag = store.etag("quests")
+        return store.encoded.get(
+            "quests", etag, lambda: store.daily_quests().model_dump_json().encode()
+        )
+
+    cases: list[tuple[str, Callable[[], bytes], Callable[[], bytes]]] = [
+        (
+            "GET /globe/anchors",
+            _model(ListAnchorsResponse, lambda: {"anchors": store.list_anchors()}),
+            anchors,
+        ),
+        (
+            "GET /journey/routes",
+            _model(ListRoutesResponse, lambda: {"routes": [store.route()]}),
+            routes,
+        ),
+        ("GET /metacog/dashboard", _model(MetacogDashboard, store.dashboard), dashboard),
+        ("GET /quests/daily", _model(DailyQuestPayload, store.daily_quests), daily),
+        (
+            "GET /notes/{id}/analysis",
+            _model(AnalysisReport, lambda: store.get_analysis(note_id)),
+            lambda: store.analysis_json(note_id) or b"",
+        ),
+        (
+            "POST /scaffolding/trigger",
+            _model(
+                ScaffoldingResponse,
+                lambda: {"level": level, "content": scaffolding.CONTENT_BY_LEVEL[level]},
+            ),
+            lambda: scaffolding._ENCODED_BY_LEVEL[level],
+        ),
+    ]
+    print(f"{'endpoint':<28}{'model µs':>12}{'encoded µs':>12}{'speedup':>10}")
+    for name, before, after in cases:
+        model_us = _time(before, args.repeat)
+        encoded_us = _time(after, args.repeat)
+        print(f"{name:<28}{model_us:>12.1f}{encoded_us:>12.1f}{model_us / encoded_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
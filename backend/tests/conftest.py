@@ -0,0 +1,50 @@
+import os
+
+# app.store builds the process-wide registry at import time; keep it off disk
+# and out of worker processes while tests run.
+os.environ.setdefault("MEMOGLOBE_STORAGE_BACKEND", "memory")
+os.environ.setdefault("MEMOGLOBE_ANALYSIS_EXECUTOR", "thread")
+
+from collections.abc import Iterator  # noqa: E402
+
+import pytest  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config import get_settings  # noqa: E402
+from app.dependencies import get_store  # noqa: E402
+from app.engines.analysis import analyze_batch  # noqa: E402
+from app.engines.pipeline import AnalysisPipeline  # noqa: E402
+from app.routers import analysis, globe, journey, notes, quests, sync, tiles  # noqa: E402
+from app.storage.memory import MemoryRepository  # noqa: E402
+from app.store import InMemoryStore, StoreRegistry  # noqa: E402
+
+
+@pytest.fixture
+def pipeline() -> Iterator[AnalysisPipeline]:
+    pipeline = AnalysisPipeline(
+        analyze_batch, workers=2, queue_size=1024, batch_size=16, executor="thread"
+    )
+    yield pipeline
+    pipeline.join()
+    pipeline.shutdown()
+
+
+@pytest.fixture
+def registry(pipeline: AnalysisPipeline) -> StoreRegistry:
+    return StoreRegistry(MemoryRepository(), pipeline, stripes=4, quest_plan_interval=3600.0)
+
+
+@pytest.fixture
+def store(registry: StoreRegistry) -> InMemoryStore:
+    """The store the API serves to the test client's user."""
+    return registry.get(get_settings().dev_user_id)
+
+
+@pytest.fixture
+def client(registry: StoreRegistry) -> TestClient:
+    app = FastAPI()
+    for module in (notes, analysis, globe, tiles, journey, quests, sync):
+        app.include_router(module.router)
+    app.dependency_overrides[get_store] = lambda: registry.get(get_settings().dev_user_id)
+    return TestClient(app, headers={"Authorization": "Bearer test"})
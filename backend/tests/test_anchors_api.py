@@ -0,0 +1,155 @@
+import json
+from datetime import UTC, datetime, timedelta
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from app.etag import strong_match, weak_match
+from app.store import InMemoryStore
+
+
+def _anchor_id(client: TestClient) -> str:
+    response = client.post(
+        "/globe/anchors",
+        json={
+            "concept_id": str(uuid4()),
+            "location": {"latitude": 48.8584, "longitude": 2.2945, "name": "Eiffel Tower"},
+        },
+    )
+    assert response.status_code == 201
+    return response.json()["anchor"]["id"]
+
+
+def test_etag_comparison() -> None:
+    assert weak_match('W/"a-1"', '"a-1"')
+    assert weak_match('"b", W/"a-1"', 'W/"a-1"')
+    assert weak_match("*", 'W/"a-1"')
+    assert not weak_match(None, 'W/"a-1"')
+    assert not weak_match('W/"a-2"', 'W/"a-1"')
+    assert strong_match('"a-1"', '"a-1"')
+    assert strong_match("*", '"a-1"')
+    assert not strong_match('W/"a-1"', '"a-1"')
+    assert not strong_match('"a-1"', 'W/"a-1"')
+
+
+def test_anchor_list_is_not_modified_until_a_write(client: TestClient) -> None:
+    first = client.get("/globe/anchors")
+    etag = first.headers["ETag"]
+    assert etag.startswith("W/")
+
+    cached = client.get("/globe/anchors", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    _anchor_id(client)
+    changed = client.get("/globe/anchors", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()["anchors"]) == len(first.json()["anchors"]) + 1
+
+
+def test_review_with_a_stale_if_match_is_refused(client: TestClient) -> None:
+    anchor_id = _anchor_id(client)
+    read = client.get(f"/globe/anchors/{anchor_id}")
+    etag = read.headers["ETag"]
+    assert (
+        client.get(f"/globe/anchors/{anchor_id}", headers={"If-None-Match": etag}).status_code
+        == 304
+    )
+
+    reviewed = client.post(
+        f"/globe/anchors/{anchor_id}/review",
+        json={"recall_quality": 5},
+        headers={"If-Match": etag},
+    )
+    assert reviewed.status_code == 200
+    assert reviewed.headers["ETag"] != etag
+
+    stale = client.post(
+        f"/globe/anchors/{anchor_id}/review",
+        json={"recall_quality": 5},
+        headers={"If-Match": etag},
+    )
+    assert stale.status_code == 412
+    history = client.get(f"/globe/anchors/{anchor_id}").json()["review_history"]
+    assert len(history) == 1
+
+    assert (
+        client.post(
+            f"/globe/anchors/{anchor_id}/review",
+            json={"recall_quality": 3},
+            headers={"If-Match": reviewed.headers["ETag"]},
+        ).status_code
+        == 200
+    )
+
+
+def test_batch_reviews_apply_oldest_first(client: TestClient, store: InMemoryStore) -> None:
+    first, second = _anchor_id(client), _anchor_id(client)
+    now = datetime.now(tz=UTC)
+    reviews = [
+        {"anchor_id": first, "recall_quality": 5, "reviewed_at": (now - timedelta(hours=1))},
+        {"anchor_id": second, "recall_quality": 2, "reviewed_at": (now - timedelta(hours=3))},
+        {"anchor_id": first, "recall_quality": 4, "reviewed_at": (now - timedelta(hours=2))},
+        {"anchor_id": second, "recall_quality": 3, "reviewed_at": (now + timedelta(days=1))},
+    ]
+    payload = {
+        "reviews": [
+            {**review, "reviewed_at": review["reviewed_at"].isoformat()} for review in reviews
+        ]
+    }
+
+    response = client.post("/globe/anchors/reviews", json=payload)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["anchor_id"] for result in results] == [second, first, first, second]
+    history = store.review_history(UUID(first))
+    assert [quality for _, quality in history] == [4, 5]
+    # A review from the future counts as happening now.
+    _, latest = store.review_history(UUID(second))
+    assert latest[0] <= datetime.now(tz=UTC)
+
+
+def test_batch_reviews_with_an_unknown_anchor_apply_nothing(
+    client: TestClient, store: InMemoryStore
+) -> None:
+    anchor_id = _anchor_id(client)
+    unknown = str(uuid4())
+    now = datetime.now(tz=UTC).isoformat()
+    response = client.post(
+        "/globe/anchors/reviews",
+        json={
+            "reviews": [
+                {"anchor_id": anchor_id, "recall_quality": 5, "reviewed_at": now},
+                {"anchor_id": unknown, "recall_quality": 5, "reviewed_at": now},
+            ]
+        },
+    )
+    assert response.status_code == 404
+    assert unknown in response.json()["detail"]
+    assert store.review_history(UUID(anchor_id)) == []
+    assert client.post("/globe/anchors/reviews", json={"reviews": []}).status_code == 422
+
+
+def test_anchor_ndjson_round_trip(client: TestClient) -> None:
+    concept_id = str(uuid4())
+    lines = [
+        json.dumps(
+            {
+                "concept_id": concept_id,
+                "location": {"latitude": 35.0 + i, "longitude": 139.0, "name": f"Stop {i}"},
+            }
+        )
+        for i in range(3)
+    ]
+    lines.insert(1, json.dumps({"concept_id": "not-a-uuid"}))
+    response = client.post("/globe/anchors/import", content="\n".join(lines).encode())
+    body = response.json()
+    assert (body["imported"], body["failed"]) == (3, 1)
+    assert [error["line"] for error in body["errors"]] == [2]
+
+    exported = [json.loads(line) for line in client.get("/globe/anchors/export").text.splitlines()]
+    imported = [anchor for anchor in exported if anchor["concept"]["id"] == concept_id]
+    assert [anchor["location"]["name"] for anchor in imported] == ["Stop 0", "Stop 1", "Stop 2"]
+    assert len(exported) == len(client.get("/globe/anchors").json()["anchors"])
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.store
+from app.config import get_settings
+from app.engines.pipeline import AnalysisPipeline
+from app.store import InMemoryStore, StoreRegistry
+
+
+def test_route_etag_rolls_over_with_the_day(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    today = client.get("/journey/routes")
+    etag = today.headers["ETag"]
+    assert client.get("/journey/routes", headers={"If-None-Match": etag}).status_code == 304
+
+    now = app.store.utc_now()
+    monkeypatch.setattr(app.store, "utc_now", lambda: now + timedelta(days=1))
+    tomorrow = client.get("/journey/routes", headers={"If-None-Match": etag})
+    assert tomorrow.status_code == 200
+    assert tomorrow.headers["ETag"] != etag
+    assert (
+        client.get(
+            "/journey/routes", headers={"If-None-Match": tomorrow.headers["ETag"]}
+        ).status_code
+        == 304
+    )
+
+
+def test_route_detail(client: TestClient) -> None:
+    (route,) = client.get("/journey/routes").json()["routes"]
+    detail = client.get(f"/journey/routes/{route['id']}").json()
+    assert [stop["id"] for stop in detail["stops"]] == route["stops"]
+    assert client.get(f"/journey/routes/{uuid4()}").status_code == 404
+
+
+def _note_id(store: InMemoryStore) -> str:
+    note = store.create_note(
+        "cornell", "Physics", {"cue_column": [], "main_notes": "Quantum Mechanics", "summary": ""}
+    )
+    return str(note.id)
+
+
+def test_quest_completion_survives_a_rebuilt_store(
+    client: TestClient,
+    registry: StoreRegistry,
+    store: InMemoryStore,
+    pipeline: AnalysisPipeline,
+) -> None:
+    daily = client.get("/quests/daily")
+    etag = daily.headers["ETag"]
+    quest = daily.json()["quests"][0]
+    note_id = _note_id(store)
+
+    response = client.post(f"/quests/{quest['id']}/complete", json={"note_id": note_id})
+    assert response.status_code == 200
+    assert response.json()["quest"]["completed"]
+    assert client.get("/quests/daily", headers={"If-None-Match": etag}).status_code == 200
+
+    rebuilt = StoreRegistry(registry.repository, pipeline, quest_plan_interval=3600.0)
+    quests = rebuilt.get(get_settings().dev_user_id).daily_quests().quests
+    assert [q.id for q in quests] == [UUID(q["id"]) for q in daily.json()["quests"]]
+    assert {q.id for q in quests if q.completed} == {UUID(quest["id"])}
+
+
+def test_completing_unknown_quests_or_notes(client: TestClient, store: InMemoryStore) -> None:
+    quest_id = client.get("/quests/daily").json()["quests"][0]["id"]
+    note_id = _note_id(store)
+    assert client.post(f"/quests/{uuid4()}/complete", json={"note_id": note_id}).status_code == 404
+    assert (
+        client.post(f"/quests/{quest_id}/complete", json={"note_id": str(uuid4())}).status_code
+        == 404
+    )
+    assert not client.get("/quests/daily").json()["quests"][0]["completed"]
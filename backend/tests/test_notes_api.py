@@ -0,0 +1,118 @@
+import json
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+
+from app.bulk import MAX_LINE_BYTES
+from app.engines.timeline import encode_cursor
+from app.store import InMemoryStore, StoreRegistry
+
+
+def _note(main_notes: str, subject: str = "Physics") -> dict:
+    return {
+        "template_type": "cornell",
+        "subject": subject,
+        "content": {"cue_column": ["Why?"], "main_notes": main_notes, "summary": ""},
+    }
+
+
+def _create(client: TestClient, main_notes: str) -> UUID:
+    response = client.post("/notes", json=_note(main_notes))
+    assert response.status_code == 202
+    return UUID(response.json()["note_id"])
+
+
+def _page(client: TestClient, **params: str | int) -> tuple[list[UUID], str | None]:
+    response = client.get("/notes", params=params)
+    assert response.status_code == 200
+    body = response.json()
+    return [UUID(note["id"]) for note in body["notes"]], body["next_cursor"]
+
+
+def test_cursor_pages_are_stable_under_inserts(client: TestClient) -> None:
+    created = [_create(client, f"note {i}") for i in range(25)]
+
+    first, cursor = _page(client, limit=10)
+    assert first == created[::-1][:10]
+    _create(client, "written between pages")
+    seen = list(first)
+    while cursor is not None:
+        page, cursor = _page(client, limit=10, cursor=cursor)
+        seen.extend(page)
+    # Keyset paging neither repeats nor skips notes when newer ones arrive.
+    assert seen == created[::-1]
+
+
+def test_invalid_note_cursors_are_rejected(client: TestClient) -> None:
+    naive = encode_cursor((datetime(2026, 1, 1), uuid4()))
+    for cursor in ("not-a-cursor", naive):
+        assert client.get("/notes", params={"cursor": cursor}).status_code == 422
+
+
+def test_patch_withdraws_removed_concepts(
+    client: TestClient, registry: StoreRegistry, store: InMemoryStore
+) -> None:
+    both = "Quantum Mechanics builds on Classical Mechanics. Thermodynamics too."
+    note_id = _create(client, both)
+    other = _create(client, "Thermodynamics and Electromagnetism.")
+    registry.pipeline.join()
+    covered = store.kcs.coverage("Physics")
+
+    response = client.patch(
+        f"/notes/{note_id}",
+        json={"content": {"main_notes": "Quantum Mechanics builds on Classical Mechanics."}},
+    )
+    assert response.status_code == 202
+    registry.pipeline.join()
+    # Thermodynamics is still covered by the other note.
+    assert store.kcs.coverage("Physics") == covered
+    assert store.dag.is_covered("Thermodynamics")
+
+    client.patch(f"/notes/{other}", json={"content": {"main_notes": "Electromagnetism."}})
+    registry.pipeline.join()
+    assert store.kcs.coverage("Physics") < covered
+    assert not store.dag.is_covered("Thermodynamics")
+    report = client.get(f"/notes/{other}/analysis").json()
+    assert "Thermodynamics" in report["uncovered_concepts"]
+
+
+def test_patch_without_analysed_changes_returns_the_note(
+    client: TestClient, registry: StoreRegistry
+) -> None:
+    note_id = _create(client, "Quantum Mechanics.")
+    registry.pipeline.join()
+    before = client.get(f"/notes/{note_id}/analysis")
+    assert before.status_code == 200
+
+    response = client.patch(f"/notes/{note_id}", json={"content": {}})
+    assert response.status_code == 200
+    assert response.json()["id"] == str(note_id)
+    assert client.get(f"/notes/{note_id}/analysis").json() == before.json()
+    assert client.patch(f"/notes/{uuid4()}", json={"content": {}}).status_code == 404
+
+
+def test_ndjson_import_reports_bad_lines_and_exports(
+    client: TestClient, registry: StoreRegistry
+) -> None:
+    lines = [
+        json.dumps(_note("Quantum Mechanics.")),
+        "{not json",
+        "",
+        json.dumps(_note("x" * MAX_LINE_BYTES)),
+        json.dumps({"template_type": "cornell"}),
+        json.dumps(_note("Thermodynamics.", subject="Biology")),
+    ]
+    response = client.post("/notes/import", content="\n".join(lines).encode())
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["imported"], body["failed"]) == (2, 3)
+    assert [error["line"] for error in body["errors"]] == [2, 4, 5]
+    assert body["errors"][1]["detail"] == f"line exceeds {MAX_LINE_BYTES} bytes"
+
+    registry.pipeline.join()
+    exported = client.get("/notes/export")
+    assert exported.headers["content-type"].startswith("application/x-ndjson")
+    notes = [json.loads(line) for line in exported.text.splitlines()]
+    assert [note["subject"] for note in notes] == ["Physics", "Biology"]
+    assert notes[0]["extracted_concepts"] == ["Quantum Mechanics"]
@@ -0,0 +1,94 @@
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.engines.spatial import GeoCellIndex
+
+SEOUL = (37.5665, 126.978)
+BUSAN = (35.1796, 129.0756)
+FIJI = (-17.7134, 178.065)
+SAMOA = (-13.759, -172.1046)
+
+
+@pytest.fixture
+def index() -> tuple[GeoCellIndex, dict[str, UUID]]:
+    index = GeoCellIndex()
+    ids = {}
+    for name, (lat, lon) in {"seoul": SEOUL, "busan": BUSAN, "fiji": FIJI, "samoa": SAMOA}.items():
+        ids[name] = uuid4()
+        index.insert(ids[name], lat, lon)
+    return index, ids
+
+
+def test_bbox_returns_points_inside_the_window(index: tuple[GeoCellIndex, dict[str, UUID]]) -> None:
+    grid, ids = index
+    assert set(grid.query_bbox(124.0, 33.0, 132.0, 39.0)) == {ids["seoul"], ids["busan"]}
+    assert grid.query_bbox(124.0, 36.0, 132.0, 39.0) == [ids["seoul"]]
+    assert grid.query_bbox(0.0, 10.0, 20.0, 20.0) == []
+
+
+def test_bbox_crossing_the_antimeridian(index: tuple[GeoCellIndex, dict[str, UUID]]) -> None:
+    grid, ids = index
+    assert set(grid.query_bbox(170.0, -20.0, -170.0, -10.0)) == {ids["fiji"], ids["samoa"]}
+    assert set(grid.query_bbox(-180.0, -90.0, 180.0, 90.0)) == set(ids.values())
+
+
+def test_radius_is_nearest_first_and_bounded(index: tuple[GeoCellIndex, dict[str, UUID]]) -> None:
+    grid, ids = index
+    hits = grid.query_radius(*SEOUL, 400.0)
+    assert [key for key, _ in hits] == [ids["seoul"], ids["busan"]]
+    assert hits[0][1] == pytest.approx(0.0)
+    assert 300.0 < hits[1][1] < 400.0
+    assert [key for key, _ in grid.query_radius(*SEOUL, 100.0)] == [ids["seoul"]]
+    # Fiji and Samoa are about 1,150 km apart across the antimeridian.
+    assert {key for key, _ in grid.query_radius(*FIJI, 1300.0)} == {ids["fiji"], ids["samoa"]}
+
+
+def _create(client: TestClient, latitude: float, longitude: float) -> UUID:
+    response = client.post(
+        "/globe/anchors",
+        json={
+            "concept_id": str(uuid4()),
+            "location": {"latitude": latitude, "longitude": longitude, "name": "Pin"},
+        },
+    )
+    assert response.status_code == 201
+    return UUID(response.json()["anchor"]["id"])
+
+
+def _listed(client: TestClient, **params: str | float) -> set[UUID]:
+    response = client.get("/globe/anchors", params=params)
+    assert response.status_code == 200
+    return {UUID(anchor["id"]) for anchor in response.json()["anchors"]}
+
+
+def test_anchor_queries_by_bbox_and_near(client: TestClient) -> None:
+    seoul, busan = _create(client, *SEOUL), _create(client, *BUSAN)
+
+    in_korea = _listed(client, bbox="124,33,132,39")
+    assert {seoul, busan} <= in_korea
+    assert busan not in _listed(client, bbox="124,36,132,39")
+    near = _listed(client, near=f"{SEOUL[0]},{SEOUL[1]}", radius_km=100)
+    assert seoul in near and busan not in near
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"bbox": "nan,33,132,39"},
+        {"bbox": "124,33,inf,39"},
+        {"bbox": "124,33,132"},
+        {"bbox": "124,-95,132,39"},
+        {"near": "nan,126", "radius_km": 10},
+        {"near": "91,126", "radius_km": 10},
+        {"near": "37,126"},
+        {"near": "37,126", "radius_km": 0},
+        {"near": "37,126", "radius_km": "nan"},
+        {"bbox": "124,33,132,39", "near": "37,126", "radius_km": 10},
+    ],
+)
+def test_invalid_spatial_queries_are_rejected(
+    client: TestClient, params: dict[str, str | float]
+) -> None:
+    assert client.get("/globe/anchors", params=params).status_code == 422
@@ -0,0 +1,67 @@
+from collections.abc import Iterator
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+from app.engines.pipeline import AnalysisPipeline
+from app.storage.sqlite import SQLiteRepository
+from app.store import StoreRegistry
+
+
+@pytest.fixture
+def registries(
+    tmp_path: Path, pipeline: AnalysisPipeline
+) -> Iterator[tuple[StoreRegistry, StoreRegistry]]:
+    """Two registries over one database file, as two worker processes would have."""
+    path = tmp_path / "memoglobe.db"
+    repositories = [SQLiteRepository(path, pool_size=2) for _ in range(2)]
+    yield tuple(  # type: ignore[misc]
+        StoreRegistry(repository, pipeline, quest_plan_interval=3600.0)
+        for repository in repositories
+    )
+    pipeline.join()
+    for repository in repositories:
+        repository.close()
+
+
+def test_reviews_from_two_processes_add_up(
+    registries: tuple[StoreRegistry, StoreRegistry],
+) -> None:
+    first, second = registries
+    user_id = uuid4()
+    mine = first.get(user_id)
+    anchor = mine.list_anchors()[0]
+    theirs = second.get(user_id)
+    assert not first.repository.changed_elsewhere(user_id)
+
+    for _ in range(3):
+        mine.review_anchor(anchor.id, 4)
+    assert not first.repository.changed_elsewhere(user_id)
+    for _ in range(2):
+        theirs.review_anchor(anchor.id, 5)
+    assert first.repository.changed_elsewhere(user_id)
+
+    reloaded = first.get(user_id)
+    assert reloaded is not mine
+    reviewed = reloaded.get_anchor(anchor.id)
+    assert reviewed is not None
+    assert reviewed.review_count == anchor.review_count + 5
+    assert len(reloaded.review_history(anchor.id)) == 5
+    assert second.get(user_id) is not theirs
+
+
+def test_quest_completions_from_both_processes_are_kept(
+    registries: tuple[StoreRegistry, StoreRegistry],
+) -> None:
+    first, second = registries
+    user_id = uuid4()
+    quests = first.get(user_id).daily_quests().quests
+    assert [q.id for q in second.get(user_id).daily_quests().quests] == [q.id for q in quests]
+
+    first.get(user_id).complete_quest(quests[0].id)
+    second.get(user_id).complete_quest(quests[1].id)
+
+    for registry in registries:
+        completed = {q.id for q in registry.get(user_id).daily_quests().quests if q.completed}
+        assert completed == {quests[0].id, quests[1].id}
@@ -0,0 +1,120 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from uuid import UUID, uuid4
+
+from app.engines.changelog import decode_sync_cursor
+from app.store import InMemoryStore, StoreRegistry
+
+THREADS = 8
+REVIEWS_PER_THREAD = 25
+NOTES_PER_THREAD = 20
+
+
+def _run_together(tasks: list[Callable[[], object]]) -> list[object]:
+    """Start every task at once and re-raise the first failure."""
+    barrier = threading.Barrier(len(tasks))
+
+    def run(task: Callable[[], object]) -> object:
+        barrier.wait()
+        return task()
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        futures = [pool.submit(run, task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+def _sync_all(store: InMemoryStore, cursor: str | None) -> tuple[str, set[UUID], list[int]]:
+    """Follow sync pages to the end; returns the last cursor, note ids and page versions."""
+    notes: set[UUID] = set()
+    versions = []
+    while True:
+        page = store.sync(cursor, limit=50)
+        cursor = page.cursor
+        versions.append(decode_sync_cursor(cursor)[1])
+        notes.update(note.id for note in page.notes)
+        if not page.has_more:
+            return cursor, notes, versions
+
+
+def test_concurrent_reviews_on_one_anchor_are_all_counted(registry: StoreRegistry) -> None:
+    user_id = uuid4()
+    store = registry.get(user_id)
+    anchor = store.list_anchors()[0]
+    start_count = anchor.review_count
+    start_version = store.version
+
+    def review() -> list[int]:
+        outcomes = [store.review_anchor(anchor.id, 4) for _ in range(REVIEWS_PER_THREAD)]
+        return [outcome.anchor.review_count for outcome in outcomes if outcome is not None]
+
+    counts = [count for batch in _run_together([review] * THREADS) for count in batch]
+
+    total = THREADS * REVIEWS_PER_THREAD
+    # Every review saw a distinct count, so none was lost to a racing writer.
+    assert sorted(counts) == list(range(start_count + 1, start_count + total + 1))
+    reviewed = store.get_anchor(anchor.id)
+    assert reviewed is not None
+    assert reviewed.review_count == start_count + total
+    assert len(store.review_history(anchor.id)) == total
+    assert len(list(registry.repository.load_reviews(user_id))) == total
+    assert store.version >= start_version + total
+
+
+def test_interleaved_notes_lists_and_syncs_stay_consistent(registry: StoreRegistry) -> None:
+    store = registry.get(uuid4())
+    cursor, _, _ = _sync_all(store, None)
+    stop = threading.Event()
+    seen_versions: list[int] = []
+    listed_totals: list[int] = []
+
+    def write(worker: int) -> list[UUID]:
+        return [
+            store.create_note(
+                "cornell",
+                f"Subject {worker % 3}",
+                {"cue_column": [f"q{i}"], "main_notes": f"note {worker}/{i}", "summary": ""},
+            ).id
+            for i in range(NOTES_PER_THREAD)
+        ]
+
+    def read_pages() -> None:
+        while not stop.is_set():
+            notes, total, next_cursor = store.list_notes(limit=10)
+            assert len({note.id for note in notes}) == len(notes)
+            assert [note.created_at for note in notes] == sorted(
+                (note.created_at for note in notes), reverse=True
+            )
+            if next_cursor is not None:
+                older, _, _ = store.list_notes(limit=10, cursor=next_cursor)
+                assert not {note.id for note in older} & {note.id for note in notes}
+            listed_totals.append(total)
+
+    def follow_sync() -> None:
+        nonlocal cursor
+        while not stop.is_set():
+            cursor, _, versions = _sync_all(store, cursor)
+            seen_versions.extend(versions)
+
+    writers = [lambda worker=worker: write(worker) for worker in range(THREADS)]
+    with ThreadPoolExecutor(max_workers=2) as readers:
+        pending = [readers.submit(read_pages), readers.submit(follow_sync)]
+        try:
+            created = [note_id for batch in _run_together(writers) for note_id in batch]
+        finally:
+            stop.set()
+        for future in pending:
+            future.result()
+
+    expected = THREADS * NOTES_PER_THREAD
+    assert len(set(created)) == expected
+    _, total, _ = store.list_notes()
+    assert total == expected
+    assert listed_totals == sorted(listed_totals)
+    assert seen_versions == sorted(seen_versions)
+
+    registry.pipeline.join()
+    _, synced, versions = _sync_all(store, None)
+    assert synced == set(created)
+    assert versions == sorted(versions)
+    assert store.changes.since(store.version, limit=1) == ([], None)
@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.store
+from app.engines.changelog import decode_sync_cursor, encode_sync_cursor
+from app.store import StoreRegistry
+
+
+def _sync(client: TestClient, **params: str | int) -> dict:
+    response = client.get("/sync", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def _drain(client: TestClient, cursor: str | None) -> tuple[str, list[dict]]:
+    pages = []
+    while True:
+        page = _sync(client, limit=5, **({} if cursor is None else {"since": cursor}))
+        pages.append(page)
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            return cursor, pages
+
+
+def _create_note(client: TestClient, text: str) -> str:
+    body = {
+        "template_type": "cornell",
+        "subject": "Physics",
+        "content": {"cue_column": [], "main_notes": text, "summary": ""},
+    }
+    return client.post("/notes", json=body).json()["note_id"]
+
+
+def test_full_sync_then_only_changes(client: TestClient, registry: StoreRegistry) -> None:
+    cursor, pages = _drain(client, None)
+    assert pages[0]["reset"]
+    assert pages[-1]["quests"] is not None
+    anchors = {anchor["id"] for page in pages for anchor in page["anchors"]}
+    assert len(anchors) == len(client.get("/globe/anchors").json()["anchors"])
+
+    idle = _sync(client, since=cursor)
+    assert not idle["reset"] and not idle["has_more"]
+    assert (idle["anchors"], idle["notes"], idle["analyses"], idle["quests"]) == ([], [], [], None)
+    assert decode_sync_cursor(idle["cursor"]) == decode_sync_cursor(cursor)
+
+    note_ids = {_create_note(client, f"Thermodynamics {i}") for i in range(8)}
+    registry.pipeline.join()
+    cursor, pages = _drain(client, cursor)
+    assert len(pages) > 1
+    assert not any(page["reset"] for page in pages)
+    assert {note["id"] for page in pages for note in page["notes"]} == note_ids
+    assert {item["note_id"] for page in pages for item in page["analyses"]} == note_ids
+    versions = [decode_sync_cursor(page["cursor"])[1] for page in pages]
+    assert versions == sorted(versions)
+
+
+def test_cursors_from_another_epoch_or_day(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cursor, _ = _drain(client, None)
+    epoch, version, day = decode_sync_cursor(cursor)
+
+    foreign = _sync(client, since=encode_sync_cursor("other", version, day))
+    assert foreign["reset"]
+    ahead = _sync(client, since=encode_sync_cursor(epoch, version + 100, day))
+    assert ahead["reset"]
+
+    now = app.store.utc_now()
+    monkeypatch.setattr(app.store, "utc_now", lambda: now + timedelta(days=1))
+    rolled = _sync(client, since=cursor)
+    assert not rolled["reset"]
+    assert rolled["quests"]["date"] == (now + timedelta(days=1)).date().isoformat()
+
+
+@pytest.mark.parametrize("cursor", ["garbage", encode_sync_cursor("e", 1, date.min)[:-3]])
+def test_invalid_sync_cursor(client: TestClient, cursor: str) -> None:
+    assert client.get("/sync", params={"since": cursor}).status_code == 422
+
+
+def test_reviews_show_up_in_the_next_sync(client: TestClient) -> None:
+    cursor, _ = _drain(client, None)
+    anchor_id = client.get("/globe/anchors").json()["anchors"][0]["id"]
+    client.post(
+        "/globe/anchors/reviews",
+        json={
+            "reviews": [
+                {
+                    "anchor_id": anchor_id,
+                    "recall_quality": 4,
+                    "reviewed_at": app.store.utc_now().isoformat(),
+                }
+            ]
+        },
+    )
+    page = _sync(client, since=cursor)
+    (anchor,) = page["anchors"]
+    assert anchor["id"] == anchor_id
+    assert anchor["review_count"] >= 1
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.engines.tiles import (
+    EAGER_ZOOM,
+    MAX_ZOOM,
+    PIN_CODES,
+    TILE_HEADER,
+    TILE_MAGIC,
+    TILE_MEDIA_TYPE,
+    TILE_RECORD,
+    ClusterPyramid,
+)
+
+Record = tuple[float, float, int, float, int]
+
+
+def _decode(payload: bytes) -> tuple[tuple[int, int, int], list[Record]]:
+    magic, z, x, y, count = TILE_HEADER.unpack_from(payload)
+    assert magic == TILE_MAGIC
+    assert len(payload) == TILE_HEADER.size + count * TILE_RECORD.size
+    records = [
+        TILE_RECORD.unpack_from(payload, TILE_HEADER.size + i * TILE_RECORD.size)
+        for i in range(count)
+    ]
+    return (z, x, y), records
+
+
+def _total(pyramid: ClusterPyramid, z: int) -> int:
+    return sum(
+        record[2]
+        for x in range(1 << z)
+        for y in range(1 << z)
+        for record in _decode(pyramid.tile(z, x, y))[1]
+    )
+
+
+@pytest.fixture
+def pyramid() -> ClusterPyramid:
+    rng = np.random.default_rng(7)
+    n = 500
+    pyramid = ClusterPyramid(capacity=16)
+    pyramid.add_many(
+        np.arange(n),
+        rng.uniform(-60.0, 60.0, n),
+        rng.uniform(-180.0, 180.0, n),
+        rng.uniform(0.0, 1.0, n),
+        ["review"] * n,
+    )
+    return pyramid
+
+
+def test_every_zoom_accounts_for_every_anchor(pyramid: ClusterPyramid) -> None:
+    for z in (0, 2, EAGER_ZOOM, EAGER_ZOOM + 1):
+        assert _total(pyramid, z) == 500
+
+
+def test_tile_header_and_clusters() -> None:
+    pyramid = ClusterPyramid()
+    pyramid.add(0, 37.5, 127.0, 0.8, "mastered")
+    pyramid.add(1, 37.5, 127.0, 0.4, "gap")
+    pyramid.add(2, -33.9, 151.2, 0.5, "gap")
+
+    key, records = _decode(pyramid.tile(0, 0, 0))
+    assert key == (0, 0, 0)
+    assert sorted(record[2] for record in records) == [1, 2]
+    (seoul,) = [record for record in records if record[2] == 2]
+    assert seoul[0] == pytest.approx(37.5)
+    assert seoul[1] == pytest.approx(127.0)
+    assert seoul[3] == pytest.approx(0.6)
+    assert seoul[4] in (PIN_CODES["mastered"], PIN_CODES["gap"])
+
+
+def test_writes_invalidate_cached_tiles(pyramid: ClusterPyramid) -> None:
+    deep = MAX_ZOOM
+    before = {z: pyramid.tile(z, 0, 0) for z in (0, deep)}
+    assert pyramid.tile(0, 0, 0) is before[0]
+
+    # Clamped to the top-left corner, so it lands in tile (0, 0) at every zoom.
+    pyramid.add(500, 89.0, -180.0, 1.0, "personal")
+    assert _total(pyramid, 0) == 501
+    assert pyramid.tile(deep, 0, 0) != before[deep]
+    assert _decode(pyramid.tile(deep, 0, 0))[1][0][2] == 1
+
+    pyramid.update(500, 0.25, "gap")
+    assert _decode(pyramid.tile(deep, 0, 0))[1][0][3:] == (0.25, PIN_CODES["gap"])
+    pyramid.remove(500)
+    assert _total(pyramid, 0) == 500
+    assert _decode(pyramid.tile(deep, 0, 0))[1] == []
+
+
+@pytest.mark.parametrize("z, x, y", [(-1, 0, 0), (MAX_ZOOM + 1, 0, 0), (1, 2, 0), (3, 0, -1)])
+def test_out_of_range_tiles(pyramid: ClusterPyramid, z: int, x: int, y: int) -> None:
+    with pytest.raises(ValueError):
+        pyramid.tile(z, x, y)
+
+
+def test_tile_route(client: TestClient) -> None:
+    response = client.get("/globe/tiles/0/0/0")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == TILE_MEDIA_TYPE
+    assert _decode(response.content)[0] == (0, 0, 0)
+    assert client.get(f"/globe/tiles/{MAX_ZOOM + 1}/0/0").status_code == 404
+    assert client.get("/globe/tiles/1/0/2").status_code == 404